@@ -0,0 +1,89 @@
+# Generated benchmark networks with random data. Every generator returns
+# the network and editor positions for its tensors, so the same network can
+# be timed headless and in the GUI (TensorNetworkEditor.load_network).
+
+import numpy as np
+
+from tensor_network import Tensor, TensorNetwork
+
+# Distance between neighbouring tensors in the editor
+SPACING = 80
+
+
+def _fill(network, rng):
+    for tensor in network.tensors:
+        tensor.data = rng.standard_normal(tensor.dims())
+
+
+def mps_network(length, bond_dim, physical_dim=2, seed=0):
+    # Open-boundary matrix product state: a chain of tensors, each with one
+    # physical leg
+    network = TensorNetwork()
+    tensors = [network.add_tensor(Tensor(f"A{i}")) for i in range(length)]
+    for i, tensor in enumerate(tensors):
+        if physical_dim:
+            tensor.add_leg(physical_dim, label=f"p{i}")
+    for left, right in zip(tensors, tensors[1:]):
+        network.connect(left.add_leg(bond_dim, 'bond'), right.add_leg(bond_dim, 'bond'))
+    _fill(network, np.random.default_rng(seed))
+    positions = {tensor: {'position': [SPACING * (i + 1), SPACING], 'index': i}
+                 for i, tensor in enumerate(tensors)}
+    return network, positions
+
+
+def peps_network(rows, columns, bond_dim, physical_dim=0, seed=0):
+    # Open-boundary projected entangled pair state on a square grid; without
+    # physical legs it contracts to a scalar
+    network = TensorNetwork()
+    grid = [[network.add_tensor(Tensor(f"A{r}_{c}")) for c in range(columns)]
+            for r in range(rows)]
+    for r in range(rows):
+        for c in range(columns):
+            if physical_dim:
+                grid[r][c].add_leg(physical_dim, label=f"p{r}_{c}")
+            if c + 1 < columns:
+                network.connect(grid[r][c].add_leg(bond_dim, 'bond'),
+                                grid[r][c + 1].add_leg(bond_dim, 'bond'))
+            if r + 1 < rows:
+                network.connect(grid[r][c].add_leg(bond_dim, 'bond'),
+                                grid[r + 1][c].add_leg(bond_dim, 'bond'))
+    _fill(network, np.random.default_rng(seed))
+    positions = {grid[r][c]: {'position': [SPACING * (c + 1), SPACING * (r + 1)],
+                              'index': r * columns + c}
+                 for r in range(rows) for c in range(columns)}
+    return network, positions
+
+
+def random_regular_edges(size, degree, rng, attempts=1000):
+    # Edges of a random simple degree-regular graph from the pairing model,
+    # retried until no loops or multiple edges occur
+    if size * degree % 2 or degree >= size:
+        raise ValueError(f"There is no {degree}-regular graph on {size} vertices.")
+    for _ in range(attempts):
+        stubs = rng.permutation(np.repeat(np.arange(size), degree)).reshape(-1, 2)
+        edges = {tuple(sorted(pair)) for pair in stubs.tolist()}
+        if len(edges) == len(stubs) and all(a != b for a, b in edges):
+            return sorted(edges)
+    raise ValueError(f"No simple {degree}-regular graph on {size} vertices was found.")
+
+
+def random_regular_network(size, degree, bond_dim, physical_dim=0, seed=0):
+    # Tensors on the vertices of a random regular graph, bonds on its edges;
+    # a common worst case for contraction path searches
+    rng = np.random.default_rng(seed)
+    network = TensorNetwork()
+    tensors = [network.add_tensor(Tensor(f"V{i}")) for i in range(size)]
+    if physical_dim:
+        for i, tensor in enumerate(tensors):
+            tensor.add_leg(physical_dim, label=f"p{i}")
+    for a, b in random_regular_edges(size, degree, rng):
+        network.connect(tensors[a].add_leg(bond_dim, 'bond'), tensors[b].add_leg(bond_dim, 'bond'))
+    _fill(network, rng)
+    radius = SPACING * size / (2 * np.pi)
+    positions = {}
+    for i, tensor in enumerate(tensors):
+        angle = 2 * np.pi * i / size
+        positions[tensor] = {'position': [radius * (1 + np.cos(angle)) + SPACING,
+                                          radius * (1 + np.sin(angle)) + SPACING],
+                             'index': i}
+    return network, positions
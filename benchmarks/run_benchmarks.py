@@ -0,0 +1,375 @@
+# Benchmark suite: contraction, SVD and editor scene operations on generated
+# networks of growing size. Results are written as JSON, and a previous run
+# can be passed with --compare to spot regressions:
+#
+#   python benchmarks/run_benchmarks.py -o results.json
+#   python benchmarks/run_benchmarks.py -o new.json --compare results.json
+#
+# The GUI benchmarks drive the real MainWindow on Qt's offscreen platform,
+# with message boxes and dialogs answered automatically. The startup
+# benchmarks time fresh interpreters and fail the run when a median exceeds
+# its budget in STARTUP_BUDGETS.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import numpy as np
+
+from tensor_network import contraction_path, contraction_path_cost, truncated_svd
+from networks import mps_network, peps_network, random_regular_network
+
+RESULTS_VERSION = 1
+
+# A benchmark is slower than its baseline when its median time grew by more
+# than this factor
+REGRESSION_FACTOR = 1.2
+
+# Sizes per benchmark; --quick only runs the first two of each
+FULL_CONTRACTION_CASES = (
+    [('mps', {'length': length, 'bond_dim': 64, 'physical_dim': 0}) for length in (16, 32, 64, 128)]
+    + [('peps', {'rows': size, 'columns': size, 'bond_dim': 3}) for size in (3, 4, 5, 6)]
+    + [('random_regular', {'size': size, 'degree': 3, 'bond_dim': 2}) for size in (10, 16, 22, 28)]
+)
+PAIR_CONTRACTION_CASES = [('mps', {'length': 8, 'bond_dim': bond_dim}) for bond_dim in (32, 64, 128, 256)]
+SVD_CASES = [('mps', {'length': 8, 'bond_dim': bond_dim}) for bond_dim in (32, 64, 128, 256)]
+SCENE_CASES = [('peps', {'rows': size, 'columns': size, 'bond_dim': 2, 'physical_dim': 2})
+               for size in (4, 8, 16, 24)]
+ADD_NODE_COUNTS = (50, 200, 800, 1600)
+# Evaluations of a compiled plan per timed run, on the full contraction cases
+PLAN_EVALUATIONS = 20
+DRAG_STEPS = 20
+
+# Programs timed from interpreter start to exit, and the median wall time in
+# seconds each may take. Importing the library and running the command-line
+# contractor must not load PyQt5 (nor numpy, until a network is contracted).
+STARTUP_CASES = {
+    'library_import': ['-c', "import sys, tensor_network\n"
+                             "sys.exit(bool({'numpy', 'PyQt5'} & set(sys.modules)))"],
+    'cli_help': ['-m', 'tensor_network', '--help'],
+    'gui_window': ['-c', "from PyQt5.QtWidgets import QApplication\n"
+                         "from tensor_network_gui.window import MainWindow\n"
+                         "app = QApplication([])\n"
+                         "window = MainWindow()\n"
+                         "window.show()\n"
+                         "app.processEvents()"],
+}
+STARTUP_BUDGETS = {'library_import': 0.1, 'cli_help': 0.15, 'gui_window': 0.6}
+
+GENERATORS = {
+    'mps': mps_network,
+    'peps': peps_network,
+    'random_regular': random_regular_network,
+}
+
+
+def measure(setup, run, repeat):
+    # Wall-clock times of run(state) on a fresh setup() each time
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def result_entry(benchmark, network, parameters, times, **extra):
+    entry = {
+        'benchmark': benchmark,
+        'network': network,
+        'parameters': parameters,
+        'times': times,
+        'min': min(times),
+        'median': statistics.median(times),
+    }
+    entry.update(extra)
+    return entry
+
+
+def benchmark_startup(cases, repeat):
+    results = []
+    for name in cases:
+        def run(_):
+            process = subprocess.run([sys.executable] + STARTUP_CASES[name], cwd=ROOT,
+                                     capture_output=True, text=True)
+            if process.returncode:
+                raise RuntimeError(f"Startup benchmark {name} failed: {process.stderr.strip()}")
+
+        times = measure(lambda: None, run, repeat)
+        results.append(result_entry('startup', name, {}, times, budget=STARTUP_BUDGETS[name]))
+    return results
+
+
+def check_truncated_svd(seeds=10):
+    # Timings of a wrong solver are meaningless, so the truncated SVD
+    # solvers are checked against the exact one first, on matrices of
+    # rank k: the normal case for a full bond compression, and the one in
+    # which the Lanczos iteration breaks down
+    for seed in range(seeds):
+        rng = np.random.default_rng(seed)
+        k = 8
+        matrix = rng.standard_normal((20, k)) @ rng.standard_normal((k, 18))
+        expected = np.linalg.svd(matrix, compute_uv=False)[:k]
+        for solver in ('randomized', 'lanczos'):
+            U, S, Vh, _ = truncated_svd(matrix, k, solver)
+            if not (np.allclose(S, expected) and np.allclose((U * S) @ Vh, matrix)):
+                raise RuntimeError(f"The {solver} SVD is wrong on a rank-{k} matrix "
+                                   f"(seed {seed}).")
+
+
+def benchmark_full_contraction(cases, repeat):
+    results = []
+    for kind, parameters in cases:
+        network, _ = GENERATORS[kind](**parameters)
+        inputs, output, size_dict, _ = network.specification()
+        path = contraction_path(inputs, output, size_dict)
+        flops, largest, _ = contraction_path_cost(inputs, output, size_dict, path)
+        times = measure(lambda: GENERATORS[kind](**parameters)[0],
+                        lambda network: network.contract_all(), repeat)
+        results.append(result_entry('full_contraction', kind, parameters, times,
+                                    flops=flops, largest_intermediate=largest))
+    return results
+
+
+def benchmark_compiled_contraction(cases, repeat):
+    # Repeated evaluation of one network with a ContractionPlan, the way a
+    # parameter sweep contracts it
+    results = []
+    for kind, parameters in cases:
+        network, _ = GENERATORS[kind](**parameters)
+        plan = network.compile()
+        arrays = [tensor.data for tensor in network.tensors]
+        out = np.empty(plan.output_shape, dtype=plan.dtype)
+
+        def run(_):
+            for _ in range(PLAN_EVALUATIONS):
+                plan.execute(arrays, out=out)
+
+        times = measure(lambda: None, run, repeat)
+        results.append(result_entry('compiled_contraction', kind, parameters, times,
+                                    evaluations=PLAN_EVALUATIONS, flops=plan.flops,
+                                    buffer_bytes=plan.nbytes))
+    return results
+
+
+class GuiHarness:
+    # The GUI package with its blocking dialogs answered automatically
+    def __init__(self):
+        from PyQt5.QtWidgets import QApplication, QMessageBox
+        self.app = QApplication.instance() or QApplication([])
+        from tensor_network_gui import dialogs, items, window
+        self.items = items
+        self.window_class = window.MainWindow
+        self.warnings = []
+        QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+        QMessageBox.warning = staticmethod(lambda *args, **kwargs: self.warnings.append(args[1:]))
+        QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+        QMessageBox.exec_ = lambda message_box: QMessageBox.Ok
+        self.truncation_dim = None
+        harness = self
+
+        class AutoTruncationDialog(dialogs.TruncationDialog):
+            def exec_(self):
+                self.dimension_edit.setText(str(harness.truncation_dim))
+                self.accept()
+                return self.result()
+
+        # The window imports its dialogs when they are opened
+        dialogs.TruncationDialog = AutoTruncationDialog
+
+    def window(self, kind=None, parameters=None):
+        window = self.window_class()
+        window.flop_threshold = float('inf')
+        window.memory_threshold_bytes = float('inf')
+        window.memory_budget_bytes = 0
+        if kind is not None:
+            network, positions = GENERATORS[kind](**parameters)
+            window.editor.load_network(network, positions, {})
+        self.app.processEvents()
+        return window
+
+    def wait(self, window):
+        # Until the background computation has been applied to the network
+        while window.workers or not window.centralWidget().isEnabled():
+            self.app.processEvents()
+            time.sleep(0.0005)
+        self.app.processEvents()
+        if self.warnings:
+            # The operation was refused or failed, so its time means nothing
+            raise RuntimeError(f"Benchmark operation failed: {self.warnings.pop()}")
+
+
+def benchmark_pair_contraction(harness, cases, repeat):
+    results = []
+    for kind, parameters in cases:
+        def run(window):
+            nodes = window.editor.nodes
+            middle = len(nodes) // 2
+            window.perform_fast_contraction(nodes[middle - 1], nodes[middle])
+            harness.wait(window)
+
+        times = measure(lambda: harness.window(kind, parameters), run, repeat)
+        results.append(result_entry('gui_fast_contraction', kind, parameters, times))
+    return results
+
+
+def benchmark_svd(harness, cases, repeat):
+    results = []
+    for kind, parameters in cases:
+        harness.truncation_dim = parameters['bond_dim'] // 2
+
+        def run(window):
+            nodes = window.editor.nodes
+            middle = len(nodes) // 2
+            window.perform_svd(nodes[middle - 1], nodes[middle])
+            harness.wait(window)
+
+        times = measure(lambda: harness.window(kind, parameters), run, repeat)
+        results.append(result_entry('gui_svd', kind, parameters, times))
+    return results
+
+
+def benchmark_scene(harness, cases, counts, repeat):
+    results = []
+    for count in counts:
+        def add_nodes(window):
+            editor = window.editor
+            for i in range(count):
+                node = harness.items.Node(40 * (i % 40), 40 * (i // 40), index=len(editor.nodes))
+                editor.add_node(node)
+                for angle in (0, 120, 240):
+                    node.add_leg('physical', angle)
+            harness.app.processEvents()
+
+        times = measure(harness.window, add_nodes, repeat)
+        results.append(result_entry('scene_add_nodes', 'nodes', {'count': count}, times))
+
+    for kind, parameters in cases:
+        def load(window):
+            network, positions = GENERATORS[kind](**parameters)
+            window.editor.load_network(network, positions, {})
+            harness.app.processEvents()
+
+        times = measure(harness.window, load, repeat)
+        results.append(result_entry('scene_load_network', kind, parameters, times))
+
+        def drag(window):
+            # Every node is moved in small steps, as when dragged with the
+            # mouse; each step updates the attached legs and edges
+            for step in range(DRAG_STEPS):
+                offset = 1 if step % 2 == 0 else -1
+                for node in window.editor.nodes:
+                    node.setPos(node.pos().x() + offset, node.pos().y() + offset)
+                harness.app.processEvents()
+
+        times = measure(lambda: harness.window(kind, parameters), drag, repeat)
+        results.append(result_entry('scene_drag', kind, parameters, times, steps=DRAG_STEPS))
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def compare(results, baseline):
+    # Print the change of every median time against the baseline run
+    previous = {(entry['benchmark'], entry['network'], json.dumps(entry['parameters'], sort_keys=True)):
+                entry for entry in baseline['results']}
+    regressions = 0
+    for entry in results:
+        key = (entry['benchmark'], entry['network'], json.dumps(entry['parameters'], sort_keys=True))
+        if key not in previous:
+            continue
+        ratio = entry['median'] / previous[key]['median'] if previous[key]['median'] > 0 else 1.0
+        slower = ratio > REGRESSION_FACTOR
+        regressions += slower
+        print(f"{entry['benchmark']:22} {entry['network']:15} {key[2]:60} "
+              f"{ratio:6.2f}x{'  SLOWER' if slower else ''}")
+    return regressions
+
+
+def over_budget(results):
+    # Print and count the benchmarks whose median time exceeds their budget
+    count = 0
+    for entry in results:
+        if 'budget' in entry and entry['median'] > entry['budget']:
+            print(f"{entry['benchmark']} {entry['network']}: {entry['median'] * 1000:.0f} ms "
+                  f"exceeds the budget of {entry['budget'] * 1000:.0f} ms")
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the tensor network benchmarks.")
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help="JSON file for the results (default: benchmark_results.json)")
+    parser.add_argument('-r', '--repeat', type=int, default=3, help="runs per case (default: 3)")
+    parser.add_argument('--quick', action='store_true', help="only the two smallest sizes")
+    parser.add_argument('--no-gui', action='store_true', help="skip the benchmarks that need PyQt5")
+    parser.add_argument('--compare', help="earlier results to compare the median times with")
+    args = parser.parse_args(argv)
+
+    def sizes(cases):
+        return cases[:2] if args.quick else cases
+
+    full_cases = [case for kind in GENERATORS
+                  for case in sizes([case for case in FULL_CONTRACTION_CASES if case[0] == kind])]
+    startup_cases = [name for name in STARTUP_CASES if not (args.no_gui and name == 'gui_window')]
+    check_truncated_svd()
+    results = benchmark_startup(startup_cases, args.repeat)
+    results += benchmark_full_contraction(full_cases, args.repeat)
+    results += benchmark_compiled_contraction(full_cases, args.repeat)
+    if not args.no_gui:
+        harness = GuiHarness()
+        results += benchmark_pair_contraction(harness, sizes(PAIR_CONTRACTION_CASES), args.repeat)
+        results += benchmark_svd(harness, sizes(SVD_CASES), args.repeat)
+        results += benchmark_scene(harness, sizes(SCENE_CASES), sizes(ADD_NODE_COUNTS), args.repeat)
+
+    for entry in results:
+        print(f"{entry['benchmark']:22} {entry['network']:15} "
+              f"{json.dumps(entry['parameters']):60} {entry['median'] * 1000:10.2f} ms")
+    report = {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {args.output}")
+
+    failed = over_budget(results)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print(f"\nMedian time relative to {args.compare}:")
+        failed += compare(results, baseline)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
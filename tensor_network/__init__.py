@@ -0,0 +1,51 @@
+# Tensor network core: the network model, contraction paths and
+# decompositions, with numpy as the only dependency. The GUI in the
+# tensor_network_gui package is a view on top of this package.
+#
+# The names below are imported from their modules on first use, so that
+# importing the package (or running the command-line contractor) does not
+# load numpy before it is needed.
+
+import importlib
+
+_EXPORTS = {
+    'utils': ['ComputationCancelled', 'shape_size', 'format_bytes', 'resize_tensor'],
+    'contraction': [
+        'OPTIMAL_PATH_MAX_TENSORS', 'tensor_size', 'pair_result_labels',
+        'pair_contraction_flops', 'greedy_contraction_path', 'optimal_contraction_path',
+        'path_strategy', 'contraction_path', 'contraction_path_cost', 'estimate_pair_contraction',
+        'contract_pair_labels', 'contract_pair', 'contract_network', 'pair_contraction_labels',
+        'contraction_working_elements', 'sliced_contraction_cost', 'choose_sliced_labels', 'contract_network_sliced'
+    ],
+    'decomposition': [
+        'TRUNCATED_SVD_MAX_RATIO', 'TRUNCATED_SVD_MIN_SIZE', 'randomized_svd', 'lanczos_svd',
+        'choose_svd_solver', 'truncated_svd', 'truncation_dim_for_error', 'svd_bond_compression',
+        'svd_compression_flops'
+    ],
+    'storage': [
+        'DEFAULT_BLOCK_BYTES', 'is_memmap', 'load_npy', 'create_memmap', 'resize_memmap',
+        'blocked_tensordot', 'tensordot_to_memmap', 'tensordot'
+    ],
+    'cache': ['DEFAULT_CACHE_BYTES', 'DEFAULT_SPILL_BYTES', 'array_digest', 'pair_key',
+              'ContractionCache'],
+    'plan': ['ContractionPlan'],
+    'network': ['Index', 'Tensor', 'TensorNetwork', 'pair_axes', 'pair_result_indices'],
+    'project': ['PROJECT_EXTENSION', 'save_project', 'load_project'],
+    'profiling': ['LOG_FIELDS', 'OperationLog', 'array_bytes', 'array_shapes'],
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_MODULES[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,207 @@
+import collections
+import hashlib
+import os
+import tempfile
+import threading
+import weakref
+
+import numpy as np
+
+from . import storage
+from .storage import DEFAULT_BLOCK_BYTES, block_slices, _remove_file
+
+
+# Memory the intermediates of a ContractionCache may take by default
+DEFAULT_CACHE_BYTES = 2 ** 30
+
+# Disk space for the evicted intermediates, if spilling is enabled
+DEFAULT_SPILL_BYTES = 16 * 2 ** 30
+
+
+def array_digest(array, block_bytes=DEFAULT_BLOCK_BYTES):
+    # Hash of the dtype, shape and values of an array, read one block at a
+    # time so that a memory-mapped tensor is never loaded as a whole. SHA-256
+    # is hardware-accelerated on current CPUs, and hashlib releases the GIL
+    # while it hashes a block.
+    digest = hashlib.sha256()
+    digest.update(f"{array.dtype.str} {tuple(array.shape)}".encode())
+    if array.ndim == 0:
+        digest.update(np.ascontiguousarray(array).tobytes())
+        return digest.digest()
+    for block in block_slices(array.shape, array.itemsize, 0, block_bytes):
+        digest.update(np.ascontiguousarray(array[block]).data)
+    return digest.digest()
+
+
+def pair_key(key1, labels1, key2, labels2, result_labels):
+    # Key of the contraction of two cached operands. The result only depends
+    # on the operands and on how their axes are wired, so the labels are
+    # renamed in order of first appearance: the same subnetwork gets the
+    # same key in any network it is part of.
+    names = {}
+    for label in tuple(labels1) + tuple(labels2):
+        names.setdefault(label, len(names))
+    wiring = (tuple(names[label] for label in labels1), tuple(names[label] for label in labels2),
+              tuple(names[label] for label in result_labels))
+    return hashlib.sha256(key1 + key2 + repr(wiring).encode()).digest()
+
+
+def _remove_spilled(spilled):
+    for path, _, _ in spilled.values():
+        _remove_file(path)
+    spilled.clear()
+
+
+class ContractionCache:
+    # Intermediate results of network contractions, addressed by content.
+    # An input is keyed by the digest of its data, an intermediate by the
+    # keys of the two operands it was contracted from and the wiring of
+    # their axes (pair_key). When one tensor changes, only the
+    # intermediates that depend on it get new keys; all others are found
+    # again and the contraction only recomputes the path from the changed
+    # tensor to the root of the contraction tree.
+    #
+    # The entries in memory never exceed max_bytes. To make room, the entry
+    # with the lowest priority is evicted (GreedyDual-Size): the priority of
+    # an entry is the clock at its last use plus its recompute cost in
+    # FLOPs per byte, and the clock advances to the priority of every
+    # evicted entry. Ties go to the least recently used entry, so among
+    # entries of equal cost per byte this is plain LRU, and a
+    # large intermediate that was cheap to compute goes before a small,
+    # expensive one.
+    #
+    # With spill, evicted entries are written to .npy files in
+    # spill_directory (by default the scratch directory of memory-mapped
+    # tensors), up to spill_max_bytes with the least recently spilled
+    # deleted first, and read back into memory on a hit. Cached arrays are shared
+    # and must not be modified.
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, spill=False, spill_directory=None,
+                 spill_max_bytes=DEFAULT_SPILL_BYTES):
+        self.max_bytes = max_bytes
+        self.spill = spill
+        self.spill_directory = spill_directory
+        self.spill_max_bytes = spill_max_bytes
+        self.entries = {}  # Key -> [array, cost, priority, last use]
+        self.spilled = collections.OrderedDict()  # Key -> (path, bytes, cost), oldest first
+        self.nbytes = 0
+        self.spilled_bytes = 0
+        self.clock = 0.0
+        self.uses = 0
+        self.hits = 0  # Including the entries read back from disk
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self._lock = threading.Lock()
+        # The spill files go with the cache
+        weakref.finalize(self, _remove_spilled, self.spilled)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def leaf_key(self, array):
+        return array_digest(array)
+
+    def get(self, key):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self.uses += 1
+                entry[2] = self.clock + entry[1] / max(entry[0].nbytes, 1)
+                entry[3] = self.uses
+                return entry[0]
+            if key not in self.spilled:
+                self.misses += 1
+                return None
+            path, nbytes, cost = self.spilled[key]
+            try:
+                array = np.load(path, allow_pickle=False)
+            except (OSError, ValueError):
+                del self.spilled[key]
+                self.spilled_bytes -= nbytes
+                _remove_file(path)
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            if nbytes > self.max_bytes:
+                # Stays on disk only
+                self.spilled.move_to_end(key)
+                return array
+            del self.spilled[key]
+            self.spilled_bytes -= nbytes
+            _remove_file(path)
+            self._insert(key, array, cost)
+            return array
+
+    def put(self, key, array, cost=0):
+        # cost: FLOPs it takes to compute the array again
+        with self._lock:
+            if key not in self.entries:
+                self._insert(key, array, cost)
+
+    def set_budget(self, max_bytes, spill=False):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.spill = spill
+            if not spill:
+                _remove_spilled(self.spilled)
+                self.spilled_bytes = 0
+            while self.nbytes > self.max_bytes:
+                self._evict()
+
+    def stats(self):
+        return {'entries': len(self.entries), 'bytes': self.nbytes, 'max_bytes': self.max_bytes,
+                'spilled_entries': len(self.spilled), 'spilled_bytes': self.spilled_bytes,
+                'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'spills': self.spills}
+
+    def clear(self):
+        with self._lock:
+            self.entries = {}
+            _remove_spilled(self.spilled)
+            self.nbytes = 0
+            self.spilled_bytes = 0
+            self.clock = 0.0
+            self.uses = 0
+            self.hits = self.disk_hits = self.misses = self.evictions = self.spills = 0
+
+    def _insert(self, key, array, cost):
+        if array.nbytes > self.max_bytes:
+            # Too large to be kept in memory at all
+            self._spill(key, array, cost)
+            return
+        while self.nbytes + array.nbytes > self.max_bytes:
+            self._evict()
+        self.uses += 1
+        self.entries[key] = [array, cost, self.clock + cost / max(array.nbytes, 1), self.uses]
+        self.nbytes += array.nbytes
+
+    def _evict(self):
+        key = min(self.entries, key=lambda key: self.entries[key][2:])
+        array, cost, priority, _ = self.entries.pop(key)
+        self.nbytes -= array.nbytes
+        self.clock = priority
+        self.evictions += 1
+        self._spill(key, array, cost)
+
+    def _spill(self, key, array, cost):
+        if not self.spill or array.nbytes > self.spill_max_bytes:
+            return
+        while self.spilled and self.spilled_bytes + array.nbytes > self.spill_max_bytes:
+            path, nbytes, _ = self.spilled.popitem(last=False)[1]
+            self.spilled_bytes -= nbytes
+            _remove_file(path)
+        directory = self.spill_directory or storage.SCRATCH_DIRECTORY or tempfile.gettempdir()
+        handle, path = tempfile.mkstemp(suffix='.npy', prefix='tensor-cache-', dir=directory)
+        try:
+            with os.fdopen(handle, 'wb') as file:
+                np.save(file, array, allow_pickle=False)
+        except (OSError, ValueError):
+            # A full disk only costs the entry, not the contraction
+            _remove_file(path)
+            return
+        self.spilled[key] = (path, array.nbytes, cost)
+        self.spilled_bytes += array.nbytes
+        self.spills += 1
@@ -0,0 +1,135 @@
+# Command-line contractor: python -m tensor_network network.tnproj -o result.npy
+#
+# Contracts a network saved from the GUI (File > Save Project) without
+# importing PyQt5, so it can run on headless machines.
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Environment variables read by the BLAS libraries numpy may be linked to
+THREAD_VARIABLES = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+                    'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+BYTE_UNITS = {'': 1, 'B': 1, 'K': 2 ** 10, 'KB': 2 ** 10, 'M': 2 ** 20, 'MB': 2 ** 20,
+              'G': 2 ** 30, 'GB': 2 ** 30, 'T': 2 ** 40, 'TB': 2 ** 40}
+
+
+def parse_bytes(text):
+    # '512M', '2GB', '1000' -> number of bytes
+    text = text.strip().upper()
+    number = text.rstrip('KMGTB')
+    unit = text[len(number):]
+    if unit not in BYTE_UNITS:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}'")
+    try:
+        return int(float(number) * BYTE_UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}'")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m tensor_network',
+        description="Contract a saved tensor network project into a single tensor.")
+    parser.add_argument('project', help="project file saved from the GUI (.tnproj)")
+    parser.add_argument('-o', '--output', help="write the result tensor to this .npy file")
+    parser.add_argument('-s', '--strategy', choices=['auto', 'greedy', 'optimal'], default='auto',
+                        help="contraction path search (default: auto)")
+    parser.add_argument('-t', '--threads', type=int,
+                        help="number of threads of the linear algebra library")
+    parser.add_argument('-m', '--memory-budget', type=parse_bytes, default=0,
+                        help="slice bonds to keep the working memory below this size, "
+                             "e.g. 8G (default: no slicing)")
+    parser.add_argument('--no-mmap', action='store_true',
+                        help="read the tensor data into memory instead of memory-mapping it")
+    parser.add_argument('--json', action='store_true',
+                        help="print the statistics as JSON")
+    return parser
+
+
+def set_thread_count(threads, argv):
+    # The BLAS thread pool is sized when numpy is first imported. The package
+    # imports numpy lazily, so setting the thread variables is normally
+    # enough; if numpy was loaded already, the process restarts itself once
+    # with the variables set.
+    if threads is None or os.environ.get('TENSOR_NETWORK_THREADS') == str(threads):
+        return
+    for variable in THREAD_VARIABLES + ('TENSOR_NETWORK_THREADS',):
+        os.environ[variable] = str(threads)
+    if 'numpy' in sys.modules:
+        sys.stdout.flush()
+        os.execv(sys.executable, [sys.executable, '-m', 'tensor_network'] + list(argv))
+
+
+def contract_project(path, strategy='auto', memory_budget_bytes=0, mmap=True):
+    # Load and contract a project; returns the result tensor and statistics
+    from .contraction import contraction_path_cost, sliced_contraction_cost
+    from .project import load_project
+
+    stats = {'project': path}
+    start = time.perf_counter()
+    network, _, _ = load_project(path, mmap=mmap)
+    if not network.tensors:
+        raise ValueError(f"{path} contains no tensors.")
+    stats['load_seconds'] = time.perf_counter() - start
+    stats['tensors'] = len(network.tensors)
+
+    run = {}
+    result = network.contract_all(strategy, memory_budget_bytes, 'Result', stats=run)
+    specification = (run['inputs'], run['output'], run['size_dict'], run['path'])
+    sliced_labels = run['sliced_labels']
+    flops, largest, _ = contraction_path_cost(*specification)
+    sliced_flops, working = sliced_contraction_cost(*specification, sliced_labels)
+    stats['strategy'] = run['strategy']
+    stats['path_seconds'] = run['path_seconds']
+    stats['flops'] = sliced_flops if sliced_labels else flops
+    stats['largest_intermediate_bytes'] = largest * run['itemsize']
+    stats['working_bytes'] = working * run['itemsize']
+    stats['sliced_indices'] = len(sliced_labels)
+    stats['contraction_seconds'] = run['contraction_seconds']
+    stats['flops_per_second'] = stats['flops'] / stats['contraction_seconds'] \
+        if stats['contraction_seconds'] > 0 else 0.0
+    stats['result_shape'] = list(result.data.shape)
+    stats['result_indices'] = [index.label or f"{index.kind} {position}"
+                               for position, index in enumerate(result.indices())]
+    return result, stats
+
+
+def print_stats(stats):
+    from .utils import format_bytes
+    print(f"Project:        {stats['project']} ({stats['tensors']} tensors)")
+    print(f"Load:           {stats['load_seconds']:.3f} s")
+    print(f"Path search:    {stats['path_seconds']:.3f} s ({stats['strategy']})")
+    print(f"Contraction:    {stats['contraction_seconds']:.3f} s")
+    print(f"FLOPs:          {stats['flops']:.4g} ({stats['flops_per_second']:.4g} FLOP/s)")
+    print(f"Largest intermediate: {format_bytes(stats['largest_intermediate_bytes'])}, "
+          f"working memory: {format_bytes(stats['working_bytes'])}, "
+          f"sliced indices: {stats['sliced_indices']}")
+    print(f"Result shape:   {tuple(stats['result_shape'])} [{', '.join(stats['result_indices'])}]")
+    if 'output' in stats:
+        print(f"Written to:     {stats['output']}")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    set_thread_count(args.threads, argv)
+    try:
+        result, stats = contract_project(args.project, args.strategy, args.memory_budget,
+                                         mmap=not args.no_mmap)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    stats['threads'] = args.threads
+    if args.output:
+        import numpy as np
+        np.save(args.output, result.data)
+        stats['output'] = args.output
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_stats(stats)
+    return 0
@@ -0,0 +1,426 @@
+import itertools
+
+import numpy as np
+
+from .utils import ComputationCancelled, shape_size
+from .storage import tensordot
+from .cache import pair_key
+
+
+# Networks with at most this many tensors get an exhaustive (dynamic
+# programming) path search, larger ones fall back to the greedy search
+OPTIMAL_PATH_MAX_TENSORS = 10
+
+
+def tensor_size(labels, size_dict):
+    # Number of elements of a tensor carrying the given index labels
+    return shape_size(size_dict[label] for label in labels)
+
+
+def pair_result_labels(labels1, labels2, keep):
+    # Indices surviving a pairwise contraction: the ones still needed by
+    # another tensor or by the output (given as the set `keep`)
+    result = []
+    for label in tuple(labels1) + tuple(labels2):
+        if label in keep and label not in result:
+            result.append(label)
+    return tuple(result)
+
+
+def pair_contraction_flops(labels1, labels2, size_dict):
+    # One multiply and one add per term of the summation
+    return 2 * tensor_size(set(labels1) | set(labels2), size_dict)
+
+
+def _label_counts(tensors, output):
+    counts = {}
+    for labels in tensors:
+        for label in set(labels):
+            counts[label] = counts.get(label, 0) + 1
+    for label in output:
+        counts[label] = counts.get(label, 0) + 1
+    return counts
+
+
+def _pair_keep(labels1, labels2, counts):
+    # Labels of the pair that appear somewhere else (other tensors or output)
+    keep = set()
+    for label in set(labels1) | set(labels2):
+        occurrences = (label in labels1) + (label in labels2)
+        if counts[label] > occurrences:
+            keep.add(label)
+    return keep
+
+
+def greedy_contraction_path(inputs, output, size_dict):
+    # Repeatedly contract the pair that shrinks the network the most,
+    # preferring pairs that actually share an index over outer products
+    remaining = [tuple(labels) for labels in inputs]
+    counts = _label_counts(remaining, output)
+    path = []
+    while len(remaining) > 1:
+        best = None
+        best_outer = None
+        for i in range(len(remaining)):
+            for j in range(i + 1, len(remaining)):
+                labels1, labels2 = remaining[i], remaining[j]
+                keep = _pair_keep(labels1, labels2, counts)
+                result = pair_result_labels(labels1, labels2, keep)
+                score = (
+                    tensor_size(result, size_dict)
+                    - tensor_size(labels1, size_dict)
+                    - tensor_size(labels2, size_dict),
+                    pair_contraction_flops(labels1, labels2, size_dict)
+                )
+                candidate = (score, i, j, result)
+                if set(labels1) & set(labels2):
+                    if best is None or candidate[0] < best[0]:
+                        best = candidate
+                elif best_outer is None or candidate[0] < best_outer[0]:
+                    best_outer = candidate
+        if best is None:
+            best = best_outer
+        _, i, j, result = best
+        for label in set(remaining[i]) | set(remaining[j]):
+            counts[label] -= (label in remaining[i]) + (label in remaining[j])
+        for label in result:
+            counts[label] += 1
+        remaining.pop(j)
+        remaining.pop(i)
+        remaining.append(result)
+        path.append((i, j))
+    return path
+
+
+def optimal_contraction_path(inputs, output, size_dict):
+    # Exhaustive search over all contraction trees by dynamic programming on
+    # subsets of tensors, minimising the total FLOP count. Cost grows as 3^n,
+    # so this is only meant for small networks.
+    n = len(inputs)
+    inputs = [tuple(labels) for labels in inputs]
+    output_set = set(output)
+    label_masks = {}
+    for position, labels in enumerate(inputs):
+        for label in labels:
+            label_masks[label] = label_masks.get(label, 0) | (1 << position)
+
+    subset_labels = {}
+
+    def labels_of(mask):
+        # Open indices of the tensor obtained by contracting the subset `mask`
+        if mask not in subset_labels:
+            labels = []
+            for position in range(n):
+                if mask & (1 << position):
+                    for label in inputs[position]:
+                        if label in labels:
+                            continue
+                        if label in output_set or label_masks[label] & ~mask:
+                            labels.append(label)
+            subset_labels[mask] = tuple(labels)
+        return subset_labels[mask]
+
+    best = {}
+    for position in range(n):
+        best[1 << position] = (0, position)
+    for mask in sorted(range(1, 1 << n), key=lambda m: bin(m).count('1')):
+        if mask in best:
+            continue
+        lowest = mask & -mask
+        best_cost = None
+        best_tree = None
+        sub = (mask - 1) & mask
+        while sub:
+            # Only enumerate each unordered split once
+            if sub & lowest:
+                rest = mask ^ sub
+                cost = (best[sub][0] + best[rest][0]
+                        + pair_contraction_flops(labels_of(sub), labels_of(rest), size_dict))
+                if best_cost is None or cost < best_cost:
+                    best_cost = cost
+                    best_tree = (best[sub][1], best[rest][1])
+            sub = (sub - 1) & mask
+        best[mask] = (best_cost, best_tree)
+
+    # Turn the contraction tree into a sequence of pairwise steps
+    remaining = list(range(n))
+    path = []
+    next_id = [n]
+
+    def visit(tree):
+        if isinstance(tree, int):
+            return tree
+        left = visit(tree[0])
+        right = visit(tree[1])
+        i, j = sorted((remaining.index(left), remaining.index(right)))
+        remaining.pop(j)
+        remaining.pop(i)
+        remaining.append(next_id[0])
+        next_id[0] += 1
+        path.append((i, j))
+        return remaining[-1]
+
+    if n > 1:
+        visit(best[(1 << n) - 1][1])
+    return path
+
+
+def path_strategy(strategy, num_tensors):
+    # The search contraction_path runs for strategy: 'auto' picks the exact
+    # one for small networks
+    if strategy == 'auto':
+        return 'optimal' if num_tensors <= OPTIMAL_PATH_MAX_TENSORS else 'greedy'
+    return strategy
+
+
+def contraction_path(inputs, output, size_dict, strategy='auto'):
+    # strategy is one of 'auto', 'greedy' or 'optimal'
+    strategy = path_strategy(strategy, len(inputs))
+    if strategy == 'optimal':
+        return optimal_contraction_path(inputs, output, size_dict)
+    if strategy == 'greedy':
+        return greedy_contraction_path(inputs, output, size_dict)
+    raise ValueError(f"Unknown contraction path strategy '{strategy}'.")
+
+
+def contraction_path_cost(inputs, output, size_dict, path):
+    # Total FLOPs, the size (in elements) of the largest intermediate and the
+    # peak number of live elements, counting the inputs as alive throughout
+    remaining = [tuple(labels) for labels in inputs]
+    counts = _label_counts(remaining, output)
+    total_flops = 0
+    input_sizes = [tensor_size(labels, size_dict) for labels in remaining]
+    largest_intermediate = max(input_sizes + [1])
+    # Sizes of intermediates that are currently alive (inputs are tracked separately)
+    live = [0] * len(remaining)
+    peak_elements = sum(input_sizes)
+    for i, j in path:
+        labels1, labels2 = remaining[i], remaining[j]
+        keep = _pair_keep(labels1, labels2, counts)
+        result = pair_result_labels(labels1, labels2, keep)
+        result_size = tensor_size(result, size_dict)
+        total_flops += pair_contraction_flops(labels1, labels2, size_dict)
+        largest_intermediate = max(largest_intermediate, result_size)
+        peak_elements = max(peak_elements, sum(input_sizes) + sum(live) + result_size)
+        for label in set(labels1) | set(labels2):
+            counts[label] -= (label in labels1) + (label in labels2)
+        for label in result:
+            counts[label] += 1
+        remaining.pop(j)
+        remaining.pop(i)
+        live.pop(j)
+        live.pop(i)
+        remaining.append(result)
+        live.append(result_size)
+    return total_flops, largest_intermediate, peak_elements
+
+
+def estimate_pair_contraction(dims1, dims2, axes1, axes2, itemsize=8):
+    # Cost of np.tensordot over the given axes, from the dimensions alone
+    contracted_size = 1
+    for axis in axes1:
+        contracted_size *= dims1[axis]
+    output_shape = tuple(d for axis, d in enumerate(dims1) if axis not in axes1) + \
+        tuple(d for axis, d in enumerate(dims2) if axis not in axes2)
+    output_size = shape_size(output_shape)
+    input_size = shape_size(dims1) + shape_size(dims2)
+    return {
+        'output_shape': output_shape,
+        'flops': 2 * output_size * contracted_size,
+        'output_bytes': output_size * itemsize,
+        # tensordot may copy both operands into matrix layout before the
+        # matrix product, on top of the inputs and the output
+        'peak_bytes': (2 * input_size + output_size) * itemsize,
+    }
+
+
+def contract_pair_labels(labels1, labels2, keep):
+    # Labels of the result of contract_pair, in its axis order
+    shared = [label for label in labels1 if label in labels2]
+    if any(label in keep for label in shared):
+        return pair_result_labels(labels1, labels2, keep)
+    return tuple(label for label in labels1 if label not in shared) + \
+        tuple(label for label in labels2 if label not in shared)
+
+
+def contract_pair(array1, labels1, array2, labels2, keep):
+    # Contract two labelled tensors, summing over every shared index that is
+    # not in `keep`. Returns the result and its labels.
+    result_labels = contract_pair_labels(labels1, labels2, keep)
+    shared = [label for label in labels1 if label in labels2]
+    if any(label in keep for label in shared):
+        # A shared index survives, which tensordot cannot express
+        symbols = {}
+        for label in tuple(labels1) + tuple(labels2):
+            symbols.setdefault(label, len(symbols))
+        result = np.einsum(
+            array1, [symbols[label] for label in labels1],
+            array2, [symbols[label] for label in labels2],
+            [symbols[label] for label in result_labels]
+        )
+        return result, result_labels
+    axes1 = [labels1.index(label) for label in shared]
+    axes2 = [labels2.index(label) for label in shared]
+    return tensordot(array1, array2, (axes1, axes2)), result_labels
+
+
+def contract_network(arrays, inputs, output, path, report_progress=None, is_cancelled=None,
+                     cache=None):
+    # Execute a contraction path; the result axes follow the order of `output`.
+    # report_progress(done, total) is called after every step, and
+    # is_cancelled() is polled before every step.
+    # With a ContractionCache, intermediates computed by an earlier
+    # contraction from the same data are reused instead of recomputed; each
+    # new one is cached with the FLOPs it took. The final step is never
+    # cached, as its result is handed out.
+    remaining = [(array, tuple(labels)) for array, labels in zip(arrays, inputs)]
+    counts = _label_counts([labels for _, labels in remaining], output)
+    if cache is not None:
+        keys = [cache.leaf_key(array) for array in arrays]
+    for step, (i, j) in enumerate(path):
+        if is_cancelled is not None and is_cancelled():
+            raise ComputationCancelled()
+        array2, labels2 = remaining.pop(j)
+        array1, labels1 = remaining.pop(i)
+        keep = _pair_keep(labels1, labels2, counts)
+        result = None
+        if cache is not None:
+            key2, key1 = keys.pop(j), keys.pop(i)
+            result_labels = contract_pair_labels(labels1, labels2, keep)
+            key = pair_key(key1, labels1, key2, labels2, result_labels)
+            keys.append(key)
+            if step + 1 < len(path):
+                result = cache.get(key)
+        if result is None:
+            result, result_labels = contract_pair(array1, labels1, array2, labels2, keep)
+            if cache is not None and step + 1 < len(path):
+                sizes = dict(zip(labels1, array1.shape))
+                sizes.update(zip(labels2, array2.shape))
+                cache.put(key, result, pair_contraction_flops(labels1, labels2, sizes))
+        for label in set(labels1) | set(labels2):
+            counts[label] -= (label in labels1) + (label in labels2)
+        for label in result_labels:
+            counts[label] += 1
+        remaining.append((result, result_labels))
+        if report_progress is not None:
+            report_progress(step + 1, len(path))
+    result, labels = remaining[0]
+    return np.transpose(result, [labels.index(label) for label in output])
+
+
+def pair_contraction_labels(dims1, dims2, axes1, axes2):
+    # Describe np.tensordot(a, b, axes=(axes1, axes2)) as a two-tensor
+    # network; the output order matches the one of tensordot
+    labels1 = list(range(len(dims1)))
+    labels2 = list(range(len(dims1), len(dims1) + len(dims2)))
+    for axis1, axis2 in zip(axes1, axes2):
+        labels2[axis2] = labels1[axis1]
+    size_dict = dict(zip(labels1, dims1))
+    size_dict.update(zip(labels2, dims2))
+    output = [label for label in labels1 if label not in labels2] + \
+        [label for label in labels2 if label not in labels1]
+    return [tuple(labels1), tuple(labels2)], tuple(output), size_dict
+
+
+def contraction_working_elements(inputs, output, size_dict, path):
+    # Peak number of elements allocated on top of the inputs: the live
+    # intermediates, the result of the current step and the copies
+    # tensordot may make of both operands
+    remaining = [tuple(labels) for labels in inputs]
+    counts = _label_counts(remaining, output)
+    live = [0] * len(remaining)
+    peak = 0
+    for i, j in path:
+        labels1, labels2 = remaining[i], remaining[j]
+        keep = _pair_keep(labels1, labels2, counts)
+        result = pair_result_labels(labels1, labels2, keep)
+        result_size = tensor_size(result, size_dict)
+        operand_copies = tensor_size(labels1, size_dict) + tensor_size(labels2, size_dict)
+        peak = max(peak, sum(live) + operand_copies + result_size)
+        for label in set(labels1) | set(labels2):
+            counts[label] -= (label in labels1) + (label in labels2)
+        for label in result:
+            counts[label] += 1
+        remaining.pop(j)
+        remaining.pop(i)
+        live.pop(j)
+        live.pop(i)
+        remaining.append(result)
+        live.append(result_size)
+    return peak
+
+
+def sliced_contraction_cost(inputs, output, size_dict, path, sliced_labels):
+    # Total FLOPs over all slices and the working memory (in elements) of a
+    # sliced contraction, including the full-size accumulator of the result
+    sliced_sizes = dict(size_dict)
+    num_slices = 1
+    for label in sliced_labels:
+        sliced_sizes[label] = 1
+        num_slices *= size_dict[label]
+    flops, _, _ = contraction_path_cost(inputs, output, sliced_sizes, path)
+    working = contraction_working_elements(inputs, output, sliced_sizes, path)
+    if sliced_labels:
+        working += tensor_size(output, size_dict)
+    return flops * num_slices, working
+
+
+def choose_sliced_labels(inputs, output, size_dict, path, memory_limit):
+    # Greedily pick contracted indices to slice until the working memory
+    # fits in memory_limit elements, or no further slice helps. Every slice
+    # trades memory for repeated work, so the cheapest reduction wins.
+    candidates = sorted({label for labels in inputs for label in labels} - set(output))
+    sliced = []
+    flops, working = sliced_contraction_cost(inputs, output, size_dict, path, sliced)
+    while working > memory_limit:
+        best = None
+        for label in candidates:
+            if label in sliced or size_dict[label] == 1:
+                continue
+            candidate_flops, candidate_working = sliced_contraction_cost(
+                inputs, output, size_dict, path, sliced + [label])
+            if candidate_working >= working:
+                continue
+            score = (candidate_working > memory_limit, candidate_flops, candidate_working)
+            if best is None or score < best[0]:
+                best = (score, label, candidate_working)
+        if best is None:
+            break
+        sliced.append(best[1])
+        working = best[2]
+    return sliced
+
+
+def contract_network_sliced(arrays, inputs, output, path, sliced_labels, size_dict,
+                            report_progress=None, is_cancelled=None, cache=None):
+    # Contract once per value of the sliced indices and sum the partial
+    # results. Slices are taken as size-1 views, so no input is copied.
+    # The cache is only used without slicing: caching the intermediates of
+    # every slice would defeat the memory budget the slicing is for.
+    if not sliced_labels:
+        return contract_network(arrays, inputs, output, path,
+                                report_progress=report_progress,
+                                is_cancelled=is_cancelled, cache=cache)
+    slice_values = list(itertools.product(*[range(size_dict[label]) for label in sliced_labels]))
+    total_steps = len(slice_values) * len(path)
+    result = None
+    for slice_number, values in enumerate(slice_values):
+        fixed = dict(zip(sliced_labels, values))
+        sliced_arrays = []
+        for array, labels in zip(arrays, inputs):
+            index = tuple(slice(fixed[label], fixed[label] + 1) if label in fixed else slice(None)
+                          for label in labels)
+            sliced_arrays.append(array[index])
+
+        def step_progress(done, total, offset=slice_number * len(path)):
+            if report_progress is not None:
+                report_progress(offset + done, total_steps)
+
+        partial = contract_network(sliced_arrays, inputs, output, path,
+                                   report_progress=step_progress,
+                                   is_cancelled=is_cancelled)
+        if result is None:
+            result = np.array(partial, copy=True)
+        else:
+            result += partial
+    return result
@@ -0,0 +1,289 @@
+import numpy as np
+
+from .utils import shape_size
+from .storage import DEFAULT_BLOCK_BYTES, is_memmap, block_step, create_memmap
+
+
+# The automatic SVD solver only computes the top-k triplets (randomized SVD)
+# when k is at most this fraction of the smaller matrix dimension, and the
+# matrix is at least this large; otherwise a dense SVD is cheaper and exact
+TRUNCATED_SVD_MAX_RATIO = 0.2
+TRUNCATED_SVD_MIN_SIZE = 200
+
+
+def _random_matrix(rng, shape, dtype):
+    if np.issubdtype(dtype, np.complexfloating):
+        return rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+    return rng.standard_normal(shape)
+
+
+def randomized_svd(matrix, k, oversampling=10, power_iterations=2, seed=None):
+    # Top-k SVD from a randomized range finder (Halko, Martinsson, Tropp).
+    # Power iterations sharpen the spectrum when it decays slowly.
+    m, n = matrix.shape
+    num_samples = min(k + oversampling, m, n)
+    rng = np.random.default_rng(seed)
+    Q, _ = np.linalg.qr(matrix @ _random_matrix(rng, (n, num_samples), matrix.dtype))
+    for _ in range(power_iterations):
+        Z, _ = np.linalg.qr(matrix.conj().T @ Q)
+        Q, _ = np.linalg.qr(matrix @ Z)
+    U, S, Vh = np.linalg.svd(Q.conj().T @ matrix, full_matrices=False)
+    return (Q @ U)[:, :k], S[:k], Vh[:k, :]
+
+
+def lanczos_svd(matrix, k, num_steps=None, seed=None):
+    # Top-k SVD from Golub-Kahan-Lanczos bidiagonalization with full
+    # reorthogonalization: matrix @ V = U @ B with B upper bidiagonal. B
+    # keeps the column of the last beta, so that U^H @ matrix = B @ V^H holds
+    # exactly; without it a matrix of rank <= num_steps, whose Krylov space
+    # closes on a small alpha, loses the last direction of V
+    m, n = matrix.shape
+    if num_steps is None:
+        num_steps = 2 * k + 10
+    num_steps = min(num_steps, m, n)
+    dtype = np.result_type(matrix.dtype, np.float64)
+    U = np.zeros((m, num_steps), dtype=dtype)
+    V = np.zeros((n, num_steps + 1), dtype=dtype)
+    B = np.zeros((num_steps, num_steps + 1), dtype=dtype)
+    rng = np.random.default_rng(seed)
+    v = _random_matrix(rng, n, dtype)
+    V[:, 0] = v / np.linalg.norm(v)
+    beta = 0.0
+    steps = 0
+    # Breakdown is judged relative to the largest alpha or beta so far, an
+    # estimate of the norm, so that the scale of the matrix does not matter
+    scale = 0.0
+    tolerance = np.finfo(float).eps * max(m, n)
+    for j in range(num_steps):
+        u = matrix @ V[:, j]
+        if j > 0:
+            u -= beta * U[:, j - 1]
+        u -= U[:, :j] @ (U[:, :j].conj().T @ u)
+        alpha = np.linalg.norm(u)
+        scale = max(scale, alpha)
+        if alpha <= tolerance * scale:
+            break
+        U[:, j] = u / alpha
+        B[j, j] = alpha
+        steps = j + 1
+        v = matrix.conj().T @ U[:, j] - alpha * V[:, j]
+        v -= V[:, :j + 1] @ (V[:, :j + 1].conj().T @ v)
+        beta = np.linalg.norm(v)
+        scale = max(scale, beta)
+        if beta <= tolerance * scale:
+            break
+        V[:, j + 1] = v / beta
+        B[j, j + 1] = beta
+    if steps < min(k, m, n):
+        # The Krylov space closed before k triplets were found (a zero or
+        # low-rank matrix); the exact SVD keeps k, like the other solvers
+        U, S, Vh = np.linalg.svd(matrix, full_matrices=False)
+        return U[:, :k], S[:k], Vh[:k, :]
+    P, S, Qh = np.linalg.svd(B[:steps, :steps + 1], full_matrices=False)
+    return (U[:, :steps] @ P)[:, :k], S[:k], (Qh @ V[:, :steps + 1].conj().T)[:k, :]
+
+
+def choose_svd_solver(shape, k):
+    if (min(shape) >= TRUNCATED_SVD_MIN_SIZE
+            and k <= TRUNCATED_SVD_MAX_RATIO * min(shape)):
+        return 'randomized'
+    return 'exact'
+
+
+def truncated_svd(matrix, k, solver='auto'):
+    # Top-k singular triplets. solver is 'auto', 'exact', 'randomized' or
+    # 'lanczos'; returns U, S, Vh and the solver that was used.
+    if solver == 'auto':
+        solver = choose_svd_solver(matrix.shape, k)
+    if solver == 'exact':
+        U, S, Vh = np.linalg.svd(matrix, full_matrices=False)
+    elif solver == 'randomized':
+        U, S, Vh = randomized_svd(matrix, k)
+    elif solver == 'lanczos':
+        U, S, Vh = lanczos_svd(matrix, k)
+    else:
+        raise ValueError(f"Unknown SVD solver '{solver}'.")
+    return U, S, Vh, solver
+
+
+def truncation_dim_for_error(singular_values, max_error=None, max_discarded_weight=None):
+    # Smallest bond dimension whose relative truncation error
+    # sqrt(sum_{i>=k} s_i^2 / sum s_i^2) and discarded weight
+    # (the same ratio without the square root) meet the given targets
+    weights = np.asarray(singular_values, dtype=float) ** 2
+    total = weights.sum()
+    if total == 0:
+        return 1
+    allowed = np.inf
+    if max_error is not None:
+        allowed = min(allowed, max_error ** 2)
+    if max_discarded_weight is not None:
+        allowed = min(allowed, max_discarded_weight)
+    # discarded[k] is the weight lost when keeping the first k values
+    discarded = np.append(np.cumsum(weights[::-1])[::-1], 0.0) / total
+    return max(int(np.argmax(discarded <= allowed)), 1)
+
+
+def _qr_flops(m, n):
+    # Householder QR of an m x n matrix, forming the thin Q as well
+    r = min(m, n)
+    return 4 * m * n * r - 4 * r ** 3 // 3
+
+
+def _svd_flops(m, n, k, solver):
+    small, large = min(m, n), max(m, n)
+    if solver == 'randomized':
+        # Range finder with two power iterations, then a small dense SVD
+        p = min(k + 10, small)
+        return 12 * m * n * p + 5 * _qr_flops(large, p) + 4 * n * p ** 2 + 22 * p ** 3
+    if solver == 'lanczos':
+        # Two matrix-vector products and full reorthogonalization per step
+        steps = min(2 * k + 10, small)
+        return 4 * m * n * steps + 4 * (m + n) * steps ** 2 + 22 * steps ** 3
+    return 4 * large * small ** 2 + 22 * small ** 3
+
+
+def svd_compression_flops(left_size, right_size, bond_dim, truncation_dim, method='qr',
+                          solver='exact'):
+    # Rough FLOP count of svd_bond_compression for tensors reshaped into
+    # (left_size x bond_dim) and (bond_dim x right_size) matrices, from the
+    # textbook counts of Householder QR and dense SVD
+    if method == 'qr':
+        r1, r2 = min(left_size, bond_dim), min(right_size, bond_dim)
+        core = _qr_flops(left_size, bond_dim) + _qr_flops(right_size, bond_dim) \
+            + 2 * r1 * bond_dim * r2
+        m, n = r1, r2
+        expand = 2 * left_size * r1 * truncation_dim + 2 * right_size * r2 * truncation_dim
+    else:
+        core = 2 * left_size * bond_dim * right_size
+        m, n = left_size, right_size
+        expand = 0
+    if solver == 'auto':
+        solver = choose_svd_solver((m, n), truncation_dim)
+    return core + _svd_flops(m, n, truncation_dim, solver) + expand \
+        + truncation_dim * right_size
+
+
+def _matrix_blocks(tensor, axis, block_bytes):
+    # Row blocks of tensor as a matrix with axis as its columns (axis moved
+    # last), taken along the first other axis so that only one block is
+    # read at a time. Yields the index of each block and the block.
+    lead = 0 if axis != 0 else 1
+    step = block_step(tensor.shape, tensor.itemsize, lead, block_bytes)
+    for start in range(0, tensor.shape[lead], step):
+        index = (slice(None),) * lead + (slice(start, start + step),)
+        block = np.moveaxis(np.asarray(tensor[index]), axis, -1)
+        yield index, block.reshape(-1, tensor.shape[axis])
+
+
+def _blocked_qr(tensor, axis, block_bytes):
+    # R factor of tensor as a matrix with axis last, from a tall-skinny QR:
+    # every row block is QR-decomposed and the stacked R factors once more.
+    # Returns R and the rows of the second Q factor belonging to each block.
+    factors = [np.linalg.qr(block, mode='r') for _, block in _matrix_blocks(tensor, axis, block_bytes)]
+    Q, R = np.linalg.qr(np.vstack(factors))
+    bounds = np.cumsum([0] + [len(factor) for factor in factors])
+    return R, [Q[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _blocked_isometry_product(tensor, axis, Q_parts, small, block_bytes):
+    # Q @ small for the Q factor of _blocked_qr, written block by block into
+    # a memory-mapped tensor shaped like tensor with the axis resized.
+    # The Q factor of every row block is recomputed, so it is never stored.
+    shape = list(tensor.shape)
+    shape[axis] = small.shape[1]
+    result = create_memmap(shape, np.result_type(tensor.dtype, small.dtype))
+    for (index, block), Q_part in zip(_matrix_blocks(tensor, axis, block_bytes), Q_parts):
+        Q_block, _ = np.linalg.qr(block)
+        target = np.moveaxis(result[index], axis, -1)
+        target[...] = (Q_block @ (Q_part @ small)).reshape(target.shape)
+    return result
+
+
+def svd_bond_compression(tensor1, axis1, tensor2, axis2, truncation_dim, method='qr',
+                         solver='auto', max_error=None, max_discarded_weight=None,
+                         block_bytes=DEFAULT_BLOCK_BYTES):
+    # Truncated SVD over the bond joining axis1 of tensor1 and axis2 of
+    # tensor2. Returns both updated tensors and a dict with the computed
+    # singular values, the kept bond dimension, the relative truncation error,
+    # the discarded weight and the solver used. The kept bond dimension may
+    # be smaller than requested when the combined matrix has a lower rank.
+    #
+    # method='qr' QR-decomposes both sides and only takes the SVD of the
+    # bond-sized core R1 @ R2^T, so the cost scales with the bond dimension.
+    # method='full' forms the dense (left_size x right_size) product first.
+    #
+    # With max_error or max_discarded_weight, truncation_dim is only an upper
+    # bound: the smallest bond dimension meeting the targets is kept. This
+    # needs the whole spectrum, so the exact solver is used.
+    #
+    # With method='qr', memory-mapped tensors are decomposed in row blocks of
+    # about block_bytes and the new tensors are memory-mapped as well.
+    bond_dim = tensor1.shape[axis1]
+    blocked = method == 'qr' and (is_memmap(tensor1) or is_memmap(tensor2)) \
+        and tensor1.ndim > 1 and tensor2.ndim > 1
+    if blocked:
+        R1, Q1_parts = _blocked_qr(tensor1, axis1, block_bytes)
+        R2, Q2_parts = _blocked_qr(tensor2, axis2, block_bytes)
+        target = R1 @ R2.T
+    else:
+        # Reshape tensor1 into a matrix with the bond axis last
+        moved1 = np.moveaxis(tensor1, axis1, -1)
+        left_dims = moved1.shape[:-1]
+        matrix1 = moved1.reshape(shape_size(left_dims), bond_dim)
+
+        # Reshape tensor2 into a matrix with the bond axis first
+        moved2 = np.moveaxis(tensor2, axis2, 0)
+        right_dims = moved2.shape[1:]
+        matrix2 = moved2.reshape(bond_dim, shape_size(right_dims))
+
+        if method == 'qr':
+            # matrix1 @ matrix2 = Q1 (R1 @ R2^T) Q2^T with isometric Q1, Q2
+            Q1, R1 = np.linalg.qr(matrix1)
+            Q2, R2 = np.linalg.qr(matrix2.T)
+            target = R1 @ R2.T
+        elif method == 'full':
+            target = matrix1 @ matrix2  # Shape: (left_size, right_size)
+        else:
+            raise ValueError(f"Unknown SVD compression method '{method}'.")
+
+    error_targets = max_error is not None or max_discarded_weight is not None
+    if error_targets:
+        solver = 'exact'
+    U, S, Vh, solver = truncated_svd(target, truncation_dim, solver=solver)
+    rank_limited = len(S) < truncation_dim and not error_targets
+    truncation_dim = min(truncation_dim, len(S))
+    if error_targets:
+        truncation_dim = min(truncation_dim,
+                             truncation_dim_for_error(S, max_error, max_discarded_weight))
+    left = U[:, :truncation_dim]
+    right = Vh[:truncation_dim, :]
+    if method == 'qr' and not blocked:
+        left = Q1 @ left
+        right = right @ Q2.T
+
+    # The isometries leave the Frobenius norm unchanged, so the discarded
+    # weight follows from the norm of the decomposed matrix
+    total_weight = np.linalg.norm(target) ** 2
+    kept_weight = np.sum(S[:truncation_dim] ** 2)
+    discarded_weight = max(total_weight - kept_weight, 0) / total_weight \
+        if total_weight > 0 else 0.0
+
+    if blocked:
+        new_tensor1 = _blocked_isometry_product(tensor1, axis1, Q1_parts, left, block_bytes)
+        new_tensor2 = _blocked_isometry_product(tensor2, axis2, Q2_parts,
+                                                (S[:truncation_dim, None] * right).T, block_bytes)
+    else:
+        new_tensor1 = left.reshape(left_dims + (truncation_dim,))
+        new_tensor1 = np.moveaxis(new_tensor1, -1, axis1)
+        new_tensor2 = (S[:truncation_dim, None] * right).reshape((truncation_dim,) + right_dims)
+        new_tensor2 = np.moveaxis(new_tensor2, 0, axis2)
+    info = {
+        'singular_values': S,
+        'kept_dim': truncation_dim,
+        'rank_limited': rank_limited,
+        'truncation_error': float(np.sqrt(discarded_weight)),
+        'discarded_weight': float(discarded_weight),
+        'solver': solver,
+    }
+    return new_tensor1, new_tensor2, info
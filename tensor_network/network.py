@@ -0,0 +1,501 @@
+import itertools
+import time
+
+import numpy as np
+
+from .contraction import (
+    _label_counts, choose_sliced_labels, contract_network_sliced, contraction_path, path_strategy,
+    estimate_pair_contraction
+)
+from .decomposition import svd_bond_compression
+from .plan import ContractionPlan
+from .utils import resize_tensor
+from .storage import tensordot, tensordot_to_memmap
+
+
+_index_ids = itertools.count()
+_tensor_ids = itertools.count()
+
+
+class Index:
+    # One axis of the network: an open leg belongs to a single tensor, a
+    # bond is shared by the two tensors it connects
+    def __init__(self, dimension=2, kind='physical', label=''):
+        self.id = next(_index_ids)
+        self.dimension = dimension
+        self.kind = kind  # 'physical' or 'bond'
+        self.label = label
+        self.tensors = []  # Tensors carrying this index
+
+    def is_bond(self):
+        return len(self.tensors) == 2
+
+    def other(self, tensor):
+        # The tensor at the other end of a bond
+        return self.tensors[1] if self.tensors[0] is tensor else self.tensors[0]
+
+
+class Tensor:
+    # legs and bonds are only changed through the methods below (or by
+    # TensorNetwork), which keep the lookup tables in sync with them.
+    #
+    # The array is stored in whatever layout it was produced in, with the
+    # Index of every axis recorded next to it. Changing the topology only
+    # relabels axes; data presents them in the order of indices() through a
+    # transposed view, so nothing is copied until a kernel needs a layout.
+    def __init__(self, name='', data=None):
+        self.id = next(_tensor_ids)
+        self.name = name
+        self.legs = []  # Open indices
+        self.bonds = []  # Indices shared with other tensors
+        self.version = 0  # Bumped on every change of the indices or labels
+        self._axes = None  # Axis of every index, rebuilt after a change
+        self._bond_neighbors = {}  # Bond -> tensor at its other end
+        self._neighbor_bonds = {}  # Neighbouring tensor -> bonds to it
+        self._array = None
+        self._axis_indices = None  # Index of every array axis, None = positional
+        self._labels = None  # (version, labels, axis of every label)
+        self.data = data
+
+    def _changed(self):
+        self.version += 1
+        self._axes = None
+
+    def _pin_labels(self):
+        # Positional data gets its labels fixed before the indices change,
+        # so that its axes keep their meaning
+        if (self._array is not None and self._axis_indices is None
+                and self._array.ndim == len(self.legs) + len(self.bonds)):
+            self._axis_indices = self.indices()
+
+    def _array_labels(self):
+        # Index of every axis of the stored array and the axis of every
+        # index. Without a consistent labelling (an index was added or
+        # removed on its own) the array is read positionally.
+        if self._labels is None or self._labels[0] != self.version:
+            order = self.indices()
+            labels = self._axis_indices
+            if labels is None or len(labels) != len(order) or set(labels) != set(order):
+                labels = order
+            self._labels = (self.version, labels,
+                            {index: axis for axis, index in enumerate(labels)})
+        return self._labels[1], self._labels[2]
+
+    @property
+    def data(self):
+        # The data with its axes in the order of indices(), as a view
+        if self._array is None:
+            return None
+        labels, axes = self._array_labels()
+        order = self.indices()
+        if labels == order or self._array.ndim != len(order):
+            return self._array
+        return np.transpose(self._array, [axes[index] for index in order])
+
+    @data.setter
+    def data(self, data):
+        # data is given in the order of indices()
+        self._array = data
+        self._axis_indices = None
+        self._pin_labels()
+        self._changed()
+
+    @property
+    def array(self):
+        # The stored array, with its axes in the order of axis_indices()
+        return self._array
+
+    def axis_indices(self):
+        return list(self._array_labels()[0])
+
+    def array_axis(self, index):
+        return self._array_labels()[1][index]
+
+    def set_data(self, array, axis_indices):
+        # Store array as is, its axes labelled by axis_indices
+        self._array = array
+        self._axis_indices = list(axis_indices)
+        self._changed()
+
+    def relabel(self, old, new):
+        # The axis of index old now belongs to index new
+        self._pin_labels()
+        if self._axis_indices is not None and old in self._axis_indices:
+            self._axis_indices[self._axis_indices.index(old)] = new
+            self._changed()
+
+    def indices(self):
+        # The axis order of data: open legs first, then bonds
+        return self.legs + self.bonds
+
+    def dims(self):
+        return [index.dimension for index in self.indices()]
+
+    def axis(self, index):
+        if self._axes is None:
+            self._axes = {item: axis for axis, item in enumerate(self.indices())}
+        return self._axes[index]
+
+    def has_index(self, index):
+        if self._axes is None:
+            self._axes = {item: axis for axis, item in enumerate(self.indices())}
+        return index in self._axes
+
+    def bonds_with(self, other):
+        return list(self._neighbor_bonds.get(other, ()))
+
+    def neighbors(self):
+        return list(self._neighbor_bonds)
+
+    def add_leg(self, dimension=2, kind='physical', label=''):
+        self._pin_labels()
+        leg = Index(dimension, kind, label)
+        leg.tensors.append(self)
+        self.legs.append(leg)
+        self._changed()
+        return leg
+
+    def remove_leg(self, leg):
+        self._pin_labels()
+        self.legs.remove(leg)
+        leg.tensors.remove(self)
+        self._changed()
+
+    def _add_bond(self, bond, other):
+        # bond.tensors is set by the caller
+        self._pin_labels()
+        self.bonds.append(bond)
+        self._bond_neighbors[bond] = other
+        self._neighbor_bonds.setdefault(other, []).append(bond)
+        self._changed()
+
+    def _set_bond_neighbor(self, bond, other):
+        # The bond keeps its axis but now ends at other
+        previous = self._bond_neighbors[bond]
+        self._neighbor_bonds[previous].remove(bond)
+        if not self._neighbor_bonds[previous]:
+            del self._neighbor_bonds[previous]
+        self._bond_neighbors[bond] = other
+        self._neighbor_bonds.setdefault(other, []).append(bond)
+        self._changed()
+
+    def remove_bond(self, bond):
+        self._pin_labels()
+        other = self._bond_neighbors.pop(bond)
+        self._neighbor_bonds[other].remove(bond)
+        if not self._neighbor_bonds[other]:
+            del self._neighbor_bonds[other]
+        self.bonds.remove(bond)
+        bond.tensors.remove(self)
+        self._changed()
+
+    def _clear(self):
+        self.legs = []
+        self.bonds = []
+        self._bond_neighbors = {}
+        self._neighbor_bonds = {}
+        self._changed()
+
+    def resize_data(self):
+        # Zero-pad / crop the data to the current dimensions
+        self.data = resize_tensor(self.data, tuple(self.dims()))
+
+    def check_data(self):
+        if self._array is None:
+            raise ValueError(f"{self.name} has no data.")
+        if tuple(self.data.shape) != tuple(self.dims()):
+            raise ValueError(f"The data of {self.name} does not match its legs.")
+
+    def copy(self):
+        # Detached copy with the same data and open legs, without bonds
+        new_tensor = Tensor(self.name)
+        for leg in self.legs:
+            new_tensor.add_leg(leg.dimension, leg.kind, leg.label)
+        new_tensor.data = self.data.copy() if self.data is not None else None
+        return new_tensor
+
+
+def pair_axes(tensor1, tensor2, bonds):
+    # Axes of the stored arrays of both tensors that a contraction over the
+    # given bonds sums
+    for bond in bonds:
+        if tensor1._bond_neighbors.get(bond) is not tensor2:
+            raise ValueError("The bond does not connect the two tensors.")
+    return [tensor1.array_axis(bond) for bond in bonds], \
+        [tensor2.array_axis(bond) for bond in bonds]
+
+
+def pair_result_indices(tensor1, tensor2, bonds):
+    # Indices left by np.tensordot of the stored arrays over the given
+    # bonds, in its output order
+    bonds = set(bonds)
+    return [index for index in tensor1.axis_indices() if index not in bonds] + \
+        [index for index in tensor2.axis_indices() if index not in bonds]
+
+
+class TensorNetwork:
+    # The tensors and their indices, independent of any view. Every
+    # topology change goes through these methods so that the index lists
+    # of the tensors stay consistent with the axes of their data.
+    def __init__(self):
+        self.tensors = []
+        self._adjacency = None  # Cached CSR adjacency and its topology key
+
+    def add_tensor(self, tensor):
+        self.tensors.append(tensor)
+        return tensor
+
+    def remove_tensor(self, tensor):
+        # The bonds of the removed tensor become open legs of its
+        # neighbours; returns these legs in the order of tensor.bonds
+        new_legs = []
+        for bond in tensor.bonds[:]:
+            other = bond.other(tensor)
+            other.remove_bond(bond)
+            tensor.remove_bond(bond)
+            new_leg = other.add_leg(bond.dimension, bond.kind, bond.label)
+            other.relabel(bond, new_leg)
+            new_legs.append(new_leg)
+        for leg in tensor.legs[:]:
+            tensor.remove_leg(leg)
+        self.tensors.remove(tensor)
+        return new_legs
+
+    def connect(self, leg1, leg2):
+        # Join two open legs of different tensors into a bond
+        tensor1, tensor2 = leg1.tensors[0], leg2.tensors[0]
+        if tensor1 is tensor2:
+            raise ValueError("A tensor cannot be connected to itself.")
+        if leg1.kind != leg2.kind:
+            raise ValueError("Only legs of the same type can be connected.")
+        if leg1.dimension != leg2.dimension:
+            raise ValueError("The dimensions of the legs do not match.")
+        bond = Index(leg1.dimension, leg1.kind, leg1.label or leg2.label)
+        tensor1.remove_leg(leg1)
+        tensor2.remove_leg(leg2)
+        bond.tensors = [tensor1, tensor2]
+        tensor1._add_bond(bond, tensor2)
+        tensor2._add_bond(bond, tensor1)
+        tensor1.relabel(leg1, bond)
+        tensor2.relabel(leg2, bond)
+        return bond
+
+    def disconnect(self, bond):
+        # Split a bond into one open leg on each of its tensors
+        new_legs = []
+        for tensor in bond.tensors[:]:
+            tensor.remove_bond(bond)
+            new_leg = tensor.add_leg(bond.dimension, bond.kind, bond.label)
+            tensor.relabel(bond, new_leg)
+            new_legs.append(new_leg)
+        return new_legs
+
+    def remove_bond(self, bond):
+        for tensor in bond.tensors[:]:
+            tensor.remove_bond(bond)
+
+    def adjacency(self):
+        # CSR adjacency over the positions in self.tensors: tensor i is
+        # bonded to neighbors[indptr[i]:indptr[i + 1]] through the bonds
+        # with the ids in bond_ids[indptr[i]:indptr[i + 1]]. The arrays are
+        # rebuilt only after the topology changed.
+        key = tuple((tensor.id, tensor.version) for tensor in self.tensors)
+        if self._adjacency is None or self._adjacency[0] != key:
+            positions = {tensor: position for position, tensor in enumerate(self.tensors)}
+            indptr = np.zeros(len(self.tensors) + 1, dtype=np.int64)
+            neighbors = []
+            bond_ids = []
+            for position, tensor in enumerate(self.tensors):
+                for bond in tensor.bonds:
+                    neighbors.append(positions[tensor._bond_neighbors[bond]])
+                    bond_ids.append(bond.id)
+                indptr[position + 1] = len(neighbors)
+            self._adjacency = (key, (indptr, np.array(neighbors, dtype=np.int64),
+                                     np.array(bond_ids, dtype=np.int64)))
+        return self._adjacency[1]
+
+    def connected_components(self):
+        # Groups of tensors joined by bonds, in the order of self.tensors
+        indptr, neighbors, _ = self.adjacency()
+        component = np.full(len(self.tensors), -1, dtype=np.int64)
+        components = []
+        for start in range(len(self.tensors)):
+            if component[start] >= 0:
+                continue
+            component[start] = len(components)
+            members = [start]
+            stack = [start]
+            while stack:
+                position = stack.pop()
+                for neighbor in neighbors[indptr[position]:indptr[position + 1]]:
+                    if component[neighbor] < 0:
+                        component[neighbor] = len(components)
+                        members.append(int(neighbor))
+                        stack.append(int(neighbor))
+            components.append([self.tensors[position] for position in sorted(members)])
+        return components
+
+    def specification(self, tensors=None):
+        # Describe the stored arrays of the tensors as labelled inputs: every
+        # index gets one integer label. Labels that occur only once (open legs, or bonds to
+        # tensors outside the selection) stay open in the output.
+        # Returns inputs, output, size_dict and the output indices.
+        if tensors is None:
+            tensors = self.tensors
+        inputs = []
+        size_dict = {}
+        index_labels = {}
+        label_indices = {}
+        for tensor in tensors:
+            labels = []
+            for index in tensor.axis_indices():
+                if index not in index_labels:
+                    index_labels[index] = len(index_labels)
+                    size_dict[index_labels[index]] = index.dimension
+                    label_indices[index_labels[index]] = index
+                labels.append(index_labels[index])
+            inputs.append(tuple(labels))
+        counts = _label_counts(inputs, ())
+        output = tuple(label for labels in inputs for label in labels if counts[label] == 1)
+        return inputs, output, size_dict, [label_indices[label] for label in output]
+
+    def replace_tensors(self, tensors, data, indices, name=''):
+        # Replace tensors by a single tensor holding their contraction. data
+        # has one axis per entry of indices, the indices the group leaves
+        # open, and is stored in that layout; bonds to tensors outside the
+        # group stay bonds.
+        result = Tensor(name)
+        group = set(tensors)
+        for index in indices:
+            outside = [tensor for tensor in index.tensors if tensor not in group]
+            if outside:
+                # A bond leaving the group now ends at the result
+                outside[0]._set_bond_neighbor(index, result)
+                index.tensors = [outside[0], result]
+                result._add_bond(index, outside[0])
+            else:
+                index.tensors = [result]
+                result.legs.append(index)
+        for tensor in tensors:
+            for bond in tensor.bonds:
+                if bond.tensors and all(t in group for t in bond.tensors):
+                    bond.tensors = []  # Contracted away
+            tensor._clear()
+            self.tensors.remove(tensor)
+        result.set_data(data, indices)
+        self.tensors.append(result)
+        return result
+
+    def merge_pair(self, tensor1, tensor2, data, name=''):
+        # Replace two tensors by data = their tensordot over all shared bonds
+        bonds = tensor1.bonds_with(tensor2)
+        indices = pair_result_indices(tensor1, tensor2, bonds)
+        return self.replace_tensors([tensor1, tensor2], data, indices, name)
+
+    def contract_pair(self, tensor1, tensor2, name='', memory_budget_bytes=0):
+        # A result larger than memory_budget_bytes (if set) is computed in
+        # blocks and written to a memory-mapped file
+        bonds = tensor1.bonds_with(tensor2)
+        axes1, axes2 = pair_axes(tensor1, tensor2, bonds)
+        array1, array2 = tensor1.array, tensor2.array
+        estimate = estimate_pair_contraction(array1.shape, array2.shape, axes1, axes2,
+                                             itemsize=np.result_type(array1, array2).itemsize)
+        if memory_budget_bytes and estimate['output_bytes'] > memory_budget_bytes:
+            data = tensordot_to_memmap(array1, array2, (axes1, axes2))
+        else:
+            data = tensordot(array1, array2, (axes1, axes2))
+        return self.merge_pair(tensor1, tensor2, data, name)
+
+    def contract_all(self, strategy='auto', memory_budget_bytes=0, name='',
+                     report_progress=None, is_cancelled=None, cache=None, stats=None):
+        # Contract the whole network into one tensor, slicing bonds if the
+        # working memory would exceed memory_budget_bytes (0 disables slicing).
+        # With a ContractionCache, intermediates of an earlier contraction of
+        # the same tensors are reused. A stats dict is filled with the
+        # specification, the path and the sliced labels, and the seconds the
+        # path search and the contraction took.
+        for tensor in self.tensors:
+            tensor.check_data()
+        start = time.perf_counter()
+        inputs, output, size_dict, indices = self.specification()
+        path = contraction_path(inputs, output, size_dict, strategy=strategy)
+        itemsize = np.result_type(*[tensor.array for tensor in self.tensors]).itemsize
+        sliced_labels = []
+        if memory_budget_bytes:
+            sliced_labels = choose_sliced_labels(inputs, output, size_dict, path,
+                                                 memory_budget_bytes // itemsize)
+        path_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        data = contract_network_sliced([tensor.array for tensor in self.tensors], inputs,
+                                       output, path, sliced_labels, size_dict,
+                                       report_progress=report_progress,
+                                       is_cancelled=is_cancelled, cache=cache)
+        if stats is not None:
+            stats.update({'strategy': path_strategy(strategy, len(inputs)), 'inputs': inputs,
+                          'output': output, 'size_dict': size_dict, 'path': path,
+                          'sliced_labels': sliced_labels, 'itemsize': itemsize,
+                          'path_seconds': path_seconds,
+                          'contraction_seconds': time.perf_counter() - start})
+        return self.replace_tensors(list(self.tensors), data, indices, name)
+
+    def compile(self, strategy='auto', dtype=None, batched=(), batch_size=1):
+        # A ContractionPlan of the whole network, for contracting it many
+        # times with other values. It takes one array per tensor, in the
+        # order of self.tensors and the layout of tensor.data, and returns
+        # the result with its axes in the order of the output indices of
+        # specification(). dtype defaults to the one of the current data.
+        # The arrays of the tensors in batched carry a leading batch axis of
+        # batch_size values, which the result carries as its first axis.
+        inputs, output, size_dict, _ = self.specification()
+        batch_label = len(size_dict)
+        data_inputs = []
+        for tensor, labels in zip(self.tensors, inputs):
+            index_labels = dict(zip(tensor.axis_indices(), labels))
+            labels = tuple(index_labels[index] for index in tensor.indices())
+            data_inputs.append((batch_label,) + labels if tensor in batched else labels)
+        if batched:
+            size_dict[batch_label] = batch_size
+            output = (batch_label,) + tuple(output)
+        if dtype is None:
+            arrays = [tensor.array for tensor in self.tensors if tensor.array is not None]
+            dtype = np.result_type(*arrays) if arrays else np.float64
+        path = contraction_path(data_inputs, output, size_dict, strategy=strategy)
+        return ContractionPlan(data_inputs, output, size_dict, path, dtype=dtype)
+
+    def contract_batched(self, batches, strategy='auto', report_progress=None, is_cancelled=None):
+        # Contract the network once for a whole batch of values: batches maps
+        # tensors to arrays of shape (batch size,) + tensor.dims(), the other
+        # tensors keep their data. The batch axis is carried through every
+        # step, so each step is one (batched) matrix product instead of one
+        # product per value. The network is left unchanged. Returns the
+        # result, with the batch axis first, and the output indices.
+        if not batches:
+            raise ValueError("No batch was given.")
+        for tensor in self.tensors:
+            if tensor not in batches:
+                tensor.check_data()
+        batch_sizes = set()
+        for tensor, array in batches.items():
+            if tuple(array.shape[1:]) != tuple(tensor.dims()):
+                raise ValueError(f"The batch of {tensor.name} has shape {array.shape}, "
+                                 f"expected (batch size, {', '.join(map(str, tensor.dims()))}).")
+            batch_sizes.add(array.shape[0])
+        if len(batch_sizes) != 1:
+            raise ValueError("All batches must have the same number of values.")
+        arrays = [batches[tensor] if tensor in batches else tensor.data for tensor in self.tensors]
+        plan = self.compile(strategy, dtype=np.result_type(*arrays), batched=set(batches),
+                            batch_size=batch_sizes.pop())
+        data = plan.execute(arrays, report_progress=report_progress, is_cancelled=is_cancelled)
+        return data, self.specification()[3]
+
+    def compress_bond(self, bond, truncation_dim, **options):
+        # Truncated SVD over a bond; options are passed on to
+        # svd_bond_compression. Returns its info dict.
+        tensor1, tensor2 = bond.tensors
+        new_data1, new_data2, info = svd_bond_compression(
+            tensor1.array, tensor1.array_axis(bond), tensor2.array, tensor2.array_axis(bond),
+            truncation_dim, **options)
+        tensor1.set_data(new_data1, tensor1.axis_indices())
+        tensor2.set_data(new_data2, tensor2.axis_indices())
+        bond.dimension = info['kept_dim']
+        return info
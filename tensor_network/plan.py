@@ -0,0 +1,189 @@
+import numpy as np
+
+from .contraction import _label_counts, _pair_keep, pair_contraction_flops
+from .utils import ComputationCancelled, shape_size
+
+
+def _matrix_layout(labels, batch, free, contracted, contracted_first, size_dict):
+    # How an operand with axes `labels` enters a matrix product as a stack
+    # of (free, contracted) matrices, or (contracted, free) if
+    # contracted_first, over the batch labels. Returns the permutation that
+    # groups its axes that way (None if they already are), the shape to
+    # reshape the grouped axes to and whether the matrices are used
+    # transposed.
+    batch_shape = (shape_size(size_dict[label] for label in batch),) if batch else ()
+    free_size = shape_size(size_dict[label] for label in free)
+    contracted_size = shape_size(size_dict[label] for label in contracted)
+    labels = tuple(labels)
+    if labels == batch + free + contracted:
+        return None, batch_shape + (free_size, contracted_size), contracted_first
+    if labels == batch + contracted + free:
+        return None, batch_shape + (contracted_size, free_size), not contracted_first
+    order = batch + (contracted + free if contracted_first else free + contracted)
+    permutation = tuple(labels.index(label) for label in order)
+    if contracted_first:
+        return permutation, batch_shape + (contracted_size, free_size), False
+    return permutation, batch_shape + (free_size, contracted_size), False
+
+
+class ContractionPlan:
+    # A contraction path compiled for fixed input shapes, to be executed on
+    # many sets of arrays: parameter sweeps evaluate the same network
+    # thousands of times with different values. Everything that only
+    # depends on the labels is worked out once here: the operands of every
+    # step, the matrix layout of each operand (which axes are grouped, and
+    # whether the matrix is read transposed) and the final transposition.
+    # Execution is then a loop of np.matmul calls into buffers allocated up
+    # front, without path search, label lookups or allocations.
+    #
+    # A shared index that is still needed after a step (a batch index, or a
+    # hyperedge) becomes the stacking axis of a batched matrix product, so
+    # every step is a matmul. An index in only one operand is folded into
+    # the rows or columns of its matrix: a batch carried by one side costs a
+    # single large product.
+    #
+    # Intermediates share buffers once they are consumed, so the buffers
+    # hold about as much as the peak of live intermediates. An operand whose
+    # axes cannot be grouped by a reshape is copied into a staging buffer,
+    # as np.tensordot would; a layout that allows it is read in place, also
+    # when the matrix is needed transposed. Plans are not thread-safe: two
+    # executions at the same time would share the buffers.
+    def __init__(self, inputs, output, size_dict, path, dtype=np.float64):
+        self.inputs = [tuple(labels) for labels in inputs]
+        self.output = tuple(output)
+        self.path = [tuple(step) for step in path]
+        self.dtype = np.dtype(dtype)
+        self.input_shapes = [tuple(size_dict[label] for label in labels)
+                             for labels in self.inputs]
+        self.output_shape = tuple(size_dict[label] for label in self.output)
+        buffer_sizes = []
+        free_buffers = []
+
+        def allocate(size):
+            # The smallest free buffer that is large enough, else the largest
+            # free one grown to size (nothing is allocated until the end)
+            fitting = [number for number in free_buffers if buffer_sizes[number] >= size]
+            if fitting:
+                number = min(fitting, key=lambda number: buffer_sizes[number])
+            elif free_buffers:
+                number = max(free_buffers, key=lambda number: buffer_sizes[number])
+                buffer_sizes[number] = size
+            else:
+                buffer_sizes.append(size)
+                return len(buffer_sizes) - 1
+            free_buffers.remove(number)
+            return number
+
+        # Operands are numbered: the inputs first, then the result of every step
+        slot_labels = list(self.inputs)
+        slot_buffers = [None] * len(self.inputs)
+        remaining = list(range(len(self.inputs)))
+        counts = _label_counts(self.inputs, self.output)
+        steps = []
+        self.flops = 0  # Per execution
+        for i, j in self.path:
+            slot2 = remaining.pop(j)
+            slot1 = remaining.pop(i)
+            labels1, labels2 = slot_labels[slot1], slot_labels[slot2]
+            keep = _pair_keep(labels1, labels2, counts)
+            self.flops += pair_contraction_flops(labels1, labels2, size_dict)
+            batch = tuple(label for label in labels1 if label in labels2 and label in keep)
+            contracted = tuple(label for label in labels1 if label in labels2 and label not in keep)
+            free1 = tuple(label for label in labels1 if label not in labels2)
+            free2 = tuple(label for label in labels2 if label not in labels1)
+            result_labels = batch + free1 + free2
+            # Sum over the contracted indices in the order that reads more
+            # operands in place
+            best = None
+            for order in (contracted, tuple(label for label in labels2 if label in contracted)):
+                layout1 = _matrix_layout(labels1, batch, free1, order, False, size_dict)
+                layout2 = _matrix_layout(labels2, batch, free2, order, True, size_dict)
+                copies = (layout1[0] is not None) + (layout2[0] is not None)
+                if best is None or copies < best[0]:
+                    best = (copies, layout1, layout2)
+            operands = []
+            for permutation, shape, transposed in best[1:]:
+                staging = allocate(shape_size(shape)) if permutation is not None else None
+                operands.append([permutation, shape, transposed, staging])
+            (_, shape1, transposed1, _), (_, shape2, transposed2, _) = operands
+            matrix_shape = shape1[:-2] + (shape1[-2 + transposed1], shape2[-1 - transposed2])
+            out = allocate(shape_size(matrix_shape))
+            steps.append((slot1, slot2, out, matrix_shape,
+                          tuple(size_dict[label] for label in result_labels), operands))
+            for operand in operands:
+                if operand[3] is not None:
+                    free_buffers.append(operand[3])
+            for slot in (slot1, slot2):
+                if slot_buffers[slot] is not None:
+                    free_buffers.append(slot_buffers[slot])
+            for label in set(labels1) | set(labels2):
+                counts[label] -= (label in labels1) + (label in labels2)
+            for label in result_labels:
+                counts[label] += 1
+            slot_labels.append(result_labels)
+            slot_buffers.append(out)
+            remaining.append(len(slot_labels) - 1)
+        if len(remaining) != 1:
+            raise ValueError(f"The path leaves {len(remaining)} tensors instead of one.")
+        final_labels = slot_labels[remaining[0]]
+        self.final_permutation = tuple(final_labels.index(label) for label in self.output)
+
+        # The buffers, and views of them in every shape a step reads or writes
+        self.buffers = [np.empty(size, dtype=self.dtype) for size in buffer_sizes]
+        self.nbytes = sum(buffer.nbytes for buffer in self.buffers)
+
+        def view(number, shape):
+            return self.buffers[number][:shape_size(shape)].reshape(shape)
+
+        self.steps = []
+        for slot1, slot2, out, matrix_shape, result_shape, operands in steps:
+            views = []
+            for (permutation, shape, transposed, staging), labels in zip(
+                    operands, (slot_labels[slot1], slot_labels[slot2])):
+                target = None
+                if permutation is not None:
+                    permuted_shape = tuple(size_dict[labels[axis]] for axis in permutation)
+                    target = view(staging, permuted_shape)
+                views.append((permutation, target, shape, transposed))
+            self.steps.append((slot1, slot2, view(out, matrix_shape), view(out, result_shape),
+                               views[0], views[1]))
+        self.slots = len(slot_labels)
+
+    def execute(self, arrays, out=None, report_progress=None, is_cancelled=None):
+        # Contract arrays (one per input, in the order and shapes the plan was
+        # compiled for). The result is written to out if given, else to a new
+        # array; its axes follow the output labels. report_progress and
+        # is_cancelled work as in contract_network.
+        if len(arrays) != len(self.input_shapes):
+            raise ValueError(f"The plan takes {len(self.input_shapes)} arrays, got {len(arrays)}.")
+        for position, (array, shape) in enumerate(zip(arrays, self.input_shapes)):
+            if array.shape != shape:
+                raise ValueError(f"Array {position} has shape {array.shape}, "
+                                 f"the plan was compiled for {shape}.")
+        dtype = np.result_type(*arrays)
+        if not np.can_cast(dtype, self.dtype):
+            raise ValueError(f"The plan was compiled for {self.dtype} data, got {dtype}.")
+        values = list(arrays) + [None] * (self.slots - len(arrays))
+        slot = len(arrays)
+        for step, (slot1, slot2, matrix, result, operand1, operand2) in enumerate(self.steps):
+            if is_cancelled is not None and is_cancelled():
+                raise ComputationCancelled()
+            np.matmul(_operand_matrix(values[slot1], *operand1),
+                      _operand_matrix(values[slot2], *operand2), out=matrix)
+            values[slot] = result
+            slot += 1
+            if report_progress is not None:
+                report_progress(step + 1, len(self.steps))
+        result = np.transpose(values[-1], self.final_permutation)
+        if out is None:
+            return np.array(result, dtype=self.dtype, copy=True)
+        np.copyto(out, result)
+        return out
+
+
+def _operand_matrix(array, permutation, target, shape, transposed):
+    if permutation is not None:
+        np.copyto(target, np.transpose(array, permutation))
+        array = target
+    matrix = np.reshape(array, shape)
+    return np.swapaxes(matrix, -1, -2) if transposed else matrix
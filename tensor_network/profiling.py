@@ -0,0 +1,126 @@
+import contextlib
+import csv
+import json
+import threading
+import time
+import tracemalloc
+
+# Columns of an exported CSV log, in order
+LOG_FIELDS = ['started', 'operation', 'seconds', 'estimated_flops', 'flops',
+              'allocated_bytes', 'peak_bytes', 'shapes', 'details']
+
+
+def array_bytes(result):
+    # Bytes held by the arrays in a result (an array, or a tuple / list / dict
+    # containing arrays)
+    if hasattr(result, 'nbytes'):
+        return int(result.nbytes)
+    if isinstance(result, dict):
+        return sum(array_bytes(value) for value in result.values())
+    if isinstance(result, (tuple, list)):
+        return sum(array_bytes(value) for value in result)
+    return 0
+
+
+def array_shapes(result):
+    # Shapes of the arrays in a result, in the order array_bytes visits them
+    if hasattr(result, 'shape'):
+        return [list(result.shape)]
+    if isinstance(result, dict):
+        return [shape for value in result.values() for shape in array_shapes(value)]
+    if isinstance(result, (tuple, list)):
+        return [shape for value in result for shape in array_shapes(value)]
+    return []
+
+
+class OperationLog:
+    # Record of the operations of a session: wall time, estimated and actual
+    # FLOPs, allocated bytes and tensor shapes per operation. Listeners are
+    # called with every recorded entry.
+    #
+    # With memory tracing on, the peak memory allocated during an operation
+    # is recorded as well. tracemalloc slows down every allocation made from
+    # Python and counts all threads, so it is off by default.
+    def __init__(self):
+        self.entries = []
+        self.listeners = []
+        self.trace_memory = False
+        self._lock = threading.Lock()
+
+    def set_memory_tracing(self, enabled):
+        self.trace_memory = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not enabled and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def begin(self, operation, **fields):
+        # A new entry, to be filled in and passed to record()
+        entry = {'operation': operation, 'started': time.time(), 'seconds': None,
+                 'estimated_flops': None, 'flops': None, 'allocated_bytes': None,
+                 'peak_bytes': None, 'shapes': [], 'details': ''}
+        entry.update(fields)
+        return entry
+
+    @contextlib.contextmanager
+    def timed(self, entry):
+        # Time the enclosed code into entry, which may run on any thread
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry['seconds'] = time.perf_counter() - start
+            if tracing and tracemalloc.is_tracing():
+                entry['peak_bytes'] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+
+    def record(self, entry):
+        with self._lock:
+            self.entries.append(entry)
+        for listener in list(self.listeners):
+            listener(entry)
+
+    @contextlib.contextmanager
+    def measure(self, operation, **fields):
+        # begin(), timed() and record() in one, for operations that finish
+        # where they start
+        entry = self.begin(operation, **fields)
+        with self.timed(entry):
+            yield entry
+        self.record(entry)
+
+    def clear(self):
+        with self._lock:
+            self.entries = []
+
+    def summary(self):
+        # Count, total seconds, total FLOPs and largest allocation per
+        # operation, the most time-consuming first
+        totals = {}
+        for entry in self.entries:
+            total = totals.setdefault(entry['operation'], {
+                'operation': entry['operation'], 'count': 0, 'seconds': 0.0, 'flops': 0,
+                'allocated_bytes': 0})
+            total['count'] += 1
+            total['seconds'] += entry['seconds'] or 0.0
+            total['flops'] += entry['flops'] or entry['estimated_flops'] or 0
+            total['allocated_bytes'] = max(total['allocated_bytes'], entry['allocated_bytes'] or 0)
+        return sorted(totals.values(), key=lambda total: -total['seconds'])
+
+    def export(self, path):
+        # JSON (entries and summary) or, for a .csv path, one row per entry
+        if path.lower().endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=LOG_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for entry in self.entries:
+                    row = dict(entry)
+                    row['shapes'] = ' '.join('x'.join(str(d) for d in shape) or 'scalar'
+                                             for shape in entry['shapes'])
+                    writer.writerow(row)
+        else:
+            with open(path, 'w') as file:
+                json.dump({'entries': self.entries, 'summary': self.summary()}, file, indent=2)
@@ -0,0 +1,179 @@
+import json
+import os
+import struct
+
+import numpy as np
+
+from .network import Index, Tensor, TensorNetwork
+
+
+# A project file is the magic string, the length of the JSON manifest as an
+# unsigned 64-bit little-endian integer, the manifest, and then the raw
+# tensor data. Every array starts at a multiple of PROJECT_ALIGNMENT bytes,
+# so it can be memory-mapped in place when the project is opened.
+PROJECT_MAGIC = b'TNPROJ\x00\x01'
+PROJECT_VERSION = 1
+PROJECT_ALIGNMENT = 64
+PROJECT_EXTENSION = '.tnproj'
+
+
+def _aligned(offset):
+    return -(-offset // PROJECT_ALIGNMENT) * PROJECT_ALIGNMENT
+
+
+def _contiguous_layout(array, axis_indices):
+    # A permutation of the array that is C-contiguous without copying, if
+    # there is one (e.g. Fortran order or a transposed view), so that it can
+    # be written as is with its axis labels permuted alongside
+    if array.flags.c_contiguous or array.ndim < 2:
+        return array, axis_indices
+    order = sorted(range(array.ndim), key=lambda axis: -array.strides[axis])
+    permuted = np.transpose(array, order)
+    if permuted.flags.c_contiguous:
+        return permuted, [axis_indices[axis] for axis in order]
+    return array, axis_indices
+
+
+def save_project(path, network, tensor_views=None, index_views=None):
+    # Write the network to path. tensor_views and index_views optionally map
+    # tensors / indices to JSON-serializable dicts (e.g. positions in the
+    # editor) that are stored with them and handed back by load_project.
+    # The file is written next to path first and then moved over it.
+    tensor_views = tensor_views or {}
+    index_views = index_views or {}
+    index_ids = {}
+    indices = []
+    for tensor in network.tensors:
+        for index in tensor.indices():
+            if index not in index_ids:
+                index_ids[index] = len(indices)
+                entry = {'dimension': int(index.dimension), 'kind': index.kind,
+                         'label': index.label}
+                if index in index_views:
+                    entry['view'] = index_views[index]
+                indices.append(entry)
+
+    tensors = []
+    arrays = []
+    offset = 0
+    for tensor in network.tensors:
+        entry = {
+            'name': tensor.name,
+            'legs': [index_ids[index] for index in tensor.legs],
+            'bonds': [index_ids[index] for index in tensor.bonds],
+            'data': None,
+        }
+        if tensor in tensor_views:
+            entry['view'] = tensor_views[tensor]
+        if tensor.array is not None:
+            array, axis_indices = _contiguous_layout(np.asarray(tensor.array),
+                                                     tensor.axis_indices())
+            if array.dtype.hasobject:
+                raise ValueError(f"The data of {tensor.name} cannot be saved ({array.dtype}).")
+            offset = _aligned(offset)
+            entry['data'] = {
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'offset': offset,
+                'axes': [index_ids.get(index) for index in axis_indices],
+            }
+            arrays.append((offset, array))
+            offset += array.nbytes
+        tensors.append(entry)
+
+    manifest = json.dumps({
+        'format': 'tensor-network-project',
+        'version': PROJECT_VERSION,
+        'indices': indices,
+        'tensors': tensors,
+    }).encode('utf-8')
+    data_start = _aligned(len(PROJECT_MAGIC) + 8 + len(manifest))
+
+    temporary_path = f"{path}.saving"
+    try:
+        with open(temporary_path, 'wb') as file:
+            file.write(PROJECT_MAGIC)
+            file.write(struct.pack('<Q', len(manifest)))
+            file.write(manifest)
+            file.truncate(data_start + offset)
+            for array_offset, array in arrays:
+                if array.nbytes == 0:
+                    continue
+                file.seek(data_start + array_offset)
+                if array.flags.c_contiguous:
+                    file.write(memoryview(array.reshape(-1)).cast('B'))
+                else:
+                    # Stream one sub-array at a time instead of copying the
+                    # whole array into C order first
+                    for block in array:
+                        file.write(np.ascontiguousarray(block).tobytes())
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def load_project(path, mmap=True):
+    # Read a project written by save_project. Returns the network and the
+    # tensor / index views that were stored with it. With mmap=True the
+    # tensor data is memory-mapped copy-on-write: nothing is read until it
+    # is used, and changes stay in memory until the project is saved.
+    with open(path, 'rb') as file:
+        if file.read(len(PROJECT_MAGIC)) != PROJECT_MAGIC:
+            raise ValueError(f"{path} is not a tensor network project.")
+        (length,) = struct.unpack('<Q', file.read(8))
+        manifest = json.loads(file.read(length).decode('utf-8'))
+    if manifest.get('version', 0) > PROJECT_VERSION:
+        raise ValueError(f"{path} was written by a newer version (format {manifest['version']}).")
+    data_start = _aligned(len(PROJECT_MAGIC) + 8 + length)
+
+    indices = []
+    index_views = {}
+    for entry in manifest['indices']:
+        index = Index(entry['dimension'], entry['kind'], entry['label'])
+        if 'view' in entry:
+            index_views[index] = entry['view']
+        indices.append(index)
+
+    network = TensorNetwork()
+    tensor_views = {}
+    bond_ends = {}
+    for entry in manifest['tensors']:
+        tensor = network.add_tensor(Tensor(entry['name']))
+        for position in entry['legs']:
+            leg = indices[position]
+            leg.tensors.append(tensor)
+            tensor.legs.append(leg)
+        tensor._changed()
+        for position in entry['bonds']:
+            bond_ends.setdefault(position, []).append(tensor)
+        if 'view' in entry:
+            tensor_views[tensor] = entry['view']
+    # Bonds are attached once both ends exist, in the stored order
+    for entry, tensor in zip(manifest['tensors'], network.tensors):
+        for position in entry['bonds']:
+            bond = indices[position]
+            tensor1, tensor2 = bond_ends[position]
+            bond.tensors = [tensor1, tensor2]
+            tensor._add_bond(bond, tensor2 if tensor is tensor1 else tensor1)
+    for entry, tensor in zip(manifest['tensors'], network.tensors):
+        data = entry['data']
+        if data is None:
+            continue
+        dtype = np.dtype(data['dtype'])
+        shape = tuple(data['shape'])
+        offset = data_start + data['offset']
+        if mmap and len(shape) > 0 and 0 not in shape:
+            array = np.memmap(path, dtype=dtype, mode='c', offset=offset, shape=shape)
+        else:
+            with open(path, 'rb') as file:
+                file.seek(offset)
+                count = int(np.prod(shape, dtype=np.int64))
+                array = np.fromfile(file, dtype=dtype, count=count).reshape(shape)
+        axis_indices = [indices[position] if position is not None else None
+                        for position in data['axes']]
+        if None in axis_indices:
+            tensor.data = array
+        else:
+            tensor.set_data(array, axis_indices)
+    return network, tensor_views, index_views
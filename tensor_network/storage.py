@@ -0,0 +1,155 @@
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from .utils import ComputationCancelled, shape_size
+
+
+# Memory-mapped tensors are processed in blocks of about this many bytes, so
+# only one block of each has to be in memory at a time
+DEFAULT_BLOCK_BYTES = 64 * 2 ** 20
+
+# Directory of the files backing new memory-mapped tensors; None is the
+# system temporary directory
+SCRATCH_DIRECTORY = None
+
+
+def is_memmap(array):
+    return isinstance(array, np.memmap)
+
+
+def load_npy(path):
+    # Memory-map a .npy file copy-on-write: the data is read when it is used,
+    # and changes are never written back to the file
+    array = np.load(path, mmap_mode='c', allow_pickle=False)
+    if not is_memmap(array):
+        # np.load cannot map empty or zero-dimensional arrays
+        array = np.asarray(array)
+    return array
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def create_memmap(shape, dtype, directory=None):
+    # A new zero-filled tensor backed by a temporary .npy file, which is
+    # deleted again with the array
+    directory = directory or SCRATCH_DIRECTORY or tempfile.gettempdir()
+    handle, path = tempfile.mkstemp(suffix='.npy', prefix='tensor-', dir=directory)
+    os.close(handle)
+    try:
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=tuple(shape))
+    except Exception:
+        _remove_file(path)
+        raise
+    weakref.finalize(array, _remove_file, path)
+    return array
+
+
+def block_step(shape, itemsize, axis, block_bytes=DEFAULT_BLOCK_BYTES):
+    # Number of entries along axis per block of about block_bytes
+    if shape[axis] == 0:
+        return 1
+    slice_bytes = shape_size(shape) // shape[axis] * itemsize
+    return max(1, min(shape[axis], block_bytes // max(slice_bytes, 1)))
+
+
+def block_slices(shape, itemsize, axis, block_bytes=DEFAULT_BLOCK_BYTES):
+    # Index tuples that split an array of this shape into blocks along axis
+    step = block_step(shape, itemsize, axis, block_bytes)
+    for start in range(0, shape[axis], step):
+        yield (slice(None),) * axis + (slice(start, start + step),)
+
+
+def resize_memmap(array, new_dimensions, directory=None):
+    # Zero-padded / cropped memory-mapped copy of array, copied block by block
+    new_array = create_memmap(new_dimensions, array.dtype, directory)
+    if array.ndim == len(new_dimensions) and array.ndim > 0:
+        overlap = tuple(slice(0, min(o, n)) for o, n in zip(array.shape, new_dimensions))
+        source = array[overlap]
+        target = new_array[overlap]
+        for block in block_slices(source.shape, source.itemsize, 0):
+            target[block] = source[block]
+    elif array.ndim == 0 and len(new_dimensions) == 0:
+        new_array[()] = array[()]
+    return new_array
+
+
+def blocked_tensordot(array1, array2, axes, out=None, block_bytes=DEFAULT_BLOCK_BYTES,
+                      report_progress=None, is_cancelled=None):
+    # np.tensordot(array1, array2, axes) computed for one block of the larger
+    # input at a time, along its largest free axis, and written into out
+    # (a new in-memory array by default). Blocks are sized so that neither
+    # the input block nor the output block exceeds block_bytes; the smaller
+    # input is brought into matrix layout once and reused for every block.
+    # report_progress(done, total) is called after every block, and
+    # is_cancelled() is polled before every block.
+    axes1, axes2 = [list(a) for a in axes]
+    free1 = [axis for axis in range(array1.ndim) if axis not in axes1]
+    free2 = [axis for axis in range(array2.ndim) if axis not in axes2]
+    shape = tuple(array1.shape[axis] for axis in free1) + \
+        tuple(array2.shape[axis] for axis in free2)
+    if out is None:
+        out = np.empty(shape, dtype=np.result_type(array1.dtype, array2.dtype))
+    if not free1 and not free2:
+        out[...] = np.tensordot(array1, array2, axes=(axes1, axes2))
+        return out
+    if free1 and (array1.nbytes >= array2.nbytes or not free2):
+        blocked, other = array1, array2
+        blocked_axes, other_axes, blocked_free, other_free = axes1, axes2, free1, free2
+        target = out
+    else:
+        # Contract the other way around into a transposed view of out
+        blocked, other = array2, array1
+        blocked_axes, other_axes, blocked_free, other_free = axes2, axes1, free2, free1
+        order = list(range(len(free1), len(shape))) + list(range(len(free1)))
+        target = np.transpose(out, order)
+    contracted_size = shape_size(other.shape[axis] for axis in other_axes)
+    other_shape = tuple(other.shape[axis] for axis in other_free)
+    other_matrix = np.transpose(other, other_axes + other_free).reshape(
+        contracted_size, shape_size(other_shape))
+
+    axis = max(blocked_free, key=lambda a: blocked.shape[a])
+    out_axis = blocked_free.index(axis)
+    step = min(block_step(blocked.shape, blocked.itemsize, axis, block_bytes),
+               block_step(target.shape, target.itemsize, out_axis, block_bytes))
+    starts = range(0, blocked.shape[axis], step)
+    for number, start in enumerate(starts):
+        if is_cancelled is not None and is_cancelled():
+            raise ComputationCancelled()
+        block = blocked[(slice(None),) * axis + (slice(start, start + step),)]
+        block_shape = tuple(block.shape[a] for a in blocked_free)
+        matrix = np.transpose(block, blocked_free + blocked_axes).reshape(
+            shape_size(block_shape), contracted_size)
+        target[(slice(None),) * out_axis + (slice(start, start + step),)] = \
+            (matrix @ other_matrix).reshape(block_shape + other_shape)
+        if report_progress is not None:
+            report_progress(number + 1, len(starts))
+    return out
+
+
+def tensordot_to_memmap(array1, array2, axes, directory=None, block_bytes=DEFAULT_BLOCK_BYTES,
+                        report_progress=None, is_cancelled=None):
+    # np.tensordot for results larger than memory: every output block is
+    # written straight into a new memory-mapped file, which backs the result
+    axes1, axes2 = [list(a) for a in axes]
+    shape = tuple(d for axis, d in enumerate(array1.shape) if axis not in axes1) + \
+        tuple(d for axis, d in enumerate(array2.shape) if axis not in axes2)
+    out = create_memmap(shape, np.result_type(array1.dtype, array2.dtype), directory)
+    blocked_tensordot(array1, array2, (axes1, axes2), out=out, block_bytes=block_bytes,
+                      report_progress=report_progress, is_cancelled=is_cancelled)
+    out.flush()
+    return out
+
+
+def tensordot(array1, array2, axes):
+    # np.tensordot that reads memory-mapped inputs one block at a time
+    if is_memmap(array1) or is_memmap(array2):
+        return blocked_tensordot(array1, array2, axes)
+    return np.tensordot(array1, array2, axes=axes)
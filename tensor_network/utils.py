@@ -0,0 +1,38 @@
+import numpy as np
+
+
+class ComputationCancelled(Exception):
+    pass
+
+
+def shape_size(shape):
+    # Number of elements for a shape, as an exact Python int
+    size = 1
+    for dimension in shape:
+        size *= int(dimension)
+    return size
+
+
+def format_bytes(num_bytes):
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num_bytes < 1024:
+            return f"{num_bytes:.3g} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.3g} TB"
+
+
+def resize_tensor(tensor, new_dimensions):
+    # Zero-padded / cropped copy of tensor with the new dimensions. A tensor
+    # that already has them is returned as is, and a memory-mapped one is
+    # copied into a new memory-mapped file instead of into memory.
+    if tensor is not None and tuple(tensor.shape) == tuple(new_dimensions):
+        return tensor
+    if isinstance(tensor, np.memmap):
+        from .storage import resize_memmap  # storage builds on this module
+        return resize_memmap(tensor, new_dimensions)
+    new_tensor = np.zeros(new_dimensions, dtype=tensor.dtype if tensor is not None else float)
+    if tensor is not None and tensor.ndim == len(new_dimensions):
+        # Determine slices for old dimensions
+        slices = tuple(slice(0, min(o, n)) for o, n in zip(tensor.shape, new_dimensions))
+        new_tensor[slices] = tensor[slices]
+    return new_tensor
@@ -0,0 +1,15 @@
+# PyQt5 editor on top of the tensor_network package. Importing this package
+# loads neither Qt nor numpy; main() imports the window, and the dialogs,
+# help and profiling panel are only imported when they are first opened.
+
+import sys
+
+
+def main():
+    from PyQt5.QtWidgets import QApplication
+    from .window import MainWindow
+
+    app = QApplication(sys.argv)
+    window = MainWindow()
+    window.show()
+    sys.exit(app.exec_())
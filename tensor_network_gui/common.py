@@ -0,0 +1,81 @@
+# Settings, the session's operation log and helpers shared by the editor
+# modules
+
+import numpy as np
+
+from tensor_network import OperationLog
+
+
+# Default thresholds above which a contraction asks for confirmation
+DEFAULT_FLOP_THRESHOLD = 1e11
+DEFAULT_MEMORY_THRESHOLD_BYTES = 4 * 1024 ** 3
+
+# Working memory a contraction may allocate before bonds get sliced
+# (0 disables slicing)
+DEFAULT_MEMORY_BUDGET_BYTES = 8 * 1024 ** 3
+
+# Table headers only stretch to fill the view up to this many sections,
+# beyond that the cells keep a readable default width
+TABLE_STRETCH_MAX_SECTIONS = 20
+
+# Anchor colors (low to high) of the heatmap color scale
+HEATMAP_COLORS = [
+    (68, 1, 84), (59, 82, 139), (33, 145, 140), (94, 201, 98), (253, 231, 37)
+]
+
+
+# Every timed operation of the session, shown in the profiling panel
+operation_log = OperationLog()
+
+
+def open_dialog(dialog_class, *args):
+    # Build a dialog, recording in the operation log how long that took
+    with operation_log.measure(f"Open {dialog_class.__name__}"):
+        return dialog_class(*args)
+
+
+def parse_tensor_value(text, dtype):
+    # Parse a cell entered by the user for a tensor of the given dtype
+    text = text.strip()
+    if not text:
+        raise ValueError("Value is missing.")
+    if np.issubdtype(dtype, np.complexfloating):
+        return complex(text.replace(' ', ''))
+    return float(text)
+
+
+def heatmap_color_table():
+    # 256 ARGB colors interpolated between the HEATMAP_COLORS anchors
+    anchors = np.array(HEATMAP_COLORS, dtype=float)
+    positions = np.linspace(0, 1, len(anchors))
+    levels = np.linspace(0, 1, 256)
+    channels = [np.interp(levels, positions, anchors[:, c]).astype(np.uint32) for c in range(3)]
+    return np.uint32(0xFF000000) | (channels[0] << 16) | (channels[1] << 8) | channels[2]
+
+
+def heatmap_pixels(matrix, mode='magnitude', log_scale=False):
+    # Map a 2D slice onto ARGB32 pixels with numpy alone. mode is
+    # 'magnitude', 'real' or 'imag'; log_scale colors by log10 of the
+    # magnitude. Returns the pixels and the (low, high) value range.
+    if mode == 'magnitude':
+        values = np.abs(matrix)
+    elif mode == 'real':
+        values = np.real(matrix)
+    elif mode == 'imag':
+        values = np.imag(matrix)
+    else:
+        raise ValueError(f"Unknown heatmap mode '{mode}'.")
+    values = np.asarray(values, dtype=float)
+    if log_scale:
+        magnitude = np.abs(values)
+        positive = magnitude[magnitude > 0]
+        floor = positive.min() if positive.size else 1.0
+        values = np.log10(np.maximum(magnitude, floor))
+    finite = np.isfinite(values)
+    if finite.any():
+        low, high = float(values[finite].min()), float(values[finite].max())
+    else:
+        low, high = 0.0, 0.0
+    scale = 255 / (high - low) if high > low else 0.0
+    levels = np.clip(np.nan_to_num((values - low) * scale, nan=0.0, posinf=255, neginf=0), 0, 255)
+    return heatmap_color_table()[levels.astype(np.uint8)], (low, high)
@@ -0,0 +1,792 @@
+# Dialogs for editing tensors and indices and for the parameters of
+# contractions and SVDs
+
+import numpy as np
+
+from PyQt5.QtWidgets import (
+    QWidget, QPushButton, QVBoxLayout, QLabel, QHBoxLayout, QDialog, QFormLayout, QLineEdit,
+    QMessageBox, QCheckBox, QTableView, QHeaderView, QScrollArea, QFrame, QComboBox, QSpinBox
+)
+from PyQt5.QtGui import QPainter, QImage
+from PyQt5.QtCore import Qt, pyqtSignal, QAbstractTableModel, QModelIndex
+
+from tensor_network import format_bytes, resize_tensor
+
+from .common import TABLE_STRETCH_MAX_SECTIONS, open_dialog, parse_tensor_value, heatmap_pixels
+
+
+class LegPropertiesDialog(QDialog):
+    def __init__(self, leg_or_edge):
+        super().__init__()
+        self.setWindowTitle("Set Leg Properties")
+        self.leg_or_edge = leg_or_edge
+
+        layout = QFormLayout()
+
+        self.label_edit = QLineEdit()
+        self.label_edit.setText(leg_or_edge.label)
+        layout.addRow("Label:", self.label_edit)
+
+        self.dimension_edit = QLineEdit()
+        self.dimension_edit.setText(str(leg_or_edge.dimension))
+        layout.addRow("Dimension:", self.dimension_edit)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(layout)
+        main_layout.addLayout(button_layout)
+        self.setLayout(main_layout)
+
+    def accept(self):
+        try:
+            label = self.label_edit.text()
+            dimension = int(self.dimension_edit.text())
+            if dimension <= 0:
+                raise ValueError("Dimension must be a positive integer.")
+            self.leg_or_edge.label = label
+            self.leg_or_edge.dimension = dimension
+            self.leg_or_edge.update_label()
+            super().accept()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Input", str(e))
+
+
+class DimensionDialog(QDialog):
+    def __init__(self, node):
+        super().__init__()
+        self.setWindowTitle(f"Set Properties for {node.tensor_name}")
+        self.node = node
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel(
+            f"Set properties for each leg of {node.tensor_name}:"
+        ))
+
+        form_layout = QFormLayout()
+
+        self.leg_items = []
+        for i, leg in enumerate(self.node.legs):
+            label_edit = QLineEdit()
+            label_edit.setText(leg.label)
+            dimension_edit = QLineEdit()
+            dimension_edit.setText(str(leg.dimension))
+            form_layout.addRow(f"Leg {i} ({leg.leg_type}) Label:", label_edit)
+            form_layout.addRow(f"Leg {i} ({leg.leg_type}) Dimension:", dimension_edit)
+            self.leg_items.append((leg, label_edit, dimension_edit))
+
+        for i, edge in enumerate(self.node.edges):
+            label_edit = QLineEdit()
+            label_edit.setText(edge.label)
+            dimension_edit = QLineEdit()
+            dimension_edit.setText(str(edge.dimension))
+            form_layout.addRow(f"Edge {i} ({edge.edge_type}) Label:", label_edit)
+            form_layout.addRow(f"Edge {i} ({edge.edge_type}) Dimension:", dimension_edit)
+            self.leg_items.append((edge, label_edit, dimension_edit))
+
+        layout.addLayout(form_layout)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def accept(self):
+        try:
+            new_dimensions = []
+            for item, label_edit, dimension_edit in self.leg_items:
+                label = label_edit.text()
+                dimension = int(dimension_edit.text())
+                if dimension <= 0:
+                    raise ValueError("Dimensions must be positive integers.")
+                item.label = label
+                item.dimension = dimension
+                item.update_label()
+                new_dimensions.append(dimension)
+            # Adjust tensor data
+            self.node.adjust_tensor_data(tuple(new_dimensions))
+            super().accept()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Input", str(e))
+
+
+class TensorTableModel(QAbstractTableModel):
+    # Table model over a numpy tensor. Cells are formatted when the view
+    # asks for them, so only the visible ones are ever materialized. The
+    # tensor itself is never written to: edits are kept per flat index in
+    # `edits` until apply_edits patches them in. Rank 1 and 2 tensors map
+    # onto rows and columns. Higher ranks are shown either as a 2D slice
+    # (see set_slice) or as a list with one multi-index per row, one column
+    # per index followed by the value column.
+    invalid_input = pyqtSignal(str)
+
+    def __init__(self, tensor, index_labels, parent=None):
+        super().__init__(parent)
+        self.tensor = tensor
+        self.index_labels = index_labels
+        self.edits = {}
+        # (row_axis, column_axis) in slice mode, None in list mode
+        self.slice_axes = None
+        self.fixed_index = [0] * tensor.ndim
+
+    def set_tensor(self, tensor):
+        self.beginResetModel()
+        self.tensor = tensor
+        self.edits = {}
+        self.endResetModel()
+
+    def set_slice(self, row_axis, column_axis, fixed_index):
+        # Show tensor[..., i (row_axis), ..., j (column_axis), ...] with the
+        # other axes held at fixed_index; row_axis=None switches to list mode
+        self.beginResetModel()
+        self.slice_axes = None if row_axis is None else (row_axis, column_axis)
+        self.fixed_index = list(fixed_index)
+        self.endResetModel()
+
+    def is_slice_view(self):
+        return self.tensor.ndim > 2 and self.slice_axes is not None
+
+    def current_axes(self):
+        # Axes spanning the rows and columns of current_matrix
+        if self.tensor.ndim == 1:
+            return 0, None
+        if self.tensor.ndim == 2:
+            return 0, 1
+        return self.slice_axes or (0, 1)
+
+    def current_matrix(self):
+        # The 2D slice on screen (a rank 1 tensor is a single column), as a
+        # view of the tensor unless pending edits have to be overlaid. For
+        # the list view, the slice spanned by the first two axes is used.
+        if self.tensor.ndim == 1:
+            matrix = self.tensor[:, None]
+        else:
+            row_axis, column_axis = self.current_axes()
+            index = list(self.fixed_index)
+            index[row_axis] = slice(None)
+            index[column_axis] = slice(None)
+            matrix = self.tensor[tuple(index)]
+            if row_axis > column_axis:
+                matrix = matrix.T
+        if self.edits:
+            matrix = matrix.copy()
+            for flat_index, value in self.edits.items():
+                element = np.unravel_index(flat_index, self.tensor.shape)
+                position = self.matrix_position(element)
+                if position is not None:
+                    matrix[position] = value
+        return matrix
+
+    def matrix_position(self, element):
+        # (row, column) of a tensor element within current_matrix, or None
+        if self.tensor.ndim == 1:
+            return element[0], 0
+        row_axis, column_axis = self.current_axes()
+        for axis, i in enumerate(element):
+            if axis not in (row_axis, column_axis) and i != self.fixed_index[axis]:
+                return None
+        return element[row_axis], element[column_axis]
+
+    def apply_edits(self):
+        # Patch the edited cells into the tensor with a single vectorized
+        # assignment and return it. The array is patched in place unless it
+        # is read-only or cannot hold floats, in which case a copy is made.
+        tensor = self.tensor
+        if not self.edits:
+            return tensor
+        if not np.issubdtype(tensor.dtype, np.inexact):
+            tensor = tensor.astype(float)
+        elif not tensor.flags.writeable:
+            tensor = tensor.copy()
+        flat_indices = np.fromiter(self.edits.keys(), dtype=np.intp, count=len(self.edits))
+        values = np.array(list(self.edits.values()), dtype=tensor.dtype)
+        np.put(tensor, flat_indices, values)
+        return tensor
+
+    def value(self, element):
+        flat_index = int(np.ravel_multi_index(element, self.tensor.shape))
+        if flat_index in self.edits:
+            return self.edits[flat_index]
+        return self.tensor[element]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.is_slice_view():
+            return self.tensor.shape[self.slice_axes[0]]
+        if self.tensor.ndim <= 2:
+            return self.tensor.shape[0]
+        return self.tensor.size
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self.is_slice_view():
+            return self.tensor.shape[self.slice_axes[1]]
+        if self.tensor.ndim == 1:
+            return 1
+        if self.tensor.ndim == 2:
+            return self.tensor.shape[1]
+        return self.tensor.ndim + 1
+
+    def element_index(self, row, column):
+        # Multi-index of the element shown in a cell, None for index columns
+        if self.is_slice_view():
+            element = list(self.fixed_index)
+            element[self.slice_axes[0]] = row
+            element[self.slice_axes[1]] = column
+            return tuple(element)
+        if self.tensor.ndim == 1:
+            return (row,)
+        if self.tensor.ndim == 2:
+            return (row, column)
+        if column < self.tensor.ndim:
+            return None
+        return np.unravel_index(row, self.tensor.shape)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        element = self.element_index(index.row(), index.column())
+        if element is None:
+            return str(np.unravel_index(index.row(), self.tensor.shape)[index.column()])
+        return str(self.value(element))
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        element = self.element_index(index.row(), index.column())
+        if element is None:
+            return False
+        try:
+            flat_index = int(np.ravel_multi_index(element, self.tensor.shape))
+            self.edits[flat_index] = parse_tensor_value(value, self.tensor.dtype)
+        except ValueError as e:
+            self.invalid_input.emit(f"Invalid value at index {tuple(int(i) for i in element)}: {e}")
+            return False
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        if self.element_index(index.row(), index.column()) is None:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if self.is_slice_view():
+            axis = self.slice_axes[0 if orientation == Qt.Vertical else 1]
+            return f"{self.index_labels[axis]}: {section}"
+        if orientation == Qt.Horizontal:
+            if self.tensor.ndim == 1:
+                return "Value"
+            if self.tensor.ndim == 2:
+                return f"{self.index_labels[1]}: {section}"
+            return (self.index_labels + ["Value"])[section]
+        if self.tensor.ndim <= 2:
+            return f"{self.index_labels[0]}: {section}"
+        return str(section)
+
+
+class HeatmapWidget(QWidget):
+    # Paints a numpy ARGB32 buffer through a QImage that wraps it without
+    # copying; Qt scales it to the widget in C++
+    hovered = pyqtSignal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pixels = None
+        self.image = None
+        self.setMouseTracking(True)
+        self.setMinimumSize(300, 300)
+
+    def set_pixels(self, pixels):
+        # The QImage does not own the buffer, so keep the array alive
+        self.pixels = np.ascontiguousarray(pixels)
+        rows, columns = self.pixels.shape
+        self.image = QImage(self.pixels.data, columns, rows, self.pixels.strides[0],
+                            QImage.Format_RGB32)
+        self.update()
+
+    def paintEvent(self, event):
+        if self.image is None:
+            return
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self.image)
+
+    def mouseMoveEvent(self, event):
+        if self.pixels is not None and self.width() and self.height():
+            rows, columns = self.pixels.shape
+            row = min(int(event.y() * rows / self.height()), rows - 1)
+            column = min(int(event.x() * columns / self.width()), columns - 1)
+            self.hovered.emit(row, column)
+        super().mouseMoveEvent(event)
+
+
+class TensorHeatmapDialog(QDialog):
+    # Heatmap of the slice currently shown by a TensorTableModel; it follows
+    # the slice selection and edits of the tensor properties dialog
+    def __init__(self, model, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Tensor Heatmap")
+        self.model = model
+        self.matrix = None
+
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Magnitude", 'magnitude')
+        self.mode_combo.addItem("Real part", 'real')
+        self.mode_combo.addItem("Imaginary part", 'imag')
+        self.mode_combo.currentIndexChanged.connect(self.refresh)
+        self.log_check = QCheckBox("Log scale")
+        self.log_check.toggled.connect(self.refresh)
+        controls.addWidget(QLabel("Show:"))
+        controls.addWidget(self.mode_combo)
+        controls.addWidget(self.log_check)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.heatmap = HeatmapWidget()
+        self.heatmap.hovered.connect(self.show_value)
+        layout.addWidget(self.heatmap)
+        self.range_label = QLabel()
+        layout.addWidget(self.range_label)
+        self.value_label = QLabel()
+        layout.addWidget(self.value_label)
+        self.setLayout(layout)
+
+        model.modelReset.connect(self.refresh)
+        model.dataChanged.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        self.matrix = self.model.current_matrix()
+        pixels, (low, high) = heatmap_pixels(self.matrix, self.mode_combo.currentData(),
+                                             self.log_check.isChecked())
+        self.heatmap.set_pixels(pixels)
+        scale = "log10 " if self.log_check.isChecked() else ""
+        self.range_label.setText(f"{self.matrix.shape[0]} x {self.matrix.shape[1]}, "
+                                 f"color range ({scale}{self.mode_combo.currentText().lower()}): "
+                                 f"{low:.4g} to {high:.4g}")
+
+    def show_value(self, row, column):
+        row_axis, column_axis = self.model.current_axes()
+        labels = self.model.index_labels
+        text = f"{labels[row_axis]}: {row}"
+        if column_axis is not None:
+            text += f", {labels[column_axis]}: {column}"
+        self.value_label.setText(f"{text} = {self.matrix[row, column]}")
+
+
+class NodePropertiesDialog(QDialog):
+    def __init__(self, node):
+        super().__init__()
+        self.setWindowTitle("Tensor Properties")
+        self.node = node
+
+        layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        self.name_edit = QLineEdit()
+        self.name_edit.setText(self.node.tensor_name)
+        form_layout.addRow("Tensor Name:", self.name_edit)
+
+        dims = self.node.get_dims()
+        if 0 in dims:
+            QMessageBox.warning(self, "Invalid Dimensions", "Tensor has a dimension of size zero.")
+            self.close()
+            return
+
+        rank = len(dims)
+
+        # Get labels of legs and edges
+        ordered_items = self.node.get_ordered_legs()
+        index_labels = []
+        for idx, item in enumerate(ordered_items):
+            label = item.label if item.label else f"Index {idx}"
+            index_labels.append(label)
+
+        if rank == 0:
+            # Zero-dimensional tensor (scalar)
+            self.scalar_edit = QLineEdit()
+            if self.node.tensor_data is not None:
+                self.scalar_edit.setText(str(self.node.tensor_data.item()))
+            form_layout.addRow("Value:", self.scalar_edit)
+        else:
+            # The model reads the node's tensor directly (no copy), edited
+            # cells are only patched in on OK
+            if self.node.tensor_data is not None and tuple(self.node.tensor_data.shape) == tuple(dims):
+                tensor = self.node.tensor_data
+            else:
+                tensor = resize_tensor(self.node.tensor_data, tuple(dims))
+            self.model = TensorTableModel(tensor, index_labels, self)
+            self.model.invalid_input.connect(
+                lambda message: QMessageBox.warning(self, "Invalid Input", message))
+            self.table = QTableView()
+            self.table.setModel(self.model)
+            if rank > 2:
+                self.add_slice_controls(form_layout, index_labels, dims)
+            self.update_header_modes()
+            form_layout.addRow("Tensor Elements:", self.table)
+
+        layout.addLayout(form_layout)
+
+        self.random_button = QPushButton("Randomize")
+        self.random_button.clicked.connect(self.randomize_tensor)
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(self.random_button)
+        if rank > 0:
+            self.heatmap_button = QPushButton("Heatmap")
+            self.heatmap_button.clicked.connect(self.show_heatmap)
+            button_layout.addWidget(self.heatmap_button)
+        button_layout.addStretch()
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def add_slice_controls(self, form_layout, index_labels, dims):
+        # For rank > 2, view one 2D slice at a time: two axes (picked by leg
+        # or edge label) span the table, the others are fixed by spin boxes
+        self.view_combo = QComboBox()
+        self.view_combo.addItem("2D slice", 'slice')
+        self.view_combo.addItem("All elements as a list", 'list')
+        form_layout.addRow("View:", self.view_combo)
+
+        self.row_axis_combo = QComboBox()
+        self.column_axis_combo = QComboBox()
+        for axis, (label, dimension) in enumerate(zip(index_labels, dims)):
+            self.row_axis_combo.addItem(f"{label} ({dimension})", axis)
+            self.column_axis_combo.addItem(f"{label} ({dimension})", axis)
+        self.column_axis_combo.setCurrentIndex(1)
+        form_layout.addRow("Rows:", self.row_axis_combo)
+        form_layout.addRow("Columns:", self.column_axis_combo)
+
+        spin_widget = QWidget()
+        spin_layout = QHBoxLayout()
+        spin_layout.setContentsMargins(0, 0, 0, 0)
+        self.index_spins = []
+        for label, dimension in zip(index_labels, dims):
+            spin = QSpinBox()
+            spin.setRange(0, dimension - 1)
+            spin.valueChanged.connect(self.update_slice)
+            spin_layout.addWidget(QLabel(f"{label}:"))
+            spin_layout.addWidget(spin)
+            self.index_spins.append(spin)
+        spin_layout.addStretch()
+        spin_widget.setLayout(spin_layout)
+        spin_scroll = QScrollArea()
+        spin_scroll.setWidgetResizable(True)
+        spin_scroll.setFrameShape(QFrame.NoFrame)
+        spin_scroll.setWidget(spin_widget)
+        spin_scroll.setMaximumHeight(spin_widget.sizeHint().height() + 20)
+        form_layout.addRow("Fixed indices:", spin_scroll)
+
+        self.view_combo.currentIndexChanged.connect(self.update_slice)
+        self.row_axis_combo.currentIndexChanged.connect(self.update_slice)
+        self.column_axis_combo.currentIndexChanged.connect(self.update_slice)
+        self.update_slice()
+
+    def update_slice(self):
+        slice_view = self.view_combo.currentData() == 'slice'
+        row_axis = self.row_axis_combo.currentData()
+        column_axis = self.column_axis_combo.currentData()
+        if row_axis == column_axis:
+            # Rows and columns need different axes, move the columns on
+            column_axis = (row_axis + 1) % len(self.index_spins)
+            self.column_axis_combo.blockSignals(True)
+            self.column_axis_combo.setCurrentIndex(column_axis)
+            self.column_axis_combo.blockSignals(False)
+        self.row_axis_combo.setEnabled(slice_view)
+        self.column_axis_combo.setEnabled(slice_view)
+        for axis, spin in enumerate(self.index_spins):
+            spin.setEnabled(slice_view and axis not in (row_axis, column_axis))
+        fixed_index = [spin.value() for spin in self.index_spins]
+        if slice_view:
+            self.model.set_slice(row_axis, column_axis, fixed_index)
+        else:
+            self.model.set_slice(None, None, fixed_index)
+        self.update_header_modes()
+
+    def update_header_modes(self):
+        horizontal = QHeaderView.Stretch \
+            if self.model.columnCount() <= TABLE_STRETCH_MAX_SECTIONS else QHeaderView.Interactive
+        self.table.horizontalHeader().setSectionResizeMode(horizontal)
+        two_dimensional = self.model.tensor.ndim == 2 or self.model.is_slice_view()
+        vertical = QHeaderView.Stretch \
+            if two_dimensional and self.model.rowCount() <= TABLE_STRETCH_MAX_SECTIONS \
+            else QHeaderView.Interactive
+        self.table.verticalHeader().setSectionResizeMode(vertical)
+
+    def show_heatmap(self):
+        # Non-modal, so the slice controls stay usable while it is open
+        self.heatmap_dialog = open_dialog(TensorHeatmapDialog, self.model, self)
+        self.heatmap_dialog.show()
+
+    def randomize_tensor(self):
+        dims = self.node.get_dims()
+        if 0 in dims:
+            QMessageBox.warning(self, "No Dimensions", "Tensor has a dimension of size zero.")
+            return
+        rank = len(dims)
+        if rank == 0:
+            self.scalar_edit.setText(str(np.random.rand()))
+        else:
+            # The view re-reads only the visible cells
+            self.model.set_tensor(np.random.rand(*dims))
+
+    def accept(self):
+        try:
+            name = self.name_edit.text()
+            self.node.tensor_name = name
+            self.node.update_label()
+            dims = self.node.get_dims()
+            if 0 in dims:
+                QMessageBox.warning(self, "Invalid Dimensions", "Tensor has a dimension of size zero.")
+                return
+            rank = len(dims)
+            if rank == 0:
+                value_str = self.scalar_edit.text()
+                if not value_str:
+                    raise ValueError("Value is missing for the scalar tensor.")
+                tensor_data = np.array(float(value_str))
+            else:
+                # Only the edited cells are written
+                tensor_data = self.model.apply_edits()
+            self.node.tensor_data = tensor_data
+            super().accept()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Input", str(e))
+
+
+class TensorContractionDialog(QDialog):
+    def __init__(self, node1, node2):
+        super().__init__()
+        self.setWindowTitle("Detailed Contract")
+        self.node1 = node1
+        self.node2 = node2
+
+        layout = QVBoxLayout()
+        label = QLabel("Select edges to contract:")
+        layout.addWidget(label)
+
+        self.edge_checks = []
+        self.contractable_edges = node1.edges_to(node2)
+
+        if not self.contractable_edges:
+            QMessageBox.warning(self, "No Connected Edges",
+                                "There are no connected edges between the selected tensors.")
+            self.reject()
+            return
+
+        for i, edge in enumerate(self.contractable_edges):
+            label_text = f"Edge {i}: "
+            if edge.label:
+                label_text += f"Label '{edge.label}', "
+            label_text += f"Dimension {edge.dimension}, Type {edge.edge_type}"
+            check = QCheckBox(label_text)
+            layout.addWidget(check)
+            self.edge_checks.append((check, edge))
+
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("Contract")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def accept(self):
+        self.selected_edges = []
+        for check, edge in self.edge_checks:
+            if check.isChecked():
+                self.selected_edges.append(edge)
+        if not self.selected_edges:
+            QMessageBox.warning(self, "No Edges Selected", "Please select at least one edge to contract.")
+            return
+        super().accept()
+
+
+class EdgeSelectionDialog(QDialog):
+    def __init__(self, edges):
+        super().__init__()
+        self.setWindowTitle("Select Edge for SVD")
+        self.edges = edges
+        layout = QVBoxLayout()
+        self.edge_combo = QComboBox()
+        for i, edge in enumerate(edges):
+            label_text = f"Edge {i}: "
+            if edge.label:
+                label_text += f"Label '{edge.label}', "
+            label_text += f"Dimension {edge.dimension}, Type {edge.edge_type}"
+            self.edge_combo.addItem(label_text, edge)
+        layout.addWidget(QLabel("Select the edge to perform SVD over:"))
+        layout.addWidget(self.edge_combo)
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def accept(self):
+        self.selected_edge = self.edge_combo.currentData()
+        super().accept()
+
+
+class TruncationDialog(QDialog):
+    def __init__(self, max_dimension):
+        super().__init__()
+        self.setWindowTitle("Set Truncation Dimension")
+        self.max_dimension = max_dimension
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("Fixed dimension", 'dimension')
+        self.mode_combo.addItem("Relative truncation error", 'error')
+        self.mode_combo.addItem("Discarded weight", 'weight')
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        form_layout.addRow("Truncate by:", self.mode_combo)
+        self.dimension_edit = QLineEdit()
+        self.dimension_edit.setText(str(max_dimension))
+        form_layout.addRow(f"Truncation Dimension (<= {max_dimension}):",
+                           self.dimension_edit)
+        self.target_edit = QLineEdit()
+        self.target_edit.setText("1e-6")
+        form_layout.addRow("Error / weight target:", self.target_edit)
+        self.method_combo = QComboBox()
+        self.method_combo.addItem("QR + core SVD (fast)", 'qr')
+        self.method_combo.addItem("Full SVD of the combined matrix", 'full')
+        form_layout.addRow("Method:", self.method_combo)
+        self.solver_combo = QComboBox()
+        self.solver_combo.addItem("Automatic", 'auto')
+        self.solver_combo.addItem("Exact (all singular values)", 'exact')
+        self.solver_combo.addItem("Randomized (top-k only)", 'randomized')
+        self.solver_combo.addItem("Lanczos (top-k only)", 'lanczos')
+        form_layout.addRow("Solver:", self.solver_combo)
+        layout.addLayout(form_layout)
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+        self.update_mode()
+
+    def update_mode(self):
+        # Error targets need the whole spectrum, hence the exact solver; the
+        # dimension then only acts as an upper bound
+        by_dimension = self.mode_combo.currentData() == 'dimension'
+        self.target_edit.setEnabled(not by_dimension)
+        self.solver_combo.setEnabled(by_dimension)
+
+    def accept(self):
+        try:
+            truncation_dim = int(self.dimension_edit.text())
+            if truncation_dim <= 0 or truncation_dim > self.max_dimension:
+                raise ValueError(f"Truncation dimension must be between 1 "
+                                 f"and {self.max_dimension}.")
+            self.max_error = None
+            self.max_discarded_weight = None
+            mode = self.mode_combo.currentData()
+            if mode != 'dimension':
+                target = float(self.target_edit.text())
+                if not 0 <= target < 1:
+                    raise ValueError("The error / weight target must be between 0 and 1.")
+                if mode == 'error':
+                    self.max_error = target
+                else:
+                    self.max_discarded_weight = target
+            self.truncation_dim = truncation_dim
+            self.method = self.method_combo.currentData()
+            self.solver = self.solver_combo.currentData()
+            super().accept()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Input", str(e))
+
+
+class ContractionSettingsDialog(QDialog):
+    def __init__(self, flop_threshold, memory_threshold_bytes, memory_budget_bytes,
+                 cache_bytes, spill_intermediates, cache_stats):
+        super().__init__()
+        self.setWindowTitle("Contraction Settings")
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        self.flops_edit = QLineEdit()
+        self.flops_edit.setText(f"{flop_threshold:g}")
+        form_layout.addRow("Warn above FLOPs:", self.flops_edit)
+        self.memory_edit = QLineEdit()
+        self.memory_edit.setText(f"{memory_threshold_bytes / 1024 ** 3:g}")
+        form_layout.addRow("Warn above peak memory (GB):", self.memory_edit)
+        self.budget_edit = QLineEdit()
+        self.budget_edit.setText(f"{memory_budget_bytes / 1024 ** 3:g}")
+        form_layout.addRow("Memory budget for slicing (GB, 0 = off):", self.budget_edit)
+        self.cache_edit = QLineEdit()
+        self.cache_edit.setText(f"{cache_bytes / 1024 ** 3:g}")
+        form_layout.addRow("Memory for reused intermediates (GB, 0 = off):", self.cache_edit)
+        self.spill_check = QCheckBox("Move intermediates that do not fit to disk")
+        self.spill_check.setChecked(spill_intermediates)
+        form_layout.addRow(self.spill_check)
+        form_layout.addRow(QLabel(
+            f"In use: {format_bytes(cache_stats['bytes'])} in {cache_stats['entries']} "
+            f"intermediates, {format_bytes(cache_stats['spilled_bytes'])} on disk.\n"
+            f"{cache_stats['hits']} hits ({cache_stats['disk_hits']} from disk), "
+            f"{cache_stats['misses']} misses, {cache_stats['evictions']} evictions."))
+        layout.addLayout(form_layout)
+        button_layout = QHBoxLayout()
+        ok_button = QPushButton("OK")
+        ok_button.clicked.connect(self.accept)
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.reject)
+        button_layout.addWidget(ok_button)
+        button_layout.addWidget(cancel_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def accept(self):
+        try:
+            flop_threshold = float(self.flops_edit.text())
+            memory_threshold = float(self.memory_edit.text())
+            memory_budget = float(self.budget_edit.text())
+            cache_memory = float(self.cache_edit.text())
+            if flop_threshold <= 0 or memory_threshold <= 0:
+                raise ValueError("Thresholds must be positive numbers.")
+            if memory_budget < 0 or cache_memory < 0:
+                raise ValueError("Memory sizes cannot be negative.")
+            self.flop_threshold = flop_threshold
+            self.memory_threshold_bytes = int(memory_threshold * 1024 ** 3)
+            self.memory_budget_bytes = int(memory_budget * 1024 ** 3)
+            self.cache_bytes = int(cache_memory * 1024 ** 3)
+            self.spill_intermediates = self.spill_check.isChecked()
+            super().accept()
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Input", str(e))
@@ -0,0 +1,440 @@
+# Graphics view in which a network is drawn and edited
+
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QMessageBox
+from PyQt5.QtGui import QPainter, QPen, QBrush, QColor
+from PyQt5.QtCore import Qt, QPointF
+
+from tensor_network import TensorNetwork
+
+from .common import open_dialog
+from .items import Edge, Node, Leg
+
+
+class TensorNetworkEditor(QGraphicsView):
+    def __init__(self, parent=None, allow_add_nodes=True):
+        super().__init__(parent)
+        self.allow_add_nodes = allow_add_nodes
+        self.setScene(QGraphicsScene(self))
+        self.setRenderHint(QPainter.Antialiasing)
+        self.network = TensorNetwork()
+        self.nodes = []  # Views of self.network.tensors
+        self.connect_mode = False
+        self.add_leg_mode = None  # 'physical' or 'bond'
+        self.delete_mode = False
+        self.contract_mode = False
+        self.disconnect_mode = False  # Added disconnect mode
+        self.svd_mode = False  # Added SVD mode
+        self.fast_contract_mode = False  # Added Fast Contract mode
+        self.selected_nodes = []
+        self.selected_legs = []
+        self.current_leg = None
+        self.current_node = None  # Initialize current_node
+        self.setWindowTitle("Tensor Network Editor")
+
+    def add_node(self, node):
+        # Show a node, its leg and edge views, and add its tensor to the network
+        if node.tensor not in self.network.tensors:
+            self.network.add_tensor(node.tensor)
+        self.nodes.append(node)
+        self.scene().addItem(node)
+        for item in list(node.leg_items.values()) + list(node.edge_items.values()):
+            if item.scene() is not self.scene():
+                if item.scene():
+                    item.scene().removeItem(item)
+                self.scene().addItem(item)
+            item.updatePosition()
+
+    def take_node(self, node):
+        # Detach a node from this editor with its indices unchanged, so that
+        # it can be added to another editor
+        self.network.tensors.remove(node.tensor)
+        self.nodes.remove(node)
+        for item in list(node.leg_items.values()) + list(node.edge_items.values()) + [node]:
+            if item.scene():
+                item.scene().removeItem(item)
+
+    def remove_node(self, node):
+        # Delete a node; its bonds become open legs of the neighbouring nodes
+        edges = node.edges
+        new_legs = self.network.remove_tensor(node.tensor)
+        for edge, leg in zip(edges, new_legs):
+            other_node = edge.node1 if edge.node2 == node else edge.node2
+            edge.remove()
+            other_node.attach_leg(leg, end_point=node.scenePos())
+        node.removeFromScene()
+        self.nodes.remove(node)
+
+    def replace_nodes(self, nodes, result_node):
+        # Swap the views of contracted nodes for the view of the tensor that
+        # replaced them in the network
+        self.nodes.append(result_node)
+        self.scene().addItem(result_node)
+        for node in nodes:
+            for edge in list(node.edge_items.values()):
+                if edge.index in result_node.tensor.bonds:
+                    if edge.node1 == node:
+                        edge.node1 = result_node
+                    else:
+                        edge.node2 = result_node
+                    result_node.attach_edge(edge)
+                    edge.updatePosition()
+                else:
+                    edge.remove()
+            node.removeFromScene()
+            self.nodes.remove(node)
+        legs = result_node.tensor.legs
+        angle_increment = 360 / len(legs) if legs else 0
+        for i, leg in enumerate(legs):
+            result_node.attach_leg(leg, angle=i * angle_increment)
+
+    def clear(self):
+        # Remove all nodes and start over with an empty network
+        self.scene().clear()
+        self.network = TensorNetwork()
+        self.nodes = []
+        self.selected_nodes = []
+        self.selected_legs = []
+        self.current_leg = None
+        self.current_node = None
+
+    def project_views(self):
+        # Positions of the nodes and of the open leg ends, to be saved with
+        # the network
+        tensor_views = {}
+        index_views = {}
+        for node in self.nodes:
+            tensor_views[node.tensor] = {'position': [node.pos().x(), node.pos().y()],
+                                         'index': node.index}
+            for leg in node.leg_items.values():
+                index_views[leg.index] = {'end_point': [leg.endPoint.x(), leg.endPoint.y()]}
+        return tensor_views, index_views
+
+    def load_network(self, network, tensor_views, index_views):
+        # Show a loaded network in place of the current one
+        self.clear()
+        self.network = network
+        nodes = {}
+        for i, tensor in enumerate(network.tensors):
+            view = tensor_views.get(tensor, {})
+            x, y = view.get('position', [100 + 80 * (i % 8), 100 + 80 * (i // 8)])
+            node = Node(x, y, index=view.get('index', i), tensor=tensor)
+            legs = tensor.legs
+            for j, leg in enumerate(legs):
+                end_point = index_views.get(leg, {}).get('end_point')
+                if end_point is not None:
+                    node.attach_leg(leg, end_point=QPointF(*end_point))
+                else:
+                    node.attach_leg(leg, angle=j * 360 / len(legs))
+            nodes[tensor] = node
+            self.add_node(node)
+        for tensor in network.tensors:
+            for bond in tensor.bonds:
+                if bond.tensors[0] is tensor:
+                    edge = Edge(nodes[tensor], nodes[bond.tensors[1]], bond)
+                    nodes[tensor].attach_edge(edge)
+                    nodes[bond.tensors[1]].attach_edge(edge)
+                    self.scene().addItem(edge)
+
+    def setAddLegMode(self, mode):
+        self.add_leg_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            self.connect_mode = False
+            self.delete_mode = False
+            self.contract_mode = False
+            self.disconnect_mode = False  # Reset disconnect mode
+            self.svd_mode = False  # Reset SVD mode
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setConnectMode(self, mode):
+        self.connect_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            self.add_leg_mode = None
+            self.delete_mode = False
+            self.contract_mode = False
+            self.disconnect_mode = False  # Reset disconnect mode
+            self.svd_mode = False  # Reset SVD mode
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setDeleteMode(self, mode):
+        self.delete_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            self.add_leg_mode = None
+            self.connect_mode = False
+            self.contract_mode = False
+            self.disconnect_mode = False  # Reset disconnect mode
+            self.svd_mode = False  # Reset SVD mode
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setContractMode(self, mode):
+        self.contract_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            self.add_leg_mode = None
+            self.connect_mode = False
+            self.delete_mode = False
+            self.disconnect_mode = False  # Reset disconnect mode
+            self.svd_mode = False  # Reset SVD mode
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setDisconnectMode(self, mode):
+        self.disconnect_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            self.add_leg_mode = None
+            self.connect_mode = False
+            self.delete_mode = False
+            self.contract_mode = False
+            self.svd_mode = False  # Reset SVD mode
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setSVDMode(self, mode):
+        self.svd_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            # Reset other modes
+            self.add_leg_mode = None
+            self.connect_mode = False
+            self.delete_mode = False
+            self.contract_mode = False
+            self.disconnect_mode = False
+            self.fast_contract_mode = False  # Reset Fast Contract mode
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def setFastContractMode(self, mode):
+        self.fast_contract_mode = mode
+        if mode:
+            self.setCursor(Qt.CrossCursor)
+            # Reset other modes
+            self.add_leg_mode = None
+            self.connect_mode = False
+            self.delete_mode = False
+            self.contract_mode = False
+            self.disconnect_mode = False
+            self.svd_mode = False
+            self.selected_nodes = []
+            self.selected_legs = []
+        else:
+            self.setCursor(Qt.ArrowCursor)
+
+    def mousePressEvent(self, event):
+        position = self.mapToScene(event.pos())
+        items = self.scene().items(position)
+        if self.add_leg_mode:
+            for item in items:
+                if isinstance(item, Node):
+                    self.current_node = item
+                    index = item.tensor.add_leg(kind=self.add_leg_mode)
+                    self.current_leg = item.attach_leg(index, end_point=position)
+                    break
+        elif self.connect_mode:
+            for item in items:
+                if isinstance(item, Leg):
+                    if not self.selected_legs:
+                        self.selected_legs.append(item)
+                        item.setPen(QPen(Qt.red, item.pen.width(), item.pen.style()))
+                    else:
+                        if item != self.selected_legs[0]:
+                            leg1 = self.selected_legs[0]
+                            leg2 = item
+                            if leg1.leg_type == leg2.leg_type:
+                                if leg1.dimension != leg2.dimension:
+                                    QMessageBox.warning(None, "Dimension Mismatch",
+                                                        "The dimensions of the legs do not match.")
+                                    leg1.setPen(leg1.pen)
+                                    self.selected_legs = []
+                                    return
+                                try:
+                                    bond = self.network.connect(leg1.index, leg2.index)
+                                except ValueError as e:
+                                    QMessageBox.warning(None, "Invalid Connection", str(e))
+                                    leg1.setPen(leg1.pen)
+                                    self.selected_legs = []
+                                    return
+                                # Create an edge between the two nodes
+                                edge = Edge(leg1.node, leg2.node, bond)
+                                leg1.node.attach_edge(edge)
+                                leg2.node.attach_edge(edge)
+                                self.scene().addItem(edge)
+                                # Remove the leg views since the legs are now joined into a bond
+                                leg1.remove()
+                                leg2.remove()
+                            else:
+                                QMessageBox.warning(None, "Invalid Connection",
+                                                    "Only legs of the same type can be connected.")
+                            leg1.setPen(leg1.pen)
+                            self.selected_legs = []
+                        else:
+                            item.setPen(item.pen)
+                            self.selected_legs = []
+                        break
+        elif self.delete_mode:
+            for item in items:
+                if isinstance(item, Node):
+                    self.remove_node(item)
+                    # Exit delete mode
+                    self.delete_mode = False
+                    self.setCursor(Qt.ArrowCursor)
+                    self.parent().parent().deleteButton.setChecked(False)
+                    self.parent().parent().deleteButton.setText("Delete")
+                    break
+                elif isinstance(item, Edge):
+                    item.remove()
+                    # Exit delete mode
+                    self.delete_mode = False
+                    self.setCursor(Qt.ArrowCursor)
+                    self.parent().parent().deleteButton.setChecked(False)
+                    self.parent().parent().deleteButton.setText("Delete")
+                    break
+                elif isinstance(item, Leg):
+                    item.remove()
+                    # Exit delete mode
+                    self.delete_mode = False
+                    self.setCursor(Qt.ArrowCursor)
+                    self.parent().parent().deleteButton.setChecked(False)
+                    self.parent().parent().deleteButton.setText("Delete")
+                    break
+        elif self.disconnect_mode:
+            for item in items:
+                if isinstance(item, Node):
+                    if item not in self.selected_nodes:
+                        self.selected_nodes.append(item)
+                        item.setBrush(QBrush(QColor('yellow')))
+                    if len(self.selected_nodes) == 2:
+                        self.parent().parent().disconnect_tensors(self.selected_nodes[0], self.selected_nodes[1])
+                        self.disconnect_mode = False
+                        self.setCursor(Qt.ArrowCursor)
+                        self.parent().parent().disconnectButton.setChecked(False)
+                        self.parent().parent().disconnectButton.setText("Disconnect Tensors")
+                        # Reset node colors
+                        for node in self.nodes:
+                            node.setBrush(QBrush(QColor('lightblue')))
+                        self.selected_nodes = []
+                    break
+        elif self.svd_mode:
+            for item in items:
+                if isinstance(item, Node):
+                    if item not in self.selected_nodes:
+                        self.selected_nodes.append(item)
+                        item.setBrush(QBrush(QColor('yellow')))
+                    if len(self.selected_nodes) == 2:
+                        self.parent().parent().perform_svd(
+                            self.selected_nodes[0],
+                            self.selected_nodes[1]
+                        )
+                        self.svd_mode = False
+                        self.setCursor(Qt.ArrowCursor)
+                        self.parent().parent().svdButton.setChecked(False)
+                        self.parent().parent().svdButton.setText(
+                            "SVD Bond Compression"
+                        )
+                        # Reset node colors
+                        for node in self.nodes:
+                            node.setBrush(QBrush(QColor('lightblue')))
+                        self.selected_nodes = []
+                    break
+        elif self.fast_contract_mode:
+            for item in items:
+                if isinstance(item, Node):
+                    if item not in self.selected_nodes:
+                        self.selected_nodes.append(item)
+                        item.setBrush(QBrush(QColor('yellow')))
+                    if len(self.selected_nodes) == 2:
+                        self.parent().parent().perform_fast_contraction(
+                            self.selected_nodes[0],
+                            self.selected_nodes[1]
+                        )
+                        self.fast_contract_mode = False
+                        self.setCursor(Qt.ArrowCursor)
+                        self.parent().parent().fastContractButton.setChecked(False)
+                        self.parent().parent().fastContractButton.setText(
+                            "Fast Contract"
+                        )
+                        # Reset node colors
+                        for node in self.nodes:
+                            node.setBrush(QBrush(QColor('lightblue')))
+                        self.selected_nodes = []
+                    break
+        else:
+            if not items and self.allow_add_nodes:
+                # Add a new node
+                node = Node(position.x(), position.y(), index=len(self.nodes))
+                self.add_node(node)
+            else:
+                for item in items:
+                    if isinstance(item, Node):
+                        if self.contract_mode:
+                            if item not in self.selected_nodes:
+                                self.selected_nodes.append(item)
+                                item.setBrush(QBrush(QColor('yellow')))
+                            if len(self.selected_nodes) == 2:
+                                from .dialogs import TensorContractionDialog
+                                dialog = open_dialog(TensorContractionDialog,
+                                                     self.selected_nodes[0], self.selected_nodes[1])
+                                if dialog.exec_():
+                                    self.parent().parent().perform_contraction(
+                                        self.selected_nodes[0],
+                                        self.selected_nodes[1],
+                                        dialog.selected_edges
+                                    )
+                                self.contract_mode = False
+                                self.setCursor(Qt.ArrowCursor)
+                                self.parent().parent().contractButton.setChecked(False)
+                                self.parent().parent().contractButton.setText("Detailed Contract")
+                                # Reset node colors
+                                for node in self.nodes:
+                                    node.setBrush(QBrush(QColor('lightblue')))
+                                self.selected_nodes = []
+                        else:
+                            super().mousePressEvent(event)
+                    else:
+                        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.current_leg:
+            newPos = self.mapToScene(event.pos())
+            self.current_leg.endPoint = newPos
+            self.current_leg.updatePosition()
+        else:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.current_leg:
+            # Finalize leg
+            self.current_leg.updatePosition()
+            # Check if leg is shorter than node's radius
+            start_pos = self.current_node.scenePos()
+            end_pos = self.current_leg.endPoint
+            distance = (start_pos - end_pos).manhattanLength()
+            if distance < self.current_node.radius:
+                # The leg is too short, remove it
+                self.current_leg.remove()
+            self.current_leg = None
+            self.current_node = None
+        else:
+            super().mouseReleaseEvent(event)
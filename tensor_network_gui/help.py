@@ -0,0 +1,217 @@
+# The How to Use dialog
+
+from PyQt5.QtWidgets import (
+    QPushButton, QVBoxLayout, QLabel, QHBoxLayout, QDialog, QScrollArea, QFrame
+)
+
+
+class HelpDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("How to Use the Tensor Network Tool")
+        self.resize(800, 800)
+
+        layout = QVBoxLayout()
+
+        help_text = """
+<style>
+
+    h2 {font-size: 18pt;}
+    h3 {font-size: 16pt;}
+    li {font-size: 14pt;}
+    p  {font-size: 14pt;}
+</style>
+        <h1>How to Use the Tensor Network Tool</h1>
+        <p>Welcome to the Tensor Network Tool! This application allows you to create and manipulate tensor networks graphically.</p>
+        <h2>Upper Panel (Tensor Network):</h2>
+        <h3>Adding Nodes (Tensors):</h3>
+        <ul>
+            <li>Click anywhere on the upper panel to add a new tensor node.</li>
+        </ul>
+        <h3>Adding Legs to Nodes:</h3>
+        <p>To add a <strong>Physical Leg</strong>:</p>
+        <ul>
+            <li>Click on the "Add Physical Leg" button (it will stay pressed).</li>
+            <li>Click on a node to start adding a leg, then move the mouse to set the leg's length and direction.</li>
+            <li>Release the mouse button to finalize the leg.</li>
+        </ul>
+        <p>To add a <strong>Bond Leg</strong>:</p>
+        <ul>
+            <li>Click on the "Add Bond Leg" button.</li>
+            <li>Click on a node to start adding a leg, then move the mouse to set the leg's length and direction.</li>
+            <li>Release the mouse button to finalize the leg.</li>
+        </ul>
+        <h3>Connecting Legs:</h3>
+        <ul>
+            <li>Click on the "Connect Legs" button.</li>
+            <li>Click on a leg attached to a node.</li>
+            <li>Click on another leg attached to the same or another node.</li>
+            <li>The two legs will be connected, forming an edge (bond) between the nodes.</li>
+        </ul>
+        <h3>Disconnecting Tensors:</h3>
+        <ul>
+            <li>Click on the "Disconnect Tensors" button.</li>
+            <li>Click on the first tensor node to select it (it will turn yellow).</li>
+            <li>Click on the second tensor node to select it.</li>
+            <li>Any edges connecting the two tensors will be removed, and open legs will be created in their place.</li>
+        </ul>
+        <h3>Setting Properties:</h3>
+        <p><strong>Node Properties:</strong></p>
+        <ul>
+            <li>Double-click on a node to open the Tensor Properties dialog.</li>
+            <li>You can set the tensor's name and its data (elements).</li>
+            <li>For tensors with more than two legs, the elements are shown one 2D slice at a time: choose the legs spanning 
+            the rows and the columns, and fix the other indices with the spin boxes. 
+            Select "All elements as a list" to list every multi-index instead.</li>
+            <li>Click "Heatmap" to see the current slice as an image (magnitude, real or imaginary part, optionally on a log scale). 
+            It follows the slice selection; hover over it to read individual values.</li>
+        </ul>
+        <p><strong>Leg Properties:</strong></p>
+        <ul>
+            <li>Double-click on a leg to open the Leg Properties dialog.</li>
+            <li>You can set the leg's label and dimension.</li>
+        </ul>
+        <p><strong>Edge Properties:</strong></p>
+        <ul>
+            <li>Double-click on an edge (connecting two nodes) to open the Leg Properties dialog.</li>
+            <li>You can set the edge's label and dimension.</li>
+        </ul>
+        <h3>Deleting Elements:</h3>
+        <ul>
+            <li>Click on the "Delete" button.</li>
+            <li>Click on a node, leg, or edge to delete it.</li>
+        </ul>
+        
+        <h3>Fast automatic tensor Contract:</h3>
+        <ul>
+            <li>Click on the "Fast Contract" button.</li>
+            <li>Click on the first tensor node to select it (it will turn yellow).</li>
+            <li>Click on the second tensor node to select it.</li>
+            <li>The tensors will be contracted over all connecting edges.</li>
+            <li>The contracted tensor will replace the original tensors in the network.</li>
+        </ul>
+        
+
+        <h3>Contracting the Whole Network:</h3>
+        <ul>
+            <li>Click on the "Contract All" button.</li>
+            <li>A contraction order is searched automatically (exhaustively for small networks, greedily for large ones) to keep the cost and the intermediate tensors small.</li>
+            <li>All tensors in the upper panel are contracted along that order and replaced by a single tensor carrying the open legs.</li>
+            <li>The intermediate tensors are kept for later contractions. If you reopen the network, change some tensors and contract again, 
+            only the steps that depend on the changed tensors are recomputed. "Settings > Contraction Settings..." sets how much memory the kept 
+            intermediates may take (the least recently used, cheapest to recompute ones are dropped first) and whether the dropped ones are moved to disk.</li>
+        </ul>
+
+        <h3>SVD Decomposition:</h3>
+        <ul>
+            <li>Click on the "SVD Bond Compression" button.</li>
+            <li>Click on the first tensor node to select it (it will turn yellow).</li>
+            <li>Click on the second tensor node to select it.</li>
+            <li>If multiple edges connect the tensors, a dialog will appear to select which edge to perform SVD over.</li>
+            <li>Specify the truncation dimension in the dialog, or choose to truncate by a relative error or a discarded weight. 
+            The smallest bond dimension meeting the target is then kept (the dimension field acts as an upper bound).</li>
+            <li>The kept dimension, the truncation error and the discarded weight are reported afterwards; 
+            click "Show Details..." to see the singular values.</li>
+            <li>Choose the method: "QR + core SVD" only decomposes a small bond-sized matrix and is much faster for large tensors; 
+            "Full SVD" decomposes the whole combined matrix. Both give the same result.</li>
+            <li>Choose the solver: the randomized and Lanczos solvers only compute the kept singular values, which is much faster 
+            when the truncation dimension is small compared to the bond. "Automatic" picks one based on the sizes. 
+            The estimated truncation error is reported afterwards.</li>
+            <li>Click "OK" to perform the SVD and update the tensors and edge.</li>
+        </ul>
+
+        <h3>Manually Contracting Tensors:</h3>
+        <ul>
+            <li>Click on the "Detailed Contract" button.</li>
+            <li>Click on the first tensor node to select it (it will turn yellow).</li>
+            <li>Click on the second tensor node to select it.</li>
+            <li>A dialog will appear showing the edges (bonds) connecting the two tensors.</li>
+            <li>Select the edges (indices) you want to contract.</li>
+            <li>Click "Contract" to perform the contraction.</li>
+            <li>The resulting tensor will appear in the lower panel (Temporary Results).</li>
+        </ul>
+
+        <h2>Lower Panel (Temporary Results):</h2>
+        <ul>
+            <li>The lower panel displays tensors resulting from contractions.</li>
+            <li>You can move a result tensor back to the upper panel by clicking the "Move to Upper Panel" button.</li>
+        </ul>
+
+        <h2>Profiling:</h2>
+        <ul>
+            <li>"View > Profiling Panel" lists every contraction, SVD, dimension change and opened dialog with its wall time, 
+            estimated and executed FLOPs, allocated bytes and tensor shapes. The line below the table names the operations that took the most time.</li>
+            <li>Check "Track peak memory" to also record the peak memory of each operation (this slows down the program a little).</li>
+            <li>"Export Log..." saves the log as JSON (with per-operation totals) or CSV.</li>
+        </ul>
+
+        <h2>Saving and Opening Networks:</h2>
+        <ul>
+            <li>Use "File > Save Project" to save the network in the upper panel (tensors, legs, bonds, positions and tensor values) to a .tnproj file.</li>
+            <li>Use "File > Open Project..." to open it again. The tensor values are read from the file only when they are needed, so large networks open quickly.</li>
+        </ul>
+        <h2>General Tips:</h2>
+        <ul>
+        <h3> Please try to fix the number of legs of a local tensor before connecting its leg with other local tensors.
+        Otherwise, after the local tensor is connected into the tensor network, the further adjustment of number of legs
+        will cause updating issues. However, it is safe to delete a local tensor inside a tensor network. </h3>
+        
+            <li>
+            If you cannot double-click a local tensor to obtain its value, or dimension mismatch warning appears, 
+            this might be due to the updating issue, 
+            which can often be fixed by right-clicking the local tensor, clicking the "Set dimensions", 
+            and then do nothing but clicking "ok", 
+            this will update the tensor.</li>
+            
+            <h3> We don't support self-contraction. (Please don't connect the two legs of the same tensor.) 
+            Instead, you can create a delta tensor to contract with your local tensor. 
+            This effectively allows you to self-contract the local tensor. </h3>
+            
+            <li>To exit any mode (e.g., adding legs, connecting legs, deleting), 
+            click on the pressed button again to toggle it off.</li>
+            <li>Before contracting, the cost (FLOPs, result size and peak memory) is estimated from the dimensions. 
+            If it exceeds the thresholds set in "Settings > Contraction Settings...", you are asked to confirm first.</li>
+            <li>If a contraction would need more working memory than the memory budget (also in "Settings > Contraction Settings..."), 
+            shared bonds are sliced: the contraction is repeated for each value of the sliced indices and the pieces are summed up.</li>
+            <li>If the result of a pairwise contraction alone is larger than the memory budget, it is computed in blocks 
+            that are written straight into a temporary file on disk, and the result tensor is read from that file.</li>
+            <li>Contractions and SVDs run in the background. Longer ones show a progress dialog with a "Cancel" button; 
+            the network is only updated once the result has arrived.</li>
+            <li>You can move nodes around by clicking and dragging them.</li>
+            <li>Right-click on a node to open a context menu with additional options (e.g., setting dimensions).</li>
+            <li>"Load Data from .npy..." in the context menu memory-maps a saved NumPy array as the tensor's values. 
+            Such tensors are read from disk in blocks during contractions and SVDs, so they can be larger than the memory.</li>
+            <li>"Load Batch from .npy..." attaches many values to a tensor at once: an array whose first axis runs over the
+            values (for example 500 variants) and whose other axes match the tensor's dimensions. "Tools > Contract Batch..."
+            then contracts the network once for all of them, carrying the batch axis through every step, and saves the
+            results to an .npy file with the batch as its first axis. The network itself is not changed, and batches are
+            not saved with the project.</li>
+            <li>You can zoom and pan the view as needed.</li>
+        </ul>
+        <p>We hope you enjoy using the Tensor Network Tool!</p>
+    </div>
+"""
+
+        help_label = QLabel(help_text)
+        help_label.setWordWrap(True)
+        #layout.addWidget(help_label)
+        
+        # Create a QScrollArea and set the help label as its widget
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setWidget(help_label)
+        
+        # Remove the surrounding black box
+        scroll_area.setFrameShape(QFrame.NoFrame)
+
+        # Add the scroll area to the layout
+        layout.addWidget(scroll_area)
+
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
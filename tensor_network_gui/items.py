@@ -0,0 +1,451 @@
+# Scene items: nodes, legs and edges are views of the tensors and indices of
+# the network. The dialogs they open are imported on first use.
+
+import numpy as np
+
+from PyQt5.QtWidgets import (
+    QGraphicsItem, QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem, QMessageBox,
+    QAction, QMenu, QFileDialog
+)
+from PyQt5.QtGui import QPen, QBrush, QColor, QFont, QPainterPath, QPainterPathStroker
+from PyQt5.QtCore import Qt, QPointF, QLineF
+
+from tensor_network import Tensor, resize_tensor, load_npy
+
+from .common import operation_log, open_dialog
+
+
+class Edge(QGraphicsLineItem):
+    # View of a bond, an Index shared by the tensors of node1 and node2
+    def __init__(self, node1, node2, index):
+        super().__init__()
+        self.node1 = node1
+        self.node2 = node2
+        self.index = index
+        self.setZValue(-1)
+        if self.edge_type == 'physical':
+            self.pen = QPen(Qt.blue, 5, Qt.DashDotLine)
+            self.setPen(self.pen)
+        else:
+            self.pen = QPen(Qt.black, 5)
+            self.setPen(self.pen)
+        self.label_item = QGraphicsTextItem(self)
+        self.label_item.setFont(QFont('Arial', 10))
+        self.label_item.setDefaultTextColor(self.pen.color())
+        self.updatePosition()
+
+    @property
+    def edge_type(self):
+        return self.index.kind  # 'physical' or 'bond'
+
+    @property
+    def dimension(self):
+        return self.index.dimension
+
+    @dimension.setter
+    def dimension(self, dimension):
+        self.index.dimension = dimension
+
+    @property
+    def label(self):
+        return self.index.label
+
+    @label.setter
+    def label(self, label):
+        self.index.label = label
+    
+    def updatePosition(self):
+        if self.node1 and self.node2:
+            line = QLineF(
+                self.node1.scenePos(),
+                self.node2.scenePos()
+            )
+            self.setLine(line)
+            # Update label position
+            mid_point = (line.p1() + line.p2()) / 2
+            self.label_item.setPos(mid_point)
+            self.update_label()
+        else:
+            # If one node is missing, behave like a leg
+            if self.node1:
+                pos = self.node1.scenePos()
+            elif self.node2:
+                pos = self.node2.scenePos()
+            else:
+                pos = QPointF(0, 0)
+            line = QLineF(pos, pos)
+            self.setLine(line)
+            self.label_item.setPos(pos)
+    
+    def update_label(self):
+        text = ''
+        if self.label:
+            text += self.label
+        if self.dimension:
+            if text:
+                text += f' ({self.dimension})'
+            else:
+                text = str(self.dimension)
+        self.label_item.setPlainText(text)
+    
+    def mouseDoubleClickEvent(self, event):
+        from .dialogs import LegPropertiesDialog
+        dialog = open_dialog(LegPropertiesDialog, self)
+        dialog.exec_()
+    
+    def remove(self):
+        if self.scene():
+            self.scene().removeItem(self)
+        if self.label_item.scene():
+            self.label_item.scene().removeItem(self.label_item)
+        # Remove the bond from its tensors (if still there) and this edge
+        # from the connected nodes
+        for tensor in self.index.tensors[:]:
+            tensor.remove_bond(self.index)
+        for node in (self.node1, self.node2):
+            if node and node.edge_items.get(self.index) is self:
+                del node.edge_items[self.index]
+        self.node1 = None
+        self.node2 = None
+
+
+class Node(QGraphicsEllipseItem):
+    # View of a Tensor; its legs and edges are views of the tensor's indices
+    def __init__(self, x, y, radius=20, index=None, tensor=None):
+        super().__init__(-radius, -radius, 2 * radius, 2 * radius)
+        self.setPos(x, y)
+        self.radius = radius
+        self.index = index
+        self.setBrush(QBrush(QColor('lightblue')))
+        self.setFlag(QGraphicsItem.ItemIsMovable, True)
+        self.setFlag(QGraphicsItem.ItemSendsGeometryChanges, True)
+        self.setAcceptHoverEvents(True)
+        self.tensor = tensor if tensor is not None else Tensor(f'Tensor_{self.index}')
+        self.leg_items = {}  # Leg views by open index
+        self.edge_items = {}  # Edge views by bond
+        # Values of a batch contraction, shape (batch size,) + dims; the
+        # tensor keeps its own data
+        self.batch_data = None
+        self.label_item = QGraphicsTextItem(self)
+        self.update_label()
+        self.label_item.setFont(QFont('Arial', 12))
+        self.label_item.setDefaultTextColor(Qt.black)
+        self.label_item.setPos(
+            -self.label_item.boundingRect().width() / 2,
+            -self.label_item.boundingRect().height() / 2
+        )
+
+    @property
+    def tensor_name(self):
+        return self.tensor.name
+
+    @tensor_name.setter
+    def tensor_name(self, name):
+        self.tensor.name = name
+
+    @property
+    def tensor_data(self):
+        return self.tensor.data
+
+    @tensor_data.setter
+    def tensor_data(self, data):
+        self.tensor.data = data
+
+    @property
+    def legs(self):
+        # Leg views in the order of the tensor's open legs
+        return [self.leg_items[leg] for leg in self.tensor.legs]
+
+    @property
+    def edges(self):
+        # Edge views in the order of the tensor's bonds
+        return [self.edge_items[bond] for bond in self.tensor.bonds]
+    
+    def update_label(self):
+        if self.tensor_name:
+            text = self.tensor_name
+            if self.batch_data is not None:
+                text += f" \u00d7{len(self.batch_data)}"
+            self.label_item.setPlainText(text)
+            self.label_item.setPos(
+                -self.label_item.boundingRect().width() / 2,
+                -self.label_item.boundingRect().height() / 2
+            )
+        else:
+            self.label_item.setPlainText('')
+    
+    def add_leg(self, leg_type='physical', angle=0, length=30, dimension=2, label=''):
+        index = self.tensor.add_leg(dimension, leg_type, label)
+        return self.attach_leg(index, angle=angle, length=length)
+
+    def attach_leg(self, index, end_point=None, angle=0, length=30):
+        # Create the view of an open leg of this node's tensor, ending at
+        # end_point or pointing in the direction of angle
+        if end_point is None:
+            radians = np.deg2rad(angle)
+            x1 = self.pos().x() + self.radius * np.cos(radians)
+            y1 = self.pos().y() + self.radius * np.sin(radians)
+            end_point = QPointF(x1 + length * np.cos(radians), y1 + length * np.sin(radians))
+        leg = Leg(self, end_point, index)
+        self.leg_items[index] = leg
+        if self.scene():
+            self.scene().addItem(leg)
+        return leg  # Return the newly created leg
+
+    def attach_edge(self, edge):
+        self.edge_items[edge.index] = edge
+
+    def edges_to(self, other):
+        # Edges connecting this node to other
+        return [self.edge_items[bond] for bond in self.tensor.bonds_with(other.tensor)]
+    
+    def remove_leg(self, leg):
+        if leg in self.legs:
+            leg.remove()
+    
+    def mouseDoubleClickEvent(self, event):
+        from .dialogs import NodePropertiesDialog
+        dialog = open_dialog(NodePropertiesDialog, self)
+        dialog.exec_()
+    
+    def contextMenuEvent(self, event):
+        menu = QMenu()
+        set_dims_action = QAction('Set Dimensions')
+        set_dims_action.triggered.connect(self.open_dimension_dialog)
+        menu.addAction(set_dims_action)
+        load_data_action = QAction('Load Data from .npy...')
+        load_data_action.triggered.connect(self.load_npy_data)
+        menu.addAction(load_data_action)
+        load_batch_action = QAction('Load Batch from .npy...')
+        load_batch_action.triggered.connect(self.load_npy_batch)
+        menu.addAction(load_batch_action)
+        if self.batch_data is not None:
+            clear_batch_action = QAction('Clear Batch')
+            clear_batch_action.triggered.connect(self.clear_batch)
+            menu.addAction(clear_batch_action)
+        menu.exec_(event.screenPos())
+    
+    def open_dimension_dialog(self):
+        from .dialogs import DimensionDialog
+        dialog = open_dialog(DimensionDialog, self)
+        dialog.exec_()
+
+    def load_npy_data(self):
+        # The file is memory-mapped, so tensors larger than memory can be used
+        path, _ = QFileDialog.getOpenFileName(None, "Load Tensor Data", "", "NumPy arrays (*.npy)")
+        if not path:
+            return
+        try:
+            data = load_npy(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(None, "Load Failed", f"Could not load {path}:\n{e}")
+            return
+        dims = tuple(self.get_dims())
+        if data.shape != dims:
+            QMessageBox.warning(None, "Dimension Mismatch",
+                                f"The array has shape {data.shape}, but {self.tensor_name} has "
+                                f"dimensions {dims}.")
+            return
+        self.tensor_data = data
+
+    def load_npy_batch(self):
+        # Values for "Contract Batch": one array of the tensor's dimensions
+        # per entry of the first axis
+        path, _ = QFileDialog.getOpenFileName(None, "Load Tensor Batch", "", "NumPy arrays (*.npy)")
+        if not path:
+            return
+        try:
+            data = load_npy(path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(None, "Load Failed", f"Could not load {path}:\n{e}")
+            return
+        dims = tuple(self.get_dims())
+        if data.ndim != len(dims) + 1 or data.shape[1:] != dims or not len(data):
+            QMessageBox.warning(None, "Dimension Mismatch",
+                                f"The array has shape {data.shape}, but a batch for "
+                                f"{self.tensor_name} needs the shape (batch size, "
+                                f"{', '.join(map(str, dims))}).")
+            return
+        self.batch_data = data
+        self.update_label()
+
+    def clear_batch(self):
+        self.batch_data = None
+        self.update_label()
+    
+    def get_dims(self):
+        # Return dimensions in the order of legs and edges
+        return self.tensor.dims()
+    
+    def get_ordered_legs(self):
+        # Return the list of legs and edges in order
+        return self.legs + self.edges
+    
+    def adjust_tensor_data(self, new_dimensions):
+        # Adjust tensor_data to match new_dimensions
+        old_data = self.tensor_data
+        shapes = [list(old_data.shape)] if old_data is not None else []
+        with operation_log.measure("Change dimensions", shapes=shapes + [list(new_dimensions)],
+                                   details=self.tensor_name) as entry:
+            self.tensor_data = resize_tensor(old_data, new_dimensions)
+            entry['allocated_bytes'] = 0 if self.tensor_data is old_data else self.tensor_data.nbytes
+    
+    def removeFromScene(self):
+        # Remove this node and its leg views from the scene; the network
+        # itself is updated by the editor
+        for leg in list(self.leg_items.values()):
+            leg.remove()
+        self.edge_items = {}
+        if self.scene():
+            self.scene().removeItem(self)
+    
+    def clone(self):
+        # Create a new node showing a copy of the tensor and its open legs
+        new_node = Node(self.pos().x(), self.pos().y(), radius=self.radius,
+                        tensor=self.tensor.copy())
+        for leg, new_index in zip(self.legs, new_node.tensor.legs):
+            new_node.attach_leg(new_index, leg.endPoint)
+        return new_node
+    
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionChange:
+            for leg in self.legs:
+                leg.updatePosition()
+            for edge in self.edges:
+                edge.updatePosition()
+        return super().itemChange(change, value)
+
+
+class Leg(QGraphicsLineItem):
+    # View of an open Index of the node's tensor
+    def __init__(self, node, endPoint, index):
+        super().__init__()
+        self.node = node
+        self.endPoint = endPoint
+        self.index = index
+        self.setZValue(-1)
+        self.label_item = QGraphicsTextItem(self)
+        self.label_item.setFont(QFont('Arial', 10))
+        self.setAcceptHoverEvents(True)
+        self.setFlag(QGraphicsItem.ItemIsSelectable, True)
+        self.setFlag(QGraphicsItem.ItemIsMovable, False)
+        self.dragging = False  # Initialize dragging state
+
+        if self.leg_type == 'physical':
+            self.pen = QPen(Qt.blue, 5, Qt.DashDotLine)
+            self.setPen(self.pen)
+            self.label_item.setDefaultTextColor(Qt.blue)
+        else:
+            self.pen = QPen(Qt.black, 5)
+            self.setPen(self.pen)
+            self.label_item.setDefaultTextColor(Qt.black)
+        self.updatePosition()
+        self.update_label()
+
+    @property
+    def leg_type(self):
+        return self.index.kind  # 'physical' or 'bond'
+
+    @property
+    def dimension(self):
+        return self.index.dimension
+
+    @dimension.setter
+    def dimension(self, dimension):
+        self.index.dimension = dimension
+
+    @property
+    def label(self):
+        return self.index.label
+
+    @label.setter
+    def label(self, label):
+        self.index.label = label
+
+    def updatePosition(self):
+        line = QLineF(
+            self.node.scenePos(),
+            self.endPoint
+        )
+        self.setLine(line)
+        # Update label position
+        mid_point = (line.p1() + line.p2()) / 2
+        self.label_item.setPos(mid_point)
+
+    def update_label(self):
+        text = ''
+        if self.label:
+            text += self.label
+        if self.dimension:
+            if text:
+                text += f' ({self.dimension})'
+            else:
+                text = str(self.dimension)
+        self.label_item.setPlainText(text)
+
+    def mouseDoubleClickEvent(self, event):
+        from .dialogs import LegPropertiesDialog
+        dialog = open_dialog(LegPropertiesDialog, self)
+        dialog.exec_()
+
+    def mousePressEvent(self, event):
+        pos = event.scenePos()
+        if (pos - self.endPoint).manhattanLength() <= 10:
+            self.dragging = True
+            self.setCursor(Qt.ClosedHandCursor)
+        else:
+            self.dragging = False
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self.dragging:
+            self.endPoint = event.scenePos()
+            self.updatePosition()
+        else:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self.dragging:
+            self.dragging = False
+            self.setCursor(Qt.ArrowCursor)
+        super().mouseReleaseEvent(event)
+
+    def hoverEnterEvent(self, event):
+        pos = event.scenePos()
+        if (pos - self.endPoint).manhattanLength() <= 10:
+            self.setCursor(Qt.OpenHandCursor)
+        else:
+            self.setCursor(Qt.ArrowCursor)
+        super().hoverEnterEvent(event)
+
+    def hoverMoveEvent(self, event):
+        pos = event.scenePos()
+        if (pos - self.endPoint).manhattanLength() <= 10:
+            self.setCursor(Qt.OpenHandCursor)
+        else:
+            self.setCursor(Qt.ArrowCursor)
+        super().hoverMoveEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        self.setCursor(Qt.ArrowCursor)
+        super().hoverLeaveEvent(event)
+
+    def remove(self):
+        # Drop the leg from its tensor (if still there) and remove the view
+        if self.node.tensor.has_index(self.index):
+            self.node.tensor.remove_leg(self.index)
+        if self.node.leg_items.get(self.index) is self:
+            del self.node.leg_items[self.index]
+        if self.scene():
+            self.scene().removeItem(self)
+        # Remove label item
+        if self.label_item.scene():
+            self.label_item.scene().removeItem(self.label_item)
+
+    def shape(self):
+        path = QPainterPath()
+        path.moveTo(self.line().p1())
+        path.lineTo(self.line().p2())
+        stroker = QPainterPathStroker()
+        stroker.setWidth(20)
+        return stroker.createStroke(path)
@@ -0,0 +1,102 @@
+# Table of the operation log, shown in a dock of the main window
+
+import time
+
+from PyQt5.QtWidgets import (
+    QWidget, QPushButton, QVBoxLayout, QLabel, QHBoxLayout, QMessageBox, QCheckBox,
+    QFileDialog, QTableWidget, QTableWidgetItem
+)
+
+from tensor_network import format_bytes
+
+
+class ProfilingPanel(QWidget):
+    # Table of the operations recorded in the operation log, with totals per
+    # operation and an export of the whole log
+    COLUMNS = ["Started", "Operation", "Time", "Est. FLOPs", "FLOPs", "Allocated", "Peak",
+               "Shapes", "Details"]
+
+    def __init__(self, log, parent=None):
+        super().__init__(parent)
+        self.log = log
+        layout = QVBoxLayout()
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        button_layout = QHBoxLayout()
+        self.memory_check = QCheckBox("Track peak memory (slower)")
+        self.memory_check.setChecked(log.trace_memory)
+        self.memory_check.toggled.connect(log.set_memory_tracing)
+        clear_button = QPushButton("Clear")
+        clear_button.clicked.connect(self.clear)
+        export_button = QPushButton("Export Log...")
+        export_button.clicked.connect(self.export_log)
+        button_layout.addWidget(self.memory_check)
+        button_layout.addStretch()
+        button_layout.addWidget(clear_button)
+        button_layout.addWidget(export_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        for entry in log.entries:
+            self.add_entry(entry)
+        log.listeners.append(self.add_entry)
+        self.destroyed.connect(lambda: log.listeners.remove(self.add_entry))
+        self.update_summary()
+
+    def add_entry(self, entry):
+        def number(value, unit=''):
+            return '' if value is None else f"{value:.3g}{unit}"
+
+        def size(value):
+            return '' if value is None else format_bytes(value)
+
+        cells = [
+            time.strftime('%H:%M:%S', time.localtime(entry['started'])),
+            entry['operation'],
+            number(entry['seconds'], ' s'),
+            number(entry['estimated_flops']),
+            number(entry['flops']),
+            size(entry['allocated_bytes']),
+            size(entry['peak_bytes']),
+            ', '.join('x'.join(str(d) for d in shape) or 'scalar' for shape in entry['shapes']),
+            entry['details'],
+        ]
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        for column, text in enumerate(cells):
+            self.table.setItem(row, column, QTableWidgetItem(text))
+        self.table.scrollToBottom()
+        self.update_summary()
+
+    def update_summary(self):
+        # The operations that took the most time in this session
+        totals = self.log.summary()[:3]
+        if not totals:
+            self.summary_label.setText("No operations recorded yet.")
+            return
+        self.summary_label.setText("Most time: " + "; ".join(
+            f"{total['operation']} {total['seconds']:.3g} s ({total['count']}x, "
+            f"{total['flops']:.3g} FLOPs)" for total in totals))
+
+    def clear(self):
+        self.log.clear()
+        self.table.setRowCount(0)
+        self.update_summary()
+
+    def export_log(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Operation Log", "operation_log.json",
+                                              "JSON (*.json);;CSV (*.csv)")
+        if not path:
+            return
+        try:
+            self.log.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not write {path}:\n{e}")
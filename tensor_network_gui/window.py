@@ -0,0 +1,1118 @@
+# Main window: mode buttons, menus, and the contractions and SVDs, which run
+# in background threads
+
+import numpy as np
+
+from PyQt5.QtWidgets import (
+    QMainWindow, QWidget, QPushButton, QVBoxLayout, QLabel, QHBoxLayout, QMessageBox, QAction,
+    QProgressDialog, QFileDialog, QDockWidget
+)
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtCore import Qt, QPointF, QThread, pyqtSignal
+
+from tensor_network import (
+    ComputationCancelled, Tensor, shape_size, tensor_size, format_bytes, path_strategy,
+    contraction_path, estimate_pair_contraction, pair_contraction_labels,
+    sliced_contraction_cost, choose_sliced_labels, contract_network_sliced,
+    svd_bond_compression, pair_axes, pair_result_indices, PROJECT_EXTENSION, save_project,
+    load_project, tensordot, tensordot_to_memmap, is_memmap, contraction_path_cost,
+    svd_compression_flops, array_bytes, array_shapes, DEFAULT_CACHE_BYTES, ContractionCache
+)
+
+from .common import (
+    DEFAULT_FLOP_THRESHOLD, DEFAULT_MEMORY_THRESHOLD_BYTES, DEFAULT_MEMORY_BUDGET_BYTES,
+    operation_log, open_dialog
+)
+from .items import Node
+from .editor import TensorNetworkEditor
+
+
+class ComputationWorker(QThread):
+    # Runs task(report_progress, is_cancelled) off the GUI thread. numpy
+    # releases the GIL inside BLAS/LAPACK, so the window stays responsive.
+    progress = pyqtSignal(int, int)
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+        self.cancelled = False
+
+    def cancel(self):
+        # Takes effect at the next step boundary; a running numpy call
+        # finishes, but its result is discarded
+        self.cancelled = True
+
+    def is_cancelled(self):
+        return self.cancelled
+
+    def run(self):
+        try:
+            result = self.task(self.progress.emit, self.is_cancelled)
+        except ComputationCancelled:
+            return
+        except Exception as e:
+            # Always report back, otherwise the window stays disabled
+            if not self.cancelled:
+                self.failed.emit(str(e) or type(e).__name__)
+            return
+        if not self.cancelled:
+            self.result_ready.emit(result)
+
+
+class MainWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+
+        self.editor = TensorNetworkEditor()
+        self.result_editor = TensorNetworkEditor(allow_add_nodes=False)
+
+        self.addPhysicalLegButton = QPushButton("Add Physical Leg")
+        self.addPhysicalLegButton.setCheckable(True)
+        self.addPhysicalLegButton.clicked.connect(self.toggleAddPhysicalLegMode)
+
+        self.addBondLegButton = QPushButton("Add Bond Leg")
+        self.addBondLegButton.setCheckable(True)
+        self.addBondLegButton.clicked.connect(self.toggleAddBondLegMode)
+
+        self.connectLegsButton = QPushButton("Connect Legs")
+        self.connectLegsButton.setCheckable(True)
+        self.connectLegsButton.clicked.connect(self.toggleConnectMode)
+
+        self.deleteButton = QPushButton("Delete")
+        self.deleteButton.setCheckable(True)
+        self.deleteButton.clicked.connect(self.toggleDeleteMode)
+        
+        # Added Fast Contract Button
+        self.fastContractButton = QPushButton("Fast Contract")
+        self.fastContractButton.setCheckable(True)
+        self.fastContractButton.clicked.connect(self.toggleFastContractMode)
+
+
+        # Added Disconnect Button
+        self.disconnectButton = QPushButton("Disconnect Tensors")
+        self.disconnectButton.setCheckable(True)
+        self.disconnectButton.clicked.connect(self.toggleDisconnectMode)
+
+        # Added SVD Button
+        self.svdButton = QPushButton("SVD Bond Compression")
+        self.svdButton.setCheckable(True)
+        self.svdButton.clicked.connect(self.toggleSVDMode)
+
+        
+        # the detailed Contract creates the contracted tensor in the lower pannel
+        self.contractButton = QPushButton("Detailed Contract")
+        self.contractButton.setCheckable(True)
+        self.contractButton.clicked.connect(self.toggleContractMode)
+        
+        # Contract the whole network along an optimized path
+        self.contractAllButton = QPushButton("Contract All")
+        self.contractAllButton.clicked.connect(self.perform_contract_all)
+
+        self.moveToUpperButton = QPushButton("Move to Upper Panel")
+        self.moveToUpperButton.clicked.connect(self.moveResultToUpperPanel)
+
+        buttonLayout = QHBoxLayout()
+        buttonLayout.addWidget(self.addPhysicalLegButton)
+        buttonLayout.addWidget(self.addBondLegButton)
+        buttonLayout.addWidget(self.connectLegsButton)
+        buttonLayout.addWidget(self.deleteButton)
+        buttonLayout.addWidget(self.fastContractButton)  # Added Fast Contract Button to layout
+        buttonLayout.addWidget(self.disconnectButton)  # Added Disconnect Button to layout
+        buttonLayout.addWidget(self.svdButton)  # Added SVD Button to layout
+        buttonLayout.addWidget(self.contractButton) # detailed contract botton
+        buttonLayout.addWidget(self.contractAllButton)
+        buttonLayout.addWidget(self.moveToUpperButton)
+
+        layout = QVBoxLayout()
+        layout.addWidget(QLabel("Upper Panel (Tensor Network):"))
+        layout.addWidget(self.editor)
+        layout.addLayout(buttonLayout)
+        layout.addWidget(QLabel("Lower Panel (Temporary Results):"))
+        layout.addWidget(self.result_editor)
+
+        container = QWidget()
+        container.setLayout(layout)
+        self.setCentralWidget(container)
+        self.setWindowTitle("Tensor Network Tool")
+        self.resize(800, 600)
+
+        self.selected_nodes = []
+
+        # File of the network in the upper panel, once it was saved or opened
+        self.project_path = None
+
+        # Background computations currently running
+        self.workers = []
+
+        # Contractions above these estimates ask for confirmation first
+        self.flop_threshold = DEFAULT_FLOP_THRESHOLD
+        self.memory_threshold_bytes = DEFAULT_MEMORY_THRESHOLD_BYTES
+        # Bonds are sliced when a contraction would need more working memory
+        self.memory_budget_bytes = DEFAULT_MEMORY_BUDGET_BYTES
+        # Intermediates of earlier Contract Alls, so that contracting again
+        # after an edit only recomputes what depends on the changed tensors
+        self.cache_bytes = DEFAULT_CACHE_BYTES
+        self.spill_intermediates = False
+        self.contraction_cache = ContractionCache(self.cache_bytes)
+
+        # Add the menu
+        self.menuBar = self.menuBar()
+        fileMenu = self.menuBar.addMenu('File')
+        openProjectAction = QAction('Open Project...', self)
+        openProjectAction.triggered.connect(self.openProject)
+        fileMenu.addAction(openProjectAction)
+        saveProjectAction = QAction('Save Project', self)
+        saveProjectAction.triggered.connect(self.saveProject)
+        fileMenu.addAction(saveProjectAction)
+        saveProjectAsAction = QAction('Save Project As...', self)
+        saveProjectAsAction.triggered.connect(self.saveProjectAs)
+        fileMenu.addAction(saveProjectAsAction)
+        settingsMenu = self.menuBar.addMenu('Settings')
+        contractionSettingsAction = QAction('Contraction Settings...', self)
+        contractionSettingsAction.triggered.connect(self.showContractionSettingsDialog)
+        settingsMenu.addAction(contractionSettingsAction)
+        toolsMenu = self.menuBar.addMenu('Tools')
+        contractBatchAction = QAction('Contract Batch...', self)
+        contractBatchAction.triggered.connect(self.perform_contract_batch)
+        toolsMenu.addAction(contractBatchAction)
+        # Menus that could start a job or change the network, disabled while
+        # one runs
+        self.job_menus = [fileMenu, settingsMenu, toolsMenu]
+        # Timings of every operation, docked below the panels when shown; the
+        # panel itself is built the first time the dock is shown
+        self.profilingDock = QDockWidget("Profiling", self)
+        self.profilingDock.visibilityChanged.connect(self.createProfilingPanel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.profilingDock)
+        self.profilingDock.hide()
+        viewMenu = self.menuBar.addMenu('View')
+        profilingAction = self.profilingDock.toggleViewAction()
+        profilingAction.setText('Profiling Panel')
+        viewMenu.addAction(profilingAction)
+        helpMenu = self.menuBar.addMenu('Help')
+        helpAction = QAction('How to Use', self)
+        helpAction.triggered.connect(self.showHelp)
+        helpMenu.addAction(helpAction)
+        self.help_dialog = None
+
+    def createProfilingPanel(self, visible):
+        if visible and self.profilingDock.widget() is None:
+            from .profiling_panel import ProfilingPanel
+            self.profilingDock.setWidget(ProfilingPanel(operation_log, self.profilingDock))
+
+    def toggleAddPhysicalLegMode(self):
+        if self.addPhysicalLegButton.isChecked():
+            self.editor.setAddLegMode('physical')
+            self.addPhysicalLegButton.setText("Adding Physical Leg...")
+            # Reset other buttons
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setAddLegMode(None)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+
+    def toggleAddBondLegMode(self):
+        if self.addBondLegButton.isChecked():
+            self.editor.setAddLegMode('bond')
+            self.addBondLegButton.setText("Adding Bond Leg...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setAddLegMode(None)
+            self.addBondLegButton.setText("Add Bond Leg")
+
+    def toggleConnectMode(self):
+        if self.connectLegsButton.isChecked():
+            self.editor.setConnectMode(True)
+            self.connectLegsButton.setText("Connecting Legs...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setConnectMode(False)
+            self.connectLegsButton.setText("Connect Legs")
+            # Reset any selected legs
+            for leg in self.editor.selected_legs:
+                leg.setPen(leg.pen)
+            self.editor.selected_legs = []
+
+    def toggleDeleteMode(self):
+        if self.deleteButton.isChecked():
+            self.editor.setDeleteMode(True)
+            self.deleteButton.setText("Deleting...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setDeleteMode(False)
+            self.deleteButton.setText("Delete")
+
+    def toggleContractMode(self):
+        if self.contractButton.isChecked():
+            self.editor.setContractMode(True)
+            self.contractButton.setText("Select Tensors...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+            self.editor.setCursor(Qt.CrossCursor)
+        else:
+            self.editor.setContractMode(False)
+            self.contractButton.setText("Detailed Contract")
+            self.editor.setCursor(Qt.ArrowCursor)
+            if len(self.editor.selected_nodes) == 2:
+                node1, node2 = self.editor.selected_nodes
+                from .dialogs import TensorContractionDialog
+                dialog = open_dialog(TensorContractionDialog, node1, node2)
+                if dialog.exec_():
+                    self.perform_contraction(node1, node2, dialog.selected_edges)
+                self.editor.selected_nodes = []
+                for node in self.editor.nodes:
+                    node.setBrush(QBrush(QColor('lightblue')))
+            else:
+                QMessageBox.warning(self, "Selection Error", "Please select exactly two tensors.")
+                self.editor.selected_nodes = []
+                for node in self.editor.nodes:
+                    node.setBrush(QBrush(QColor('lightblue')))
+
+    def toggleDisconnectMode(self):
+        if self.disconnectButton.isChecked():
+            self.editor.setDisconnectMode(True)
+            self.disconnectButton.setText("Select Tensors...")
+            # Reset other modes
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setDisconnectMode(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.editor.setCursor(Qt.ArrowCursor)
+            # Reset any selected nodes
+            for node in self.editor.selected_nodes:
+                node.setBrush(QBrush(QColor('lightblue')))
+            self.editor.selected_nodes = []
+
+    def toggleSVDMode(self):
+        if self.svdButton.isChecked():
+            self.editor.setSVDMode(True)
+            self.svdButton.setText("Select Tensors...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.fastContractButton.setChecked(False)
+            self.fastContractButton.setText("Fast Contract")
+        else:
+            self.editor.setSVDMode(False)
+            self.svdButton.setText("SVD Bond Compression")
+            self.editor.setCursor(Qt.ArrowCursor)
+            # Reset any selected nodes
+            for node in self.editor.selected_nodes:
+                node.setBrush(QBrush(QColor('lightblue')))
+            self.editor.selected_nodes = []
+
+    def toggleFastContractMode(self):
+        if self.fastContractButton.isChecked():
+            self.editor.setFastContractMode(True)
+            self.fastContractButton.setText("Select Tensors...")
+            # Reset other buttons
+            self.addPhysicalLegButton.setChecked(False)
+            self.addPhysicalLegButton.setText("Add Physical Leg")
+            self.addBondLegButton.setChecked(False)
+            self.addBondLegButton.setText("Add Bond Leg")
+            self.connectLegsButton.setChecked(False)
+            self.connectLegsButton.setText("Connect Legs")
+            self.deleteButton.setChecked(False)
+            self.deleteButton.setText("Delete")
+            self.contractButton.setChecked(False)
+            self.contractButton.setText("Detailed Contract")
+            self.disconnectButton.setChecked(False)
+            self.disconnectButton.setText("Disconnect Tensors")
+            self.svdButton.setChecked(False)
+            self.svdButton.setText("SVD Bond Compression")
+        else:
+            self.editor.setFastContractMode(False)
+            self.fastContractButton.setText("Fast Contract")
+            self.editor.setCursor(Qt.ArrowCursor)
+            # Reset any selected nodes
+            for node in self.editor.selected_nodes:
+                node.setBrush(QBrush(QColor('lightblue')))
+            self.editor.selected_nodes = []
+
+    def disconnect_tensors(self, node1, node2):
+        # Find edges between node1 and node2
+        edges_to_remove = node1.edges_to(node2)
+        if not edges_to_remove:
+            QMessageBox.information(self, "No Edges", "No edges found between the selected tensors.")
+            return
+        nodes = {node1.tensor: node1, node2.tensor: node2}
+        for edge in edges_to_remove:
+            line = edge.line()
+            first_node = edge.node1
+            new_legs = self.editor.network.disconnect(edge.index)
+            edge.remove()
+            # Create leg views on both nodes
+            for leg in new_legs:
+                node = nodes[leg.tensors[0]]
+                # Determine the angle for the new leg based on the edge's direction
+                if node == first_node:
+                    start_point = line.p1()
+                    end_point = line.p2()
+                else:
+                    start_point = line.p2()
+                    end_point = line.p1()
+                angle = np.degrees(np.arctan2(end_point.y() - start_point.y(), end_point.x() - start_point.x()))
+                node.attach_leg(leg, angle=angle, length=30)
+        QMessageBox.information(self, "Disconnected", "Tensors have been disconnected.")
+
+    def perform_contraction(self, node1, node2, selected_edges):
+        # Ensure tensors have data
+        if node1.tensor_data is None or node2.tensor_data is None:
+            QMessageBox.warning(self, "Missing Data", "One or both tensors have no data.")
+            return
+        if not self.check_tensor_shapes([node1, node2]):
+            return
+
+        # Axes of both tensors for the selected bonds
+        bonds = [edge.index for edge in selected_edges]
+        try:
+            axes1, axes2 = pair_axes(node1.tensor, node2.tensor, bonds)
+        except ValueError as e:
+            QMessageBox.warning(self, "Edge Error", str(e))
+            return
+
+        # Estimate the cost before allocating anything
+        prepared = self.prepare_pair_contraction(node1, node2, axes1, axes2)
+        if prepared is None:
+            return
+        estimate, contract, steps = prepared
+        entry = self.pair_contraction_entry("Detailed contraction", node1, node2, estimate)
+
+        # Perform tensor contraction on a worker thread
+        self.run_in_background(
+            "Contracting tensors...", "Contraction Error", contract,
+            lambda result_tensor: self.show_contraction_result(
+                node1, node2, bonds, result_tensor, estimate),
+            steps=steps, entry=entry
+        )
+
+    def show_contraction_result(self, node1, node2, bonds, result_tensor, estimate):
+        # The result is a standalone tensor whose legs copy the remaining
+        # legs and edges, in the axis order of np.tensordot
+        index = len(self.result_editor.nodes)
+        result = Tensor(f"Result_{index}", result_tensor)
+        for item in pair_result_indices(node1.tensor, node2.tensor, bonds):
+            result.add_leg(item.dimension, item.kind, item.label)
+        # Create new node in the result editor
+        result_node = Node(100, 100, index=index, tensor=result)
+        self.result_editor.add_node(result_node)
+        angle_increment = 360 / len(result.legs) if result.legs else 0
+        for i, leg in enumerate(result.legs):
+            result_node.attach_leg(leg, angle=i * angle_increment)
+        message = (f"Tensors have been contracted.\n"
+                   f"Estimated cost: {estimate['flops']:.3g} FLOPs, result: "
+                   f"{format_bytes(estimate['output_bytes'])}.")
+        if is_memmap(result_tensor):
+            message += f"\nThe result is stored on disk in {result_tensor.filename}."
+        QMessageBox.information(self, "Contraction Successful", message)
+
+    def perform_fast_contraction(self, node1, node2):
+        # Ensure tensors have data
+        if node1.tensor_data is None or node2.tensor_data is None:
+            QMessageBox.warning(self, "Missing Data", "One or both tensors have no data.")
+            return
+        if not self.check_tensor_shapes([node1, node2]):
+            return
+
+        # Find connecting bonds
+        bonds = node1.tensor.bonds_with(node2.tensor)
+        if not bonds:
+            QMessageBox.warning(self, "No Connected Edges",
+                                "There are no connected edges between the selected tensors.")
+            return
+        axes1, axes2 = pair_axes(node1.tensor, node2.tensor, bonds)
+
+        # Estimate the cost before allocating anything
+        prepared = self.prepare_pair_contraction(node1, node2, axes1, axes2)
+        if prepared is None:
+            return
+        estimate, contract, steps = prepared
+        entry = self.pair_contraction_entry("Fast contraction", node1, node2, estimate)
+
+        # Perform tensor contraction on a worker thread
+        self.run_in_background(
+            "Contracting tensors...", "Contraction Error", contract,
+            lambda result_tensor: self.replace_with_contraction_result(
+                node1, node2, result_tensor, estimate),
+            steps=steps, entry=entry
+        )
+
+    def replace_with_contraction_result(self, node1, node2, result_tensor, estimate):
+        # Replace both tensors in the network, then their views
+        index = len(self.editor.nodes)
+        result = self.editor.network.merge_pair(node1.tensor, node2.tensor, result_tensor,
+                                                name=f"Tensor_{index}")
+        result_node = Node((node1.pos().x() + node2.pos().x()) / 2,
+                           (node1.pos().y() + node2.pos().y()) / 2,
+                           index=index, tensor=result)
+        self.editor.replace_nodes([node1, node2], result_node)
+
+        message = (f"Tensors have been contracted and replaced.\n"
+                   f"Estimated cost: {estimate['flops']:.3g} FLOPs, result: "
+                   f"{format_bytes(estimate['output_bytes'])}.")
+        if is_memmap(result_tensor):
+            message += f"\nThe result is stored on disk in {result_tensor.filename}."
+        QMessageBox.information(self, "Fast Contraction Successful", message)
+
+
+    def pair_contraction_entry(self, operation, node1, node2, estimate):
+        # tensordot performs exactly the estimated multiply-adds, also when
+        # sliced or computed in blocks
+        return operation_log.begin(
+            operation, estimated_flops=estimate['flops'], flops=estimate['flops'],
+            shapes=[list(node1.tensor.array.shape), list(node2.tensor.array.shape)],
+            details=f"{node1.tensor_name} x {node2.tensor_name}")
+
+    def showContractionSettingsDialog(self):
+        from .dialogs import ContractionSettingsDialog
+        dialog = open_dialog(ContractionSettingsDialog, self.flop_threshold,
+                             self.memory_threshold_bytes, self.memory_budget_bytes,
+                             self.cache_bytes, self.spill_intermediates,
+                             self.contraction_cache.stats())
+        if dialog.exec_():
+            self.flop_threshold = dialog.flop_threshold
+            self.memory_threshold_bytes = dialog.memory_threshold_bytes
+            self.memory_budget_bytes = dialog.memory_budget_bytes
+            self.cache_bytes = dialog.cache_bytes
+            self.spill_intermediates = dialog.spill_intermediates
+            self.contraction_cache.set_budget(self.cache_bytes, self.spill_intermediates)
+
+    def check_tensor_shapes(self, nodes):
+        for node in nodes:
+            if tuple(node.tensor_data.shape) != tuple(node.get_dims()):
+                QMessageBox.warning(self, "Dimension Mismatch",
+                                    f"The data of {node.tensor_name} does not match its legs. "
+                                    f"Use \"Set Dimensions\" to update the tensor.")
+                return False
+        return True
+
+    def confirm_contraction_cost(self, flops, output_bytes, peak_bytes):
+        # Ask before running a contraction whose estimate exceeds a threshold
+        if flops <= self.flop_threshold and peak_bytes <= self.memory_threshold_bytes:
+            return True
+        reply = QMessageBox.question(
+            self, "Expensive Contraction",
+            f"This contraction is estimated to need:\n"
+            f"  {flops:.3g} FLOPs\n"
+            f"  {format_bytes(output_bytes)} for the result\n"
+            f"  {format_bytes(peak_bytes)} peak memory\n\n"
+            f"Do you want to continue?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        )
+        return reply == QMessageBox.Yes
+
+    def plan_slicing(self, inputs, output, size_dict, path, itemsize):
+        # Indices to slice so the working memory stays within the budget.
+        # Returns None if the budget cannot be met and the user declines.
+        if not self.memory_budget_bytes:
+            return []
+        memory_limit = self.memory_budget_bytes // itemsize
+        sliced_labels = choose_sliced_labels(inputs, output, size_dict, path, memory_limit)
+        _, working = sliced_contraction_cost(inputs, output, size_dict, path, sliced_labels)
+        if working > memory_limit:
+            reply = QMessageBox.question(
+                self, "Memory Budget Exceeded",
+                f"Even with slicing, this contraction needs {format_bytes(working * itemsize)} "
+                f"of working memory, more than the budget of "
+                f"{format_bytes(self.memory_budget_bytes)}.\n\n"
+                f"Do you want to continue?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return None
+        return sliced_labels
+
+    def prepare_pair_contraction(self, node1, node2, axes1, axes2):
+        # Estimate the cost, slice shared bonds if the memory budget requires
+        # it and ask for confirmation. Returns the estimate, the task computing
+        # the result and its number of progress steps, or None if declined.
+        # axes1 and axes2 refer to the stored arrays, which are contracted in
+        # their own layout.
+        tensor1, tensor2 = node1.tensor.array, node2.tensor.array
+        itemsize = np.result_type(tensor1, tensor2).itemsize
+        dims1, dims2 = tensor1.shape, tensor2.shape
+        estimate = estimate_pair_contraction(dims1, dims2, axes1, axes2, itemsize=itemsize)
+        if self.memory_budget_bytes and estimate['output_bytes'] > self.memory_budget_bytes:
+            # The result alone exceeds the budget: compute it in blocks that
+            # are written straight into a memory-mapped file
+            block_bytes = max(self.memory_budget_bytes // 4, 1)
+            estimate['peak_bytes'] = min(tensor1.nbytes, tensor2.nbytes) + 3 * block_bytes
+            if not self.confirm_contraction_cost(estimate['flops'], estimate['output_bytes'],
+                                                 estimate['peak_bytes']):
+                return None
+
+            def contract_to_disk(report_progress, is_cancelled):
+                return tensordot_to_memmap(tensor1, tensor2, (axes1, axes2),
+                                           block_bytes=block_bytes,
+                                           report_progress=report_progress,
+                                           is_cancelled=is_cancelled)
+
+            return estimate, contract_to_disk, 0
+        inputs, output, size_dict = pair_contraction_labels(dims1, dims2, axes1, axes2)
+        path = [(0, 1)]
+        sliced_labels = self.plan_slicing(inputs, output, size_dict, path, itemsize)
+        if sliced_labels is None:
+            return None
+        num_slices = tensor_size(sliced_labels, size_dict)
+        if sliced_labels:
+            _, working = sliced_contraction_cost(inputs, output, size_dict, path, sliced_labels)
+            estimate['peak_bytes'] = (shape_size(dims1) + shape_size(dims2) + working) * itemsize
+        if not self.confirm_contraction_cost(estimate['flops'], estimate['output_bytes'],
+                                             estimate['peak_bytes']):
+            return None
+
+        def contract(report_progress, is_cancelled):
+            if not sliced_labels:
+                return tensordot(tensor1, tensor2, (axes1, axes2))
+            return contract_network_sliced([tensor1, tensor2], inputs, output, path,
+                                           sliced_labels, size_dict,
+                                           report_progress=report_progress,
+                                           is_cancelled=is_cancelled)
+
+        return estimate, contract, num_slices if sliced_labels else 0
+
+    def perform_contract_all(self):
+        nodes = list(self.editor.nodes)
+        if len(nodes) < 2:
+            QMessageBox.warning(self, "Not Enough Tensors",
+                                "At least two tensors are needed for a contraction.")
+            return
+        for node in nodes:
+            if node.tensor_data is None:
+                QMessageBox.warning(self, "Missing Data",
+                                    f"{node.tensor_name} has no data.")
+                return
+        if not self.check_tensor_shapes(nodes):
+            return
+
+        inputs, output, size_dict, open_indices = self.editor.network.specification(
+            [node.tensor for node in nodes])
+        path = contraction_path(inputs, output, size_dict, strategy='auto')
+        strategy = path_strategy('auto', len(inputs))
+        itemsize = np.result_type(*[node.tensor.array for node in nodes]).itemsize
+        sliced_labels = self.plan_slicing(inputs, output, size_dict, path, itemsize)
+        if sliced_labels is None:
+            return
+        num_slices = tensor_size(sliced_labels, size_dict)
+        flops, working = sliced_contraction_cost(inputs, output, size_dict, path, sliced_labels)
+        unsliced_flops, _, _ = contraction_path_cost(inputs, output, size_dict, path)
+        input_elements = sum(tensor_size(labels, size_dict) for labels in inputs)
+        output_bytes = tensor_size(output, size_dict) * itemsize
+        peak_bytes = (input_elements + working) * itemsize
+        if not self.confirm_contraction_cost(flops, output_bytes, peak_bytes):
+            return
+
+        arrays = [node.tensor.array for node in nodes]
+        reuse = self.cache_bytes or self.spill_intermediates
+        cache = self.contraction_cache if reuse and not sliced_labels else None
+
+        def contract(report_progress, is_cancelled):
+            hits = cache.hits if cache is not None else 0
+            result = contract_network_sliced(arrays, inputs, output, path, sliced_labels,
+                                             size_dict, report_progress=report_progress,
+                                             is_cancelled=is_cancelled, cache=cache)
+            reused = cache.hits - hits if cache is not None else 0
+            if reused:
+                entry['details'] += f", {reused} steps reused"
+            return result, reused
+
+        summary = (
+            f"{len(nodes)} tensors have been contracted in {len(path)} steps "
+            f"({strategy} path).\n"
+            f"Estimated cost: {flops:.3g} FLOPs, peak memory: {format_bytes(peak_bytes)}."
+        )
+        if sliced_labels:
+            summary += (f"\n{len(sliced_labels)} bonds were sliced into {num_slices} slices "
+                        f"to stay within the memory budget.")
+        # Slicing repeats work, so the executed FLOPs can exceed the estimate
+        # for the path itself
+        entry = operation_log.begin(
+            "Contract all", estimated_flops=unsliced_flops, flops=flops,
+            shapes=[list(array.shape) for array in arrays],
+            details=f"{len(nodes)} tensors, {strategy} path, {num_slices} slices")
+
+        def on_result(result):
+            result_tensor, reused = result
+            text = summary
+            if reused:
+                text += (f"\n{reused} of {len(path)} steps were reused from the previous "
+                         f"contraction.")
+            self.replace_network_with_result(nodes, open_indices, result_tensor, text)
+
+        self.run_in_background(
+            "Contracting the network...", "Contraction Error", contract, on_result,
+            steps=num_slices * len(path), entry=entry
+        )
+
+    def perform_contract_batch(self):
+        # Contract the network once for every value of the batches loaded
+        # into its nodes, with the batch axis carried through each step, and
+        # save the results to an .npy file. The network itself is unchanged.
+        if self.workers:
+            QMessageBox.warning(self, "Busy", "Wait for the running computation to finish.")
+            return
+        nodes = list(self.editor.nodes)
+        batched = [node for node in nodes if node.batch_data is not None]
+        if not batched:
+            QMessageBox.warning(self, "No Batch",
+                                "Load a batch into at least one tensor first "
+                                "(\"Load Batch from .npy...\" in its context menu).")
+            return
+        for node in nodes:
+            if node.batch_data is None and node.tensor_data is None:
+                QMessageBox.warning(self, "Missing Data",
+                                    f"{node.tensor_name} has no data.")
+                return
+        if not self.check_tensor_shapes([node for node in nodes if node.batch_data is None]):
+            return
+        for node in batched:
+            if tuple(node.batch_data.shape[1:]) != tuple(node.get_dims()):
+                QMessageBox.warning(self, "Dimension Mismatch",
+                                    f"The batch of {node.tensor_name} does not match its legs. "
+                                    f"Load a batch for its current dimensions.")
+                return
+        batch_size = len(batched[0].batch_data)
+        if any(len(node.batch_data) != batch_size for node in batched):
+            QMessageBox.warning(self, "Batch Size Mismatch",
+                                "All batches must have the same number of values.")
+            return
+
+        # At most batch_size times the cost of one contraction: tensors
+        # without a batch are only contracted once where the path allows it
+        inputs, output, size_dict, open_indices = self.editor.network.specification(
+            [node.tensor for node in nodes])
+        path = contraction_path(inputs, output, size_dict)
+        flops, _, peak_elements = contraction_path_cost(inputs, output, size_dict, path)
+        itemsize = np.result_type(*[node.batch_data if node.batch_data is not None
+                                    else node.tensor.array for node in nodes]).itemsize
+        if not self.confirm_contraction_cost(
+                batch_size * flops, batch_size * tensor_size(output, size_dict) * itemsize,
+                batch_size * peak_elements * itemsize):
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Batch Results",
+                                                   "batch_results.npy", "NumPy arrays (*.npy)")
+        if not file_path:
+            return
+
+        network = self.editor.network
+        batches = {node.tensor: node.batch_data for node in batched}
+        entry = operation_log.begin(
+            "Contract batch", estimated_flops=batch_size * flops,
+            shapes=[list(array.shape) for array in batches.values()],
+            details=f"{len(nodes)} tensors, {len(batched)} batched, {batch_size} values")
+
+        def contract(report_progress, is_cancelled):
+            result, _ = network.contract_batched(batches, report_progress=report_progress,
+                                                 is_cancelled=is_cancelled)
+            return result
+
+        def on_result(result):
+            # Only an accepted result is written, so a cancelled batch
+            # leaves the file alone
+            try:
+                np.save(file_path, result)
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Save Failed", f"Could not save {file_path}:\n{e}")
+                return
+            axes = ', '.join(index.label or f"{index.kind} {number}"
+                             for number, index in enumerate(open_indices)) or "none"
+            QMessageBox.information(
+                self, "Batch Contraction Finished",
+                f"{batch_size} contractions of {len(nodes)} tensors have been saved to {file_path}.\n"
+                f"Result shape: {result.shape}; the first axis runs over the batch, "
+                f"the others are the open legs: {axes}.")
+
+        self.run_in_background(
+            "Contracting the batch...", "Batch Contraction Error", contract, on_result,
+            entry=entry
+        )
+
+    def replace_network_with_result(self, nodes, open_indices, result_tensor, summary):
+        # Replace the whole network by the result node
+        center_x = sum(node.pos().x() for node in nodes) / len(nodes)
+        center_y = sum(node.pos().y() for node in nodes) / len(nodes)
+        index = len(self.editor.nodes) - len(nodes)
+        result = self.editor.network.replace_tensors([node.tensor for node in nodes],
+                                                     result_tensor, open_indices,
+                                                     name=f"Tensor_{index}")
+        result_node = Node(center_x, center_y, index=index, tensor=result)
+        self.editor.replace_nodes(nodes, result_node)
+
+        QMessageBox.information(self, "Contraction Successful", summary)
+
+    def perform_svd(self, node1, node2):
+        from .dialogs import EdgeSelectionDialog, TruncationDialog
+
+        # Ensure tensors have data
+        if node1.tensor_data is None or node2.tensor_data is None:
+            QMessageBox.warning(self, "Missing Data",
+                                "One or both tensors have no data.")
+            return
+        if not self.check_tensor_shapes([node1, node2]):
+            return
+
+        # Find edges connecting node1 and node2
+        connecting_edges = node1.edges_to(node2)
+
+        if not connecting_edges:
+            QMessageBox.warning(self, "No Connected Edges",
+                                "The selected tensors are not connected.")
+            return
+
+        # If multiple edges, ask user to select which edge to perform SVD over
+        if len(connecting_edges) > 1:
+            edge_selection_dialog = open_dialog(EdgeSelectionDialog, connecting_edges)
+            if edge_selection_dialog.exec_():
+                selected_edge = edge_selection_dialog.selected_edge
+            else:
+                return
+        else:
+            selected_edge = connecting_edges[0]
+
+        # Get the dimension of the edge (bond)
+        bond_dim = selected_edge.dimension
+
+        # Open a dialog to ask the user for the truncation dimension
+        truncation_dialog = open_dialog(TruncationDialog, bond_dim)
+        if truncation_dialog.exec_():
+            truncation_dim = truncation_dialog.truncation_dim
+            method = truncation_dialog.method
+            solver = truncation_dialog.solver
+            max_error = truncation_dialog.max_error
+            max_discarded_weight = truncation_dialog.max_discarded_weight
+        else:
+            return
+
+        # Perform SVD between node1 and node2 over the selected edge, on the
+        # stored arrays; the results keep their layouts
+        node1_index = node1.tensor.array_axis(selected_edge.index)
+        node2_index = node2.tensor.array_axis(selected_edge.index)
+        tensor1, tensor2 = node1.tensor.array, node2.tensor.array
+        left_size = shape_size(tensor1.shape) // bond_dim
+        right_size = shape_size(tensor2.shape) // bond_dim
+        entry = operation_log.begin(
+            "SVD compression",
+            estimated_flops=svd_compression_flops(left_size, right_size, bond_dim, truncation_dim,
+                                                  method, solver),
+            shapes=[list(tensor1.shape), list(tensor2.shape)],
+            details=f"{node1.tensor_name} - {node2.tensor_name}, {method}")
+
+        def compress(report_progress, is_cancelled):
+            result = svd_bond_compression(tensor1, node1_index, tensor2, node2_index,
+                                          truncation_dim, method=method, solver=solver,
+                                          max_error=max_error,
+                                          max_discarded_weight=max_discarded_weight)
+            info = result[2]
+            entry['flops'] = svd_compression_flops(left_size, right_size, bond_dim,
+                                                   info['kept_dim'], method, info['solver'])
+            entry['details'] += f", {info['solver']} solver, kept {info['kept_dim']}"
+            return result
+
+        self.run_in_background(
+            "Performing SVD...", "SVD Error", compress,
+            lambda result: self.apply_svd_result(
+                node1, node2, selected_edge, truncation_dim, result),
+            entry=entry
+        )
+
+    def apply_svd_result(self, node1, node2, selected_edge, truncation_dim, result):
+        new_node1_tensor, new_node2_tensor, info = result
+        kept_dim = info['kept_dim']
+        if info['rank_limited']:
+            QMessageBox.information(self, "Truncation Dimension Adjusted",
+                                    f"The truncation dimension has been adjusted to {kept_dim} "
+                                    f"due to the limited rank of the combined matrix.")
+        node1.tensor.set_data(new_node1_tensor, node1.tensor.axis_indices())
+        node2.tensor.set_data(new_node2_tensor, node2.tensor.axis_indices())
+
+        # Update the edge dimension
+        selected_edge.dimension = kept_dim
+        selected_edge.update_label()
+
+        # Report the truncation, with the computed spectrum as details
+        spectrum = "\n".join(
+            f"{i}: {value:.6g}" + (" (kept)" if i < kept_dim else "")
+            for i, value in enumerate(info['singular_values'])
+        )
+        message_box = QMessageBox(self)
+        message_box.setIcon(QMessageBox.Information)
+        message_box.setWindowTitle("SVD Successful")
+        message_box.setText(
+            f"SVD has been performed and tensors have been updated.\n"
+            f"Kept bond dimension: {kept_dim}\n"
+            f"Solver: {info['solver']}\n"
+            f"Relative truncation error: {info['truncation_error']:.3g}\n"
+            f"Discarded weight: {info['discarded_weight']:.3g}"
+        )
+        message_box.setDetailedText(f"Singular values:\n{spectrum}")
+        message_box.exec_()
+
+    def run_in_background(self, label, error_title, task, on_result, steps=0, entry=None):
+        # Run task(report_progress, is_cancelled) on a worker thread and hand
+        # its result to on_result on the GUI thread. The editors and the job
+        # menus stay disabled until the worker has stopped, also after a
+        # cancel, so the network cannot change under the running job.
+        # steps=0 shows a busy indicator instead of a step count.
+        # entry (from operation_log.begin) is timed on the worker thread and
+        # recorded with the shapes and bytes of the result.
+        if entry is not None:
+            untimed_task = task
+
+            def task(report_progress, is_cancelled):
+                with operation_log.timed(entry):
+                    return untimed_task(report_progress, is_cancelled)
+
+        progress_dialog = QProgressDialog(label, "Cancel", 0, steps, self)
+        progress_dialog.setWindowTitle("Working")
+        progress_dialog.setWindowModality(Qt.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+        progress_dialog.setAutoClose(False)
+        progress_dialog.setAutoReset(False)
+        progress_dialog.setValue(0)
+
+        worker = ComputationWorker(task, self)
+        self.workers.append(worker)
+        self.set_busy(True)
+
+        # A job is finished, and its entry recorded, only once, whichever of
+        # cancel, result or failure comes first
+        closed = [False]
+
+        def finish():
+            if closed[0]:
+                return False
+            closed[0] = True
+            # Closing the dialog emits canceled, which must not count as a
+            # cancellation of the finished job
+            progress_dialog.canceled.disconnect(on_cancel)
+            progress_dialog.close()
+            return True
+
+        def on_progress(done, total):
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(done)
+
+        def on_cancel():
+            worker.cancel()
+            if not finish():
+                return
+            if entry is not None:
+                entry['details'] += " (cancelled)"
+                operation_log.record(entry)
+
+        def on_ready(result):
+            # A result that was already queued when the job was cancelled is
+            # dropped: the user no longer wants it applied
+            if worker.cancelled or not finish():
+                return
+            if entry is not None:
+                entry['allocated_bytes'] = array_bytes(result)
+                entry['shapes'] += array_shapes(result)
+                operation_log.record(entry)
+            on_result(result)
+
+        def on_failed(message):
+            if worker.cancelled or not finish():
+                return
+            if entry is not None:
+                entry['details'] += f" (failed: {message})"
+                operation_log.record(entry)
+            QMessageBox.warning(self, error_title, message)
+
+        def on_finished():
+            if worker in self.workers:
+                self.workers.remove(worker)
+            worker.deleteLater()
+            # A cancelled job keeps working on the tensors' arrays until its
+            # current numpy call returns, so the window is only enabled again
+            # once no worker runs
+            if not self.workers:
+                self.set_busy(False)
+
+        worker.progress.connect(on_progress)
+        worker.result_ready.connect(on_ready)
+        worker.failed.connect(on_failed)
+        worker.finished.connect(on_finished)
+        progress_dialog.canceled.connect(on_cancel)
+        worker.start()
+        return worker
+
+    def set_busy(self, busy):
+        self.centralWidget().setEnabled(not busy)
+        for menu in self.job_menus:
+            menu.menuAction().setEnabled(not busy)
+
+    def closeEvent(self, event):
+        # Let running workers finish their current numpy call before the
+        # window (their parent) is destroyed
+        for worker in self.workers[:]:
+            worker.cancel()
+            worker.wait()
+        super().closeEvent(event)
+
+
+    def moveResultToUpperPanel(self):
+        if self.result_editor.nodes:
+            node = self.result_editor.nodes[-1]
+            # Nodes connected to the result move along with it
+            components = self.result_editor.network.connected_components()
+            tensors = next(group for group in components if node.tensor in group)
+            moved = [node] + [other for other in self.result_editor.nodes
+                              if other is not node and other.tensor in tensors]
+            for moved_node in moved:
+                self.result_editor.take_node(moved_node)
+            # Adjust positions
+            node.setPos(100, 100)  # Set a default position in the upper panel
+            for other_node in moved[1:]:
+                other_node.setPos(node.pos() + QPointF(50, 0))  # Position it next to the node
+            for moved_node in moved:
+                moved_node.index = len(self.editor.nodes)
+                moved_node.update_label()
+                self.editor.add_node(moved_node)
+            QMessageBox.information(self, "Move Successful", "Resulting tensor moved to upper panel.")
+        else:
+            QMessageBox.warning(self, "No Result", "There is no tensor to move.")
+
+    def openProject(self):
+        if self.workers:
+            QMessageBox.warning(self, "Busy", "Wait for the running computation to finish.")
+            return
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Open Project", "", f"Tensor network projects (*{PROJECT_EXTENSION});;All files (*)")
+        if not path:
+            return
+        try:
+            network, tensor_views, index_views = load_project(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Open Failed", f"Could not open {path}:\n{e}")
+            return
+        self.editor.load_network(network, tensor_views, index_views)
+        self.project_path = path
+        self.setWindowTitle(f"Tensor Network Tool - {path}")
+
+    def saveProject(self):
+        if self.project_path is None:
+            self.saveProjectAs()
+        else:
+            self.write_project(self.project_path)
+
+    def saveProjectAs(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Project", "", f"Tensor network projects (*{PROJECT_EXTENSION})")
+        if not path:
+            return
+        if not path.endswith(PROJECT_EXTENSION):
+            path += PROJECT_EXTENSION
+        self.write_project(path)
+
+    def write_project(self, path):
+        if self.workers:
+            QMessageBox.warning(self, "Busy", "Wait for the running computation to finish.")
+            return
+        tensor_views, index_views = self.editor.project_views()
+        try:
+            save_project(path, self.editor.network, tensor_views, index_views)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Save Failed", f"Could not save {path}:\n{e}")
+            return
+        self.project_path = path
+        self.setWindowTitle(f"Tensor Network Tool - {path}")
+
+    def showHelp(self):
+        # The help text is long, so the dialog is only built the first time
+        # it is asked for and then kept
+        if self.help_dialog is None:
+            from .help import HelpDialog
+            self.help_dialog = open_dialog(HelpDialog, self)
+        self.help_dialog.exec_()